@@ -5,7 +5,7 @@ Run this script to start the FileX web server. The server loads embedding models
 once at startup and keeps them in memory for fast API responses.
 
 Usage:
-    python filex-web.py [--host HOST] [--port PORT]
+    python filex-web.py [--host HOST] [--port PORT] [--keep-file-embeddings]
 
 To stop the server, press Ctrl+C or send a shutdown signal.
 """
@@ -57,9 +57,18 @@ def main():
         action="store_true",
         help="Enable auto-reload for development (not recommended for production)",
     )
+    parser.add_argument(
+        "--keep-file-embeddings",
+        action="store_true",
+        help="Also store a per-file copy of each file's embeddings in .filex/embeddings",
+    )
     
     args = parser.parse_args()
     
+    if args.keep_file_embeddings:
+        # Read by StorageManager in the server process
+        os.environ["FILEX_KEEP_FILE_EMBEDDINGS"] = "1"
+    
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
@@ -2,22 +2,47 @@
 FileX CLI entrypoint for indexing and searching files.
 """
 import argparse
+import functools
+import os
+import re
+import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional, TYPE_CHECKING
 
 from src import (
+    Repository,
     RepositoryManager,
     FileProcessorRouter,
     TextFileHandler,
     ImageFileHandler,
     TextEmbeddingHandler,
-    SentenceTransformerEmbedder,
-    CLIPImageEmbedder,
     FixedSizeChunker,
     SearchManager,
+    ModelServer,
+    ModelClient,
+    RemoteEmbedder,
+    RemoteImageEmbedder,
+    ChunkEmbeddingCache,
+    QueryEmbeddingCache,
 )
 
+if TYPE_CHECKING:
+    from src import CLIPImageEmbedder, SentenceTransformerEmbedder
+
+SERVER_STARTUP_TIMEOUT_SECONDS = 120
+CHUNK_CACHE_NAME = "chunk_cache.npz"
+# Count flags inside a query: "-count 5", "--count 5", "-c 5", "--c 5" or "--5" (last one wins)
+COUNT_FLAG_PATTERN = re.compile(r"(?<!\S)(?:(?:--?count|--?c)\s+([+-]?\d+)|--+(\d+))(?!\S)")
+# Speed/quality presets: profile -> (text model, embedding dtype)
+PROFILES = {
+    "fast": ("all-MiniLM-L6-v2", "binary"),
+    "balanced": ("all-MiniLM-L6-v2", "int8"),
+    "accurate": ("all-mpnet-base-v2", "float32"),
+}
+DEFAULT_PROFILE = "accurate"
+
 
 def parse_search_query(query_string: str) -> Tuple[str, int]:
     """
@@ -32,50 +57,153 @@ def parse_search_query(query_string: str) -> Tuple[str, int]:
     :param query_string: Query string with optional flags
     :returns: Tuple of (query_text, count)
     """
-    query_parts = query_string.split()
-    query_text_parts = []
-    count = 10
-    
-    i = 0
-    while i < len(query_parts):
-        part = query_parts[i]
-        
-        if part in ("-count", "--count", "-c", "--c"):
-            if i + 1 < len(query_parts):
-                try:
-                    count = int(query_parts[i + 1])
-                    i += 2
-                    continue
-                except ValueError:
-                    pass
-        elif part.startswith("--") and part[2:].lstrip("-").isdigit():
-            count = int(part[2:].lstrip("-"))
-            i += 1
-            continue
-        
-        query_text_parts.append(part)
-        i += 1
+    counts = [
+        int(match.group(1) or match.group(2))
+        for match in COUNT_FLAG_PATTERN.finditer(query_string)
+    ]
+    count = counts[-1] if counts else 10
     
-    query_text = " ".join(query_text_parts)
+    query_text = " ".join(COUNT_FLAG_PATTERN.sub(" ", query_string).split())
     return query_text, count
 
 
+def spawn_model_server(
+    model_name: str,
+    image_model_name: str,
+    precision: str = "auto",
+    backend: str = "torch"
+) -> None:
+    """
+    Start a detached model server process running `filex.py serve`.
+    
+    :param model_name: Sentence-transformer model name for the server to load
+    :param image_model_name: CLIP model name for the server to load
+    :param precision: Text model forward-pass precision ("auto", "fp32", "fp16" or "bf16")
+    :param backend: Text model inference backend ("torch" or "onnx")
+    """
+    command = [
+        sys.executable, str(Path(__file__).resolve()), "serve",
+        "--model", model_name, "--image-model", image_model_name,
+        "--precision", precision, "--backend", backend,
+    ]
+    if os.name == "nt":
+        detach = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        detach = {"start_new_session": True}
+    subprocess.Popen(
+        command,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **detach,
+    )
+
+
+def connect_model_server(
+    model_name: str,
+    image_model_name: str,
+    spawn: bool = False,
+    precision: str = "auto",
+    backend: str = "torch"
+) -> Optional[ModelClient]:
+    """
+    Connect to a running model server, optionally starting one first.
+    
+    :param model_name: Sentence-transformer model the server must have loaded
+    :param image_model_name: CLIP model name (used when spawning a server)
+    :param spawn: Start a server in the background if none is running
+    :param precision: Text model precision (used when spawning a server)
+    :param backend: Text model inference backend (used when spawning a server)
+    :returns: Connected ModelClient serving model_name, or None
+    """
+    client = ModelClient.connect()
+    if client is None and spawn and ModelClient.is_advertised():
+        print("Model server is running but not responding, loading models in-process.")
+    elif client is None and spawn:
+        print("Starting model server in the background (models load once)...")
+        spawn_model_server(model_name, image_model_name, precision, backend)
+        deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT_SECONDS
+        while client is None and time.monotonic() < deadline:
+            time.sleep(0.5)
+            client = ModelClient.connect()
+        if client is None:
+            print("Warning: Model server did not start in time, loading models in-process.")
+    
+    if client is not None and client.text_model != model_name:
+        print(f"Model server is serving '{client.text_model}', loading '{model_name}' in-process.")
+        client.close()
+        return None
+    return client
+
+
+@functools.lru_cache(maxsize=4)
+def load_text_embedder(
+    model_name: str,
+    precision: str = "auto",
+    backend: str = "torch"
+) -> "SentenceTransformerEmbedder":
+    """
+    Load a sentence-transformer embedder, reusing it for repeated calls in this process.
+    
+    :param model_name: Sentence-transformer model name
+    :param precision: Forward-pass precision ("auto", "fp32", "fp16" or "bf16")
+    :param backend: Inference backend ("torch" or "onnx")
+    :returns: Loaded SentenceTransformerEmbedder
+    """
+    from src import SentenceTransformerEmbedder
+    return SentenceTransformerEmbedder(model_name=model_name, precision=precision, backend=backend)
+
+
+@functools.lru_cache(maxsize=4)
+def load_image_embedder(model_name: str) -> "CLIPImageEmbedder":
+    """
+    Load a CLIP image embedder, reusing it for repeated calls in this process.
+    
+    Failed loads raise and are not cached, so a later call retries.
+    
+    :param model_name: CLIP model name
+    :returns: Loaded CLIPImageEmbedder
+    """
+    from src import CLIPImageEmbedder
+    return CLIPImageEmbedder(model_name=model_name)
+
+
 def setup_components(
     model_name: str = "all-mpnet-base-v2",
-    image_model_name: str = "openai/clip-vit-base-patch32"
-) -> Tuple[RepositoryManager, TextEmbeddingHandler, Optional[CLIPImageEmbedder]]:
+    image_model_name: str = "openai/clip-vit-base-patch32",
+    client: Optional[ModelClient] = None,
+    embedding_dtype: str = "float32",
+    precision: str = "auto",
+    backend: str = "torch",
+    keep_file_embeddings: Optional[bool] = None,
+    image_batch_size: Optional[int] = None
+) -> Tuple[RepositoryManager, TextEmbeddingHandler, Optional["CLIPImageEmbedder"]]:
     """
     Set up FileX components with default configuration.
     
     Note: Model loading can take 5-10 seconds on first run or when loading from cache.
-    Subsequent runs are faster due to model caching.
+    Subsequent runs are faster due to model caching, and models loaded earlier in the
+    same process are reused. When a model server client is given, embeddings are
+    requested from the server and no model is loaded locally.
     
     :param model_name: Sentence-transformer model name (default: all-mpnet-base-v2, 768 dimensions)
     :param image_model_name: CLIP model name for images (default: openai/clip-vit-base-patch32, 512 dimensions)
+    :param client: Connected model server client serving model_name (optional)
+    :param embedding_dtype: Embedding storage format ("float32", "float16", "int8" or "binary")
+    :param precision: Text model forward-pass precision ("auto", "fp32", "fp16" or "bf16")
+    :param backend: Text model inference backend ("torch" or "onnx")
+    :param keep_file_embeddings: Also store a per-file copy of each file's embeddings
+        (default: from the FILEX_KEEP_FILE_EMBEDDINGS environment variable)
+    :param image_batch_size: Images embedded per image model call while indexing
+        (default: from the FILEX_IMAGE_BATCH_SIZE environment variable, else 32)
     :returns: Tuple of (RepositoryManager, TextEmbeddingHandler, CLIPImageEmbedder or None)
     """
-    print("Loading embedding models (this may take a few seconds)...")
-    embedder = SentenceTransformerEmbedder(model_name=model_name)
+    if client is not None:
+        print("Using running model server for embeddings.")
+        embedder = RemoteEmbedder(client)
+    else:
+        print("Loading embedding models (this may take a few seconds)...")
+        embedder = load_text_embedder(model_name, precision, backend)
     chunker = FixedSizeChunker(chunk_size=512, overlap=50)
     embedding_handler = TextEmbeddingHandler(embedder=embedder, chunker=chunker)
     
@@ -83,15 +211,24 @@ def setup_components(
     
     image_embedder = None
     try:
-        image_embedder = CLIPImageEmbedder(model_name=image_model_name)
-        image_handler = ImageFileHandler(image_embedder=image_embedder)
+        if client is not None and client.image_model == image_model_name:
+            image_embedder = RemoteImageEmbedder(client)
+        else:
+            image_embedder = load_image_embedder(image_model_name)
+        image_handler = ImageFileHandler(image_embedder=image_embedder, batch_size=image_batch_size)
         processor = FileProcessorRouter(text_handler=text_handler, image_handler=image_handler)
     except Exception as e:
         print(f"Warning: Could not initialize image handler: {e}")
         print("Image support will be disabled. Text files will still work.")
         processor = FileProcessorRouter(text_handler=text_handler)
     
-    repo_manager = RepositoryManager(processor=processor, create=True)
+    repo_manager = RepositoryManager(
+        processor=processor,
+        create=True,
+        embedding_dtype=embedding_dtype,
+        keep_file_embeddings=keep_file_embeddings,
+        model_name=model_name,
+    )
     
     return repo_manager, embedding_handler, image_embedder
 
@@ -106,25 +243,63 @@ def cmd_index(args: argparse.Namespace) -> int:
     try:
         print("Initializing FileX...")
         model_name = args.model if hasattr(args, 'model') and args.model else "all-mpnet-base-v2"
-        repo_manager, _ = setup_components(model_name=model_name)
+        client = connect_model_server(
+            model_name, args.image_model, spawn=args.server,
+            precision=args.precision, backend=args.backend,
+        )
+        repo_manager, embedding_handler, _ = setup_components(
+            model_name=model_name,
+            image_model_name=args.image_model,
+            client=client,
+            embedding_dtype=args.embedding_dtype,
+            precision=args.precision,
+            backend=args.backend,
+            keep_file_embeddings=args.keep_file_embeddings or None,
+            image_batch_size=args.image_batch_size,
+        )
+        
+        embedding_handler.set_cache(
+            ChunkEmbeddingCache(
+                repo_manager.repository.config.index_dir / CHUNK_CACHE_NAME,
+                dtype=args.embedding_dtype,
+            )
+        )
         
-        if args.path:
-            if Path(args.path).is_file():
-                print(f"Indexing file: {args.path}")
-                result = repo_manager.index_file(args.path, force=args.force)
-                if result.get("indexed"):
-                    print(f"✓ Indexed: {result['file_path']}")
-                    if result.get("processed"):
-                        print(f"  Chunks: {result.get('num_chunks', 0)}")
+        try:
+            if args.path:
+                if Path(args.path).is_file():
+                    print(f"Indexing file: {args.path}")
+                    result = repo_manager.index_file(args.path, force=args.force)
+                    if result.get("indexed"):
+                        print(f"✓ Indexed: {result['file_path']}")
+                        if result.get("processed"):
+                            print(f"  Chunks: {result.get('num_chunks', 0)}")
+                    else:
+                        print(f"- Skipped: {result.get('reason', 'Unknown reason')}")
                 else:
-                    print(f"- Skipped: {result.get('reason', 'Unknown reason')}")
+                    print(f"Indexing directory: {args.path}")
+                    stats = repo_manager.index_directory(
+                        directory=args.path,
+                        recursive=not args.no_recursive,
+                        extensions=args.extensions,
+                        force=args.force,
+                        workers=args.workers,
+                    )
+                    print(f"\nIndexing complete:")
+                    print(f"  Total files: {stats['total_files']}")
+                    print(f"  Indexed: {stats['indexed']}")
+                    print(f"  Skipped: {stats['skipped']}")
+                    if stats['errors'] > 0:
+                        print(f"  Errors: {stats['errors']}")
+                        for error in stats['error_messages']:
+                            print(f"    - {error}")
             else:
-                print(f"Indexing directory: {args.path}")
+                print("Indexing all files in repository...")
                 stats = repo_manager.index_directory(
-                    directory=args.path,
                     recursive=not args.no_recursive,
                     extensions=args.extensions,
                     force=args.force,
+                    workers=args.workers,
                 )
                 print(f"\nIndexing complete:")
                 print(f"  Total files: {stats['total_files']}")
@@ -134,21 +309,9 @@ def cmd_index(args: argparse.Namespace) -> int:
                     print(f"  Errors: {stats['errors']}")
                     for error in stats['error_messages']:
                         print(f"    - {error}")
-        else:
-            print("Indexing all files in repository...")
-            stats = repo_manager.index_directory(
-                recursive=not args.no_recursive,
-                extensions=args.extensions,
-                force=args.force,
-            )
-            print(f"\nIndexing complete:")
-            print(f"  Total files: {stats['total_files']}")
-            print(f"  Indexed: {stats['indexed']}")
-            print(f"  Skipped: {stats['skipped']}")
-            if stats['errors'] > 0:
-                print(f"  Errors: {stats['errors']}")
-                for error in stats['error_messages']:
-                    print(f"    - {error}")
+        finally:
+            # Vectors of chunks no longer in the search index are dropped
+            embedding_handler.save_cache(repo_manager.search_manager.chunk_texts())
         
         return 0
     except Exception as e:
@@ -160,47 +323,88 @@ def cmd_search(args: argparse.Namespace) -> int:
     """
     Handle search command.
     
+    Query embeddings are cached on disk; when every query is cached for both the
+    text and image model, no model is loaded.
+    
     :param args: Parsed command-line arguments
     :returns: Exit code (0 for success, non-zero for error)
     """
     try:
         print("Initializing FileX...")
         model_name = args.model if hasattr(args, 'model') and args.model else "all-mpnet-base-v2"
-        repo_manager, embedding_handler, image_embedder = setup_components(model_name=model_name)
-        search_manager = repo_manager.search_manager
-        
-        query_text, count = parse_search_query(args.query)
-        
-        if args.count:
-            count = args.count
         
-        print(f"Searching for: '{query_text}' (top {count} results)")
+        parsed_queries = [parse_search_query(query) for query in args.query]
+        query_texts = [query_text for query_text, _ in parsed_queries]
         
-        _, query_embedding = embedding_handler.embed_text(query_text)
-        if query_embedding.ndim > 1 and query_embedding.shape[0] == 1:
-            query_embedding = query_embedding[0]
+        query_cache = QueryEmbeddingCache()
+        # Text query vectors depend on the model's precision and backend as well
+        text_identity = (args.precision, args.backend)
+        query_embeddings = [query_cache.get(model_name, text, *text_identity) for text in query_texts]
+        image_query_embeddings = [query_cache.get(args.image_model, text) for text in query_texts]
         
-        image_query_embedding = None
-        if image_embedder is not None:
-            try:
-                image_query_embedding = image_embedder.embed_text(query_text)
-                if image_query_embedding.ndim > 1:
-                    image_query_embedding = image_query_embedding.flatten()
-            except Exception as e:
-                print(f"Warning: Could not create image query embedding: {e}")
-        
-        results = search_manager.search(query_embedding, top_k=count, image_query_embedding=image_query_embedding)
-        
-        if not results:
-            print("No results found.")
-            return 0
+        if all(e is not None for e in query_embeddings + image_query_embeddings):
+            print("Using cached query embeddings.")
+            search_manager = SearchManager(
+                Repository(create=True), embedding_dtype=args.embedding_dtype, model_name=model_name
+            )
+        else:
+            client = connect_model_server(
+                model_name, args.image_model, spawn=args.server,
+                precision=args.precision, backend=args.backend,
+            )
+            repo_manager, embedding_handler, image_embedder = setup_components(
+                model_name=model_name,
+                image_model_name=args.image_model,
+                client=client,
+                embedding_dtype=args.embedding_dtype,
+                precision=args.precision,
+                backend=args.backend,
+            )
+            search_manager = repo_manager.search_manager
+            
+            # All queries share one batched forward pass
+            query_embeddings = list(embedding_handler.embed_queries(query_texts))
+            # A model server started with other options must not fill this run's entries
+            if client is None or (
+                client.text_backend == args.backend
+                and (args.precision == "auto" or client.text_precision == args.precision)
+            ):
+                for query_text, query_embedding in zip(query_texts, query_embeddings):
+                    query_cache.put(model_name, query_text, query_embedding, *text_identity)
+            
+            image_query_embeddings = [None] * len(query_texts)
+            if image_embedder is not None:
+                for i, query_text in enumerate(query_texts):
+                    try:
+                        image_query_embedding = image_embedder.embed_text(query_text)
+                        if image_query_embedding.ndim > 1:
+                            image_query_embedding = image_query_embedding.flatten()
+                        image_query_embeddings[i] = image_query_embedding
+                        query_cache.put(args.image_model, query_text, image_query_embedding)
+                    except Exception as e:
+                        print(f"Warning: Could not create image query embedding: {e}")
         
-        print(f"\nFound {len(results)} result(s):\n")
-        for i, result in enumerate(results, 1):
-            print(f"{i}. {result.file_name} (similarity: {result.similarity_score:.4f})")
-            print(f"   Path: {result.file_path}")
-            print(f"   Chunk {result.chunk_index}: {result.chunk_text[:200]}...")
-            print()
+        for (query_text, count), query_embedding, image_query_embedding in zip(
+            parsed_queries, query_embeddings, image_query_embeddings
+        ):
+            if args.count:
+                count = args.count
+            
+            print(f"Searching for: '{query_text}' (top {count} results)")
+            
+            results = search_manager.search(query_embedding, top_k=count, image_query_embedding=image_query_embedding)
+            
+            if not results:
+                print("No results found.")
+                print()
+                continue
+            
+            print(f"\nFound {len(results)} result(s):\n")
+            for i, result in enumerate(results, 1):
+                print(f"{i}. {result.file_name} (similarity: {result.similarity_score:.4f})")
+                print(f"   Path: {result.file_path}")
+                print(f"   Chunk {result.chunk_index}: {result.chunk_text[:200]}...")
+                print()
         
         return 0
     except Exception as e:
@@ -214,7 +418,8 @@ def cmd_status(args: argparse.Namespace) -> int:
     """
     Handle status command.
     
-    Does not load the embedding model for faster execution.
+    Does not load the embedding model or the search index rows: search index counts
+    come from the index info files.
     
     :param args: Parsed command-line arguments
     :returns: Exit code (0 for success, non-zero for error)
@@ -225,18 +430,22 @@ def cmd_status(args: argparse.Namespace) -> int:
         repository = Repository(create=False)
         index_manager = IndexManager(repository)
         storage_manager = StorageManager(repository)
-        search_manager = SearchManager(repository)
         
+        counts = index_manager.get_counts()
         index_status = {
-            "total_indexed_files": index_manager.get_indexed_files_count(),
-            "text_files": sum(1 for e in index_manager.get_all_entries() if e.is_text_type),
-            "non_text_files": sum(1 for e in index_manager.get_all_entries() if not e.is_text_type),
-            "total_chunks": sum(e.num_chunks or 0 for e in index_manager.get_all_entries() if e.is_text_type),
+            "total_indexed_files": counts["total_files"],
+            "text_files": counts["text_files"],
+            "non_text_files": counts["non_text_files"],
+            "total_chunks": counts["total_chunks"],
             "storage_size": storage_manager.get_storage_size(),
             "repository_path": str(repository.repo_path),
             "work_tree_root": str(repository.get_work_tree_root()),
         }
-        search_stats = search_manager.get_index_stats()
+        search_stats = SearchManager.stored_index_stats(repository)
+        if search_stats is None:
+            # Index saved before its counts were recorded: load it in its stored dtype
+            search_stats = SearchManager(repository).get_index_stats()
+        search_settings = SearchManager.stored_settings(repository)
         
         print("FileX Repository Status")
         print("=" * 50)
@@ -253,9 +462,12 @@ def cmd_status(args: argparse.Namespace) -> int:
         print(f"  Total chunks: {search_stats['total_chunks']}")
         print(f"  Unique files: {search_stats['unique_files']}")
         print(f"  Embedding dimension: {search_stats['embedding_dimension']}")
+        print(f"  Model: {search_settings['model'] or 'unknown'}")
+        print(f"  Embedding dtype: {search_settings['embedding_dtype'] or 'unknown'}")
         print()
         storage = index_status['storage_size']
         print("Storage:")
+        print(f"  Index: {storage['index_bytes'] / (1024*1024):.2f} MB")
         print(f"  Embeddings: {storage['embeddings_bytes'] / (1024*1024):.2f} MB")
         print(f"  Metadata: {storage['metadata_bytes'] / 1024:.2f} KB")
         print(f"  Total: {storage['total_bytes'] / (1024*1024):.2f} MB")
@@ -266,6 +478,154 @@ def cmd_status(args: argparse.Namespace) -> int:
         return 1
 
 
+def cmd_serve(args: argparse.Namespace) -> int:
+    """
+    Handle serve command.
+    
+    Loads the embedding models once and serves embedding requests from other
+    FileX CLI invocations until interrupted.
+    
+    :param args: Parsed command-line arguments
+    :returns: Exit code (0 for success, non-zero for error)
+    """
+    import torch
+    from src import SentenceTransformerEmbedder, CLIPImageEmbedder, MultiGPUImageEmbedder
+    
+    try:
+        print("Loading embedding models (this may take a few seconds)...")
+        compile_model = not args.no_compile
+        embedder = SentenceTransformerEmbedder(
+            model_name=args.model,
+            compile_model=compile_model,
+            precision=args.precision,
+            backend=args.backend,
+        )
+        image_embedder = None
+        try:
+            # A long-running server amortizes loading a replica on every GPU
+            if torch.cuda.device_count() > 1:
+                image_embedder = MultiGPUImageEmbedder(model_name=args.image_model, compile_model=compile_model)
+            else:
+                image_embedder = CLIPImageEmbedder(model_name=args.image_model, compile_model=compile_model)
+        except Exception as e:
+            print(f"Warning: Could not initialize image embedder: {e}")
+        
+        server = ModelServer(text_embedder=embedder, image_embedder=image_embedder)
+        print("Model server ready. Press Ctrl+C to stop.")
+        server.serve_forever()
+        return 0
+    except KeyboardInterrupt:
+        print("\nModel server stopped.")
+        return 0
+    except Exception as e:
+        print(f"Error running model server: {e}", file=sys.stderr)
+        return 1
+
+
+def stored_index_settings() -> Dict[str, Optional[str]]:
+    """
+    Read the model and embedding dtype the current repository's search index was built with.
+    
+    :returns: Dictionary with "model" and "embedding_dtype", each None when unknown
+        or when there is no repository
+    """
+    try:
+        repository = Repository(create=False)
+    except (FileNotFoundError, OSError):
+        return {"model": None, "embedding_dtype": None}
+    return SearchManager.stored_settings(repository)
+
+
+def apply_profile(args: argparse.Namespace) -> None:
+    """
+    Fill in the model and embedding dtype.
+    
+    Options given explicitly on the command line come first, then an explicit
+    --profile, then the settings recorded with the repository's search index, then
+    DEFAULT_PROFILE. Opening an index with other settings is refused by SearchManager.
+    
+    :param args: Parsed command-line arguments with a profile attribute
+    """
+    if args.profile is not None:
+        model_name, embedding_dtype = PROFILES[args.profile]
+    else:
+        model_name, embedding_dtype = PROFILES[DEFAULT_PROFILE]
+        stored = stored_index_settings()
+        model_name = stored["model"] or model_name
+        embedding_dtype = stored["embedding_dtype"] or embedding_dtype
+    if getattr(args, "model", None) is None:
+        args.model = model_name
+    if hasattr(args, "embedding_dtype") and args.embedding_dtype is None:
+        args.embedding_dtype = embedding_dtype
+
+
+def add_profile_argument(subparser: argparse.ArgumentParser) -> None:
+    """
+    Add the speed/quality profile option.
+    
+    :param subparser: Subcommand parser to extend
+    """
+    subparser.add_argument(
+        "--profile",
+        choices=list(PROFILES),
+        default=None,
+        help="fast: all-MiniLM-L6-v2 with binary embeddings (Hamming-distance search); "
+             "balanced: all-MiniLM-L6-v2 with int8 embeddings; "
+             "accurate: all-mpnet-base-v2 with float32 embeddings. "
+             "An existing index only opens with the model and format it was built with "
+             f"(default: those recorded with the index, else {DEFAULT_PROFILE})",
+    )
+
+
+def add_precision_argument(subparser: argparse.ArgumentParser) -> None:
+    """
+    Add the text model precision and inference backend options.
+    
+    :param subparser: Subcommand parser to extend
+    """
+    subparser.add_argument(
+        "--precision",
+        choices=["auto", "fp32", "fp16", "bf16"],
+        default="auto",
+        help="Text model forward-pass precision; auto uses fp16 on a CUDA GPU and fp32 "
+             "otherwise, fp16 needs a GPU, bf16 a GPU or a CPU with bf16 support (default: auto)",
+    )
+    subparser.add_argument(
+        "--backend",
+        choices=["torch", "onnx"],
+        default="torch",
+        help="Text model inference backend; onnx runs an exported ONNX Runtime graph and "
+             "needs the onnx extra (pip install -e .[onnx]) (default: torch)",
+    )
+
+
+def add_model_server_arguments(subparser: argparse.ArgumentParser) -> None:
+    """
+    Add model server and storage options shared by commands that need embeddings.
+    
+    :param subparser: Subcommand parser to extend
+    """
+    subparser.add_argument(
+        "--image-model",
+        type=str,
+        default="openai/clip-vit-base-patch32",
+        help="Image embedding model to use (default: openai/clip-vit-base-patch32)",
+    )
+    subparser.add_argument(
+        "--server",
+        action="store_true",
+        help="Start a background model server if none is running and use it for embeddings",
+    )
+    subparser.add_argument(
+        "--embedding-dtype",
+        choices=["float32", "float16", "int8", "binary"],
+        default=None,
+        help="Embedding storage format; float16 halves the size, int8 stores normalized vectors with per-vector scales "
+             "at 1/4 the size, binary stores sign bits at 1/32 the size (default: from --profile, "
+             "else the format of the existing index)",
+    )
+
+
 def main() -> int:
     """
     Main entry point for FileX CLI.
@@ -300,17 +660,40 @@ def main() -> int:
         nargs="+",
         help="Only index files with these extensions (e.g., --extensions .txt .docx)",
     )
+    index_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to extract text from files (default: CPU count, 1 disables)",
+    )
+    index_parser.add_argument(
+        "--keep-file-embeddings",
+        action="store_true",
+        help="Also store a per-file copy of each file's embeddings in .filex/embeddings "
+             "(default: off, or FILEX_KEEP_FILE_EMBEDDINGS=1)",
+    )
+    index_parser.add_argument(
+        "--image-batch-size",
+        type=int,
+        default=None,
+        help="Images embedded per image model call (default: 32, or FILEX_IMAGE_BATCH_SIZE)",
+    )
     index_parser.add_argument(
         "--model",
         type=str,
-        default="all-mpnet-base-v2",
-        help="Embedding model to use (default: all-mpnet-base-v2, 768 dimensions)",
+        default=None,
+        help="Embedding model to use (default: from --profile, else the model of the existing index)",
     )
+    add_profile_argument(index_parser)
+    add_model_server_arguments(index_parser)
+    add_precision_argument(index_parser)
     
     search_parser = subparsers.add_parser("search", help="Search indexed files")
     search_parser.add_argument(
         "query",
-        help="Search query (e.g., 'types of fruits -count 5' or 'types of fruits --3')",
+        nargs="+",
+        help="Search query (e.g., 'types of fruits -count 5' or 'types of fruits --3'); "
+             "pass several quoted queries to search them in one batch",
     )
     search_parser.add_argument(
         "--count",
@@ -321,9 +704,12 @@ def main() -> int:
     search_parser.add_argument(
         "--model",
         type=str,
-        default="all-mpnet-base-v2",
-        help="Embedding model to use (default: all-mpnet-base-v2, 768 dimensions)",
+        default=None,
+        help="Embedding model to use (default: from --profile, else the model of the existing index)",
     )
+    add_profile_argument(search_parser)
+    add_model_server_arguments(search_parser)
+    add_precision_argument(search_parser)
     
     status_parser = subparsers.add_parser("status", help="Show repository status")
     status_parser.add_argument(
@@ -333,18 +719,44 @@ def main() -> int:
         help="Embedding model to use (default: all-mpnet-base-v2, 768 dimensions)",
     )
     
+    serve_parser = subparsers.add_parser("serve", help="Keep embedding models loaded for faster commands")
+    serve_parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        help="Embedding model to serve (default: from --profile, else the model of the existing index)",
+    )
+    add_profile_argument(serve_parser)
+    serve_parser.add_argument(
+        "--image-model",
+        type=str,
+        default="openai/clip-vit-base-patch32",
+        help="Image embedding model to serve (default: openai/clip-vit-base-patch32)",
+    )
+    serve_parser.add_argument(
+        "--no-compile",
+        action="store_true",
+        help="Skip torch.compile of the models (faster startup, slower embedding)",
+    )
+    add_precision_argument(serve_parser)
+    
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         return 1
     
+    if hasattr(args, "profile"):
+        apply_profile(args)
+    
     if args.command == "index":
         return cmd_index(args)
     elif args.command == "search":
         return cmd_search(args)
     elif args.command == "status":
         return cmd_status(args)
+    elif args.command == "serve":
+        return cmd_serve(args)
     else:
         parser.print_help()
         return 1
@@ -1,20 +1,42 @@
 """
 Core FileX components for repository management and file processing.
+
+Exports are imported lazily (PEP 562): a submodule is imported the first time one of
+its names is accessed, so light commands such as status never import torch.
 """
-from .logger import get_logger, configure_logging
-from .repository import Repository, RepositoryConfig
-from .file_metadata import FileMetadata
-from .file_processor import FileProcessorRouter
-from .index_manager import IndexManager, FileIndexEntry
-from .storage_manager import StorageManager
-from .search_manager import SearchManager, SearchResult
-from .repo_manager import RepositoryManager
-from .file_handlers import TextFileHandler, DefaultFileHandler
-from .image_handlers import ImageFileHandler
-from .handler import TextEmbeddingHandler
-from .embedders import SentenceTransformerEmbedder
-from .image_embedders import CLIPImageEmbedder
-from .chunkers import FixedSizeChunker, SentenceAwareChunker
+import importlib
+from typing import Any, List
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "get_logger": "logger",
+    "configure_logging": "logger",
+    "Repository": "repository",
+    "RepositoryConfig": "repository",
+    "FileMetadata": "file_metadata",
+    "FileProcessorRouter": "file_processor",
+    "IndexManager": "index_manager",
+    "FileIndexEntry": "index_manager",
+    "StorageManager": "storage_manager",
+    "SearchManager": "search_manager",
+    "SearchResult": "search_manager",
+    "RepositoryManager": "repo_manager",
+    "TextFileHandler": "file_handlers",
+    "DefaultFileHandler": "file_handlers",
+    "ImageFileHandler": "image_handlers",
+    "TextEmbeddingHandler": "handler",
+    "ChunkEmbeddingCache": "chunk_cache",
+    "QueryEmbeddingCache": "query_cache",
+    "SentenceTransformerEmbedder": "embedders",
+    "CLIPImageEmbedder": "image_embedders",
+    "MultiGPUImageEmbedder": "image_embedders",
+    "FixedSizeChunker": "chunkers",
+    "SentenceAwareChunker": "chunkers",
+    "ModelServer": "model_server",
+    "ModelClient": "model_server",
+    "RemoteEmbedder": "model_server",
+    "RemoteImageEmbedder": "model_server",
+}
 
 __all__ = [
     "get_logger",
@@ -33,8 +55,36 @@ __all__ = [
     "ImageFileHandler",
     "DefaultFileHandler",
     "TextEmbeddingHandler",
+    "ChunkEmbeddingCache",
+    "QueryEmbeddingCache",
     "SentenceTransformerEmbedder",
     "CLIPImageEmbedder",
+    "MultiGPUImageEmbedder",
     "FixedSizeChunker",
     "SentenceAwareChunker",
+    "ModelServer",
+    "ModelClient",
+    "RemoteEmbedder",
+    "RemoteImageEmbedder",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the submodule defining an exported name on first access.
+    
+    :param name: Attribute name
+    :returns: The exported object
+    :raises AttributeError: If name is not exported
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """List module attributes including not-yet-imported exports."""
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -0,0 +1,225 @@
+"""
+Content-addressed cache of chunk embeddings.
+"""
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+import numpy as np
+
+from .quantization import normalize_rows, quantize_int8, dequantize_int8, binarize, unbinarize
+from .logger import get_logger
+
+
+class ChunkEmbeddingCache:
+    """
+    Maps (model, chunk text) hashes to embedding vectors.
+
+    Lets re-indexing of a changed file reuse the vectors of chunks whose text did
+    not change. Keys are 16-byte blake2b digests of the model (name, precision and
+    backend) and the text. Vectors are kept in the search index dtype, so an int8
+    or binary index also gets a 4x or 32x smaller cache. At most max_entries are
+    kept, least recently used first out; the cache is persisted as a single .npz
+    file with a key matrix and a vector matrix.
+    """
+
+    KEY_SIZE = 16
+    DTYPES = ("float32", "float16", "int8", "binary")
+    # Entries kept before the least recently used are evicted (about 300 MB of
+    # float32 768-dim vectors)
+    MAX_ENTRIES = 100000
+
+    def __init__(self, cache_path: Path, dtype: str = "float32", max_entries: int = MAX_ENTRIES):
+        """
+        Initialize the cache, loading existing entries from disk.
+
+        :param cache_path: Path of the .npz cache file (must not be None)
+        :param dtype: How vectors are stored: "float32", "float16", "int8" (codes of
+            unit-normalized rows with per-row scales) or "binary" (packed sign bits);
+            use the search index dtype, whose precision is all a cached vector needs
+        :param max_entries: Maximum number of cached vectors (must be > 0)
+        """
+        self.logger = get_logger(__name__)
+
+        if cache_path is None:
+            self.logger.error("cache_path cannot be None")
+            raise ValueError("cache_path cannot be None")
+        if dtype not in self.DTYPES:
+            self.logger.error(f"Unsupported dtype: {dtype}")
+            raise ValueError(f"dtype must be one of {self.DTYPES}, got: {dtype}")
+        if max_entries <= 0:
+            self.logger.error(f"max_entries must be positive, got: {max_entries}")
+            raise ValueError("max_entries must be positive")
+
+        self.cache_path = Path(cache_path)
+        self.dtype = dtype
+        self.max_entries = max_entries
+        # key -> (stored row, int8 scale or None), least recently used first
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, Optional[float]]]" = OrderedDict()
+        self._dimension: Optional[int] = None
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def make_key(cls, model_name: str, text: str, precision: str = "", backend: str = "") -> bytes:
+        """
+        Compute the cache key for a chunk embedded by a model.
+
+        :param model_name: Name of the embedding model
+        :param text: Chunk text
+        :param precision: Forward-pass precision of the model (e.g. "fp16")
+        :param backend: Inference backend of the model (e.g. "onnx")
+        :returns: 16-byte digest
+        """
+        digest = hashlib.blake2b(digest_size=cls.KEY_SIZE)
+        for part in (model_name, precision, backend):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def _load(self) -> None:
+        """
+        Load cached entries from disk, starting empty if unavailable.
+        """
+        if not self.cache_path.exists():
+            self.logger.debug(f"No chunk cache at {self.cache_path}, starting empty")
+            return
+
+        try:
+            with np.load(self.cache_path) as data:
+                stored_dtype = str(data["dtype"]) if "dtype" in data.files else "float32"
+                if stored_dtype != self.dtype:
+                    self.logger.info(
+                        f"Chunk cache holds {stored_dtype} vectors, not {self.dtype}; starting empty"
+                    )
+                    self._dirty = True
+                    return
+                keys = data["keys"]
+                vectors = data["vectors"]
+                scales = data["scales"] if "scales" in data.files else None
+                dimension = int(data["dimension"]) if "dimension" in data.files else vectors.shape[1]
+            # Keep the most recently used entries (stored last)
+            start = max(0, len(keys) - self.max_entries)
+            for row in range(start, len(keys)):
+                scale = float(scales[row]) if scales is not None else None
+                self._entries[keys[row].tobytes()] = (vectors[row], scale)
+            self._dimension = dimension if self._entries else None
+            self.logger.info(f"Loaded chunk cache: {len(self._entries)} entries")
+        except Exception as e:
+            self.logger.warning(f"Failed to load chunk cache: {e}, starting empty")
+            self._entries = OrderedDict()
+            self._dimension = None
+
+    def _encode(self, vector: np.ndarray) -> Tuple[np.ndarray, Optional[float]]:
+        """
+        Convert an embedding vector to the stored representation.
+
+        :param vector: 1D embedding vector
+        :returns: Tuple of (stored row, int8 scale or None)
+        """
+        if self.dtype == "int8":
+            codes, scales = quantize_int8(normalize_rows(vector[None, :]))
+            return codes[0], float(scales[0])
+        if self.dtype == "binary":
+            return binarize(vector[None, :])[0], None
+        return np.array(vector, dtype=np.float16 if self.dtype == "float16" else np.float32), None
+
+    def _decode(self, row: np.ndarray, scale: Optional[float]) -> np.ndarray:
+        """
+        Convert a stored row back to a float32 embedding vector.
+
+        :param row: Stored row
+        :param scale: int8 scale of the row (None for other dtypes)
+        :returns: 1D float32 vector (unit length for int8 and binary rows)
+        """
+        if self.dtype == "int8":
+            return dequantize_int8(row[None, :], np.array([scale], dtype=np.float32))[0]
+        if self.dtype == "binary":
+            return unbinarize(row[None, :], self._dimension)[0]
+        return row.astype(np.float32)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """
+        Look up a cached embedding and mark it as recently used.
+
+        :param key: Key from make_key
+        :returns: Cached embedding vector (float32), or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return self._decode(*entry)
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        """
+        Store an embedding vector, evicting the least recently used beyond max_entries.
+
+        Vectors of another dimension than the cached ones (a different model) replace
+        the whole cache, since the file holds a single vector matrix.
+
+        :param key: Key from make_key
+        :param vector: 1D embedding vector
+        """
+        vector = np.asarray(vector)
+        if self._dimension != vector.shape[0]:
+            if self._entries:
+                self.logger.info(
+                    f"Chunk cache dimension changed ({self._dimension} -> {vector.shape[0]}), clearing"
+                )
+                self._entries.clear()
+            self._dimension = vector.shape[0]
+        self._entries[key] = self._encode(vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def save(self, live_keys: Optional[Iterable[bytes]] = None) -> None:
+        """
+        Write the cache to disk if entries changed since the last save.
+
+        :param live_keys: Keys of the chunks in the current search index (optional);
+            other entries are dropped before writing. Only consumed when a write is due.
+        """
+        if not self._dirty:
+            return
+
+        if live_keys is not None:
+            live = set(live_keys)
+            stale = [key for key in self._entries if key not in live]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self.logger.debug(f"Pruned {len(stale)} chunk cache entries not in the index")
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._entries:
+            self.cache_path.unlink(missing_ok=True)
+            self._dimension = None
+            self._dirty = False
+            self.logger.info("Chunk cache is empty, removed")
+            return
+
+        keys = np.frombuffer(b"".join(self._entries.keys()), dtype=np.uint8).reshape(-1, self.KEY_SIZE)
+        vectors = np.stack([row for row, _ in self._entries.values()])
+        arrays = {
+            "keys": keys,
+            "vectors": vectors,
+            "dtype": np.array(self.dtype),
+            "dimension": np.array(self._dimension),
+        }
+        if self.dtype == "int8":
+            arrays["scales"] = np.array([scale for _, scale in self._entries.values()], dtype=np.float32)
+
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        tmp_path.replace(self.cache_path)
+
+        self._dirty = False
+        self.logger.info(f"Saved chunk cache: {len(self._entries)} entries")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,31 @@
 """
 Chunking strategy implementations.
 """
-from typing import List
+import functools
+import re
+from typing import Any, List, Optional
 from .interfaces import Chunker
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sentence boundaries: runs of terminal punctuation followed by whitespace or end of text
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+[\s\n]+|[.!?]+$')
+
+
+@functools.lru_cache(maxsize=1)
+def _load_blingfire() -> Optional[Any]:
+    """
+    Import the optional blingfire package on first use.
+    
+    :returns: The blingfire module, or None if it is not installed
+    """
+    try:
+        import blingfire
+    except ImportError:
+        logger.warning("blingfire is not installed (pip install -e .[sentences]), using regex splitter")
+        return None
+    return blingfire
 
 
 class FixedSizeChunker(Chunker):
@@ -39,18 +62,12 @@ class FixedSizeChunker(Chunker):
         if not text:
             return []
         
-        chunks = []
+        # Chunk starts form an arithmetic progression, so slice them directly; isspace()
+        # stops at the first non-whitespace character instead of copying like strip().
         step = self.chunk_size - self.overlap
-        start = 0
-        
-        while start < len(text):
-            end = min(start + self.chunk_size, len(text))
-            chunk = text[start:end]
-            if chunk.strip():
-                chunks.append(chunk)
-            start += step
-        
-        return chunks if chunks else [text]
+        size = self.chunk_size
+        chunks = [text[start:start + size] for start in range(0, len(text), step)]
+        return [chunk for chunk in chunks if not chunk.isspace()] or [text]
     
     def get_chunk_count_estimate(self, text_length: int) -> int:
         """
@@ -74,20 +91,29 @@ class SentenceAwareChunker(Chunker):
     Larger documents produce more chunks.
     """
     
-    def __init__(self, target_chunk_size: int, max_chunk_size: int = None):
+    SPLITTERS = ("regex", "blingfire")
+    
+    def __init__(self, target_chunk_size: int, max_chunk_size: int = None, splitter: str = "regex"):
         """
         Initialize sentence-aware chunker.
         
         :param target_chunk_size: Target number of characters per chunk (must be > 0)
         :param max_chunk_size: Maximum allowed chunk size (defaults to 2x target, must be >= target_chunk_size if provided)
+        :param splitter: Sentence splitter: "regex" (terminal punctuation followed by
+            whitespace), or "blingfire" for its C++ sentence breaker, which also handles
+            abbreviations and releases the GIL (falls back to "regex" if not installed).
+            The splitters place boundaries differently, so changing it changes chunks.
         """
         if target_chunk_size <= 0:
             raise ValueError("target_chunk_size must be positive")
         if max_chunk_size is not None and max_chunk_size < target_chunk_size:
             raise ValueError("max_chunk_size must be >= target_chunk_size")
+        if splitter not in self.SPLITTERS:
+            raise ValueError(f"splitter must be one of {self.SPLITTERS}, got: {splitter}")
         
         self.target_chunk_size = target_chunk_size
         self.max_chunk_size = max_chunk_size or (target_chunk_size * 2)
+        self.splitter = splitter
     
     def _split_into_sentences(self, text: str) -> List[str]:
         """
@@ -96,10 +122,12 @@ class SentenceAwareChunker(Chunker):
         :param text: Text to split
         :returns: List of sentences
         """
-        import re
-        sentence_endings = re.compile(r'[.!?]+[\s\n]+|[.!?]+$')
-        sentences = sentence_endings.split(text)
-        return [s.strip() for s in sentences if s.strip()]
+        if self.splitter == "blingfire":
+            blingfire = _load_blingfire()
+            if blingfire is not None:
+                pieces = blingfire.text_to_sentences(text).split("\n")
+                return [s for s in (s.strip() for s in pieces) if s]
+        return [s for s in (s.strip() for s in _SENTENCE_SPLIT_RE.split(text)) if s]
     
     def chunk(self, text: str) -> List[str]:
         """
@@ -118,15 +146,14 @@ class SentenceAwareChunker(Chunker):
         chunks = []
         current_chunk = []
         current_size = 0
+        # max_chunk_size >= target_chunk_size, so exceeding the target is the only
+        # condition that closes a chunk
+        target_size = self.target_chunk_size
         
         for sentence in sentences:
             sentence_size = len(sentence)
             
-            if current_size + sentence_size > self.max_chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [sentence]
-                current_size = sentence_size
-            elif current_size + sentence_size > self.target_chunk_size and current_chunk:
+            if current_chunk and current_size + sentence_size > target_size:
                 chunks.append(' '.join(current_chunk))
                 current_chunk = [sentence]
                 current_size = sentence_size
@@ -2,49 +2,317 @@
 Embedder implementations.
 """
 import os
-from typing import List
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 from .interfaces import Embedder
+from .torch_utils import (
+    PRECISION_CHOICES,
+    autocast_context,
+    compile_module,
+    default_device,
+    resolve_precision,
+    warm_up,
+)
 from .logger import get_logger
 
 os.environ.setdefault("HF_HUB_DISABLE_SYMLINKS_WARNING", "1")
 
+# Models loaded in this process, shared by every embedder with the same
+# (model name, device, half-precision weights, backend)
+_MODEL_CACHE: Dict[Tuple[str, str, bool, str], SentenceTransformer] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _load_model(model_name: str, device: str, half: bool, backend: str = "torch") -> SentenceTransformer:
+    """
+    Get a sentence-transformer model, loading it only on first use in this process.
+    
+    :param model_name: Name of the sentence-transformer model
+    :param device: Device to load the model on
+    :param half: Convert the weights to float16 (torch backend only)
+    :param backend: Inference backend ("torch" or "onnx")
+    :returns: Shared model in eval mode
+    :raises ImportError: If the ONNX backend's optional dependencies are missing
+    """
+    logger = get_logger(__name__)
+    key = (model_name, device, half, backend)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            logger.debug(f"Reusing loaded sentence-transformer model: {model_name}")
+            return model
+        
+        logger.info(f"Loading sentence-transformer model: {model_name}")
+        logger.debug(
+            "Models are automatically cached by huggingface_hub in ~/.cache/huggingface/hub/. "
+            "First load downloads the model, subsequent loads use cache."
+        )
+        if backend == "torch":
+            model = SentenceTransformer(model_name, device=device)
+        else:
+            try:
+                model = SentenceTransformer(model_name, device=device, backend=backend)
+            except ImportError as e:
+                logger.error(f"{backend} backend is unavailable: {e}")
+                raise ImportError(
+                    f"The {backend} backend requires sentence-transformers>=3.2 with ONNX Runtime "
+                    f"(pip install -e .[onnx]): {e}"
+                )
+        if half:
+            model.half()
+        model.eval()
+        _MODEL_CACHE[key] = model
+        return model
+
 
 class SentenceTransformerEmbedder:
     """
     Embedder implementation using sentence-transformers library.
     
     Wraps a SentenceTransformer model to provide the Embedder interface.
+    Returned embeddings are L2-normalized, so cosine similarity is a dot product.
     """
     
-    def __init__(self, model_name: str = "all-mpnet-base-v2"):
+    # Embeddings come out L2-normalized (read by TextEmbeddingHandler to skip its own pass)
+    normalizes_embeddings = True
+    # Rough characters per token, used to estimate sequence lengths before tokenizing
+    CHARS_PER_TOKEN = 4
+    # Upper bound on length-batched batch sizes, as a multiple of batch_size
+    MAX_BATCH_MULTIPLIER = 8
+    # Smallest padded sequence length of compiled forward passes; longer batches are
+    # padded up to the next power of two so compiled graphs are reused across batches
+    SEQ_LENGTH_BUCKET_MIN = 32
+    BACKENDS = ("torch", "onnx")
+    
+    def __init__(
+        self,
+        model_name: str = "all-mpnet-base-v2",
+        batch_size: int = 64,
+        compile_model: bool = False,
+        precision: str = "auto",
+        backend: str = "torch",
+    ):
         """
         Initialize the embedder with a sentence-transformer model.
         
         Uses high-dimensional embeddings (768 dimensions by default) for better
         semantic understanding. See README.md for available models and their dimensions.
+        The model is loaded once per process and shared by embedders with the same name
+        and precision.
         
         :param model_name: Name of the sentence-transformer model to use (must not be empty)
             Default: "all-mpnet-base-v2" (768 dimensions, recommended for production)
             Alternatives: "all-MiniLM-L6-v2" (384 dims, faster), 
                          "all-roberta-large-v1" (1024 dims, highest quality)
+        :param batch_size: Number of texts encoded per forward pass (must be > 0)
+        :param compile_model: Compile the transformer with torch.compile (slower startup,
+            faster encoding; worthwhile for long-running processes such as the model server)
+        :param precision: Forward-pass precision: "auto" (fp16 on CUDA, fp32 elsewhere),
+            "fp32", "fp16" (CUDA; float16 weights) or "bf16" (GPU or CPUs with bf16
+            support); embeddings are always returned as float32
+        :param backend: Inference backend: "torch", or "onnx" to run an exported ONNX Runtime
+            graph (fused kernels, no per-op Python dispatch; always fp32, never compiled)
         """
         self.logger = get_logger(__name__)
         
         if not model_name:
             self.logger.error("model_name cannot be empty")
             raise ValueError("model_name cannot be empty")
+        if batch_size <= 0:
+            self.logger.error(f"batch_size must be positive, got: {batch_size}")
+            raise ValueError("batch_size must be positive")
+        if precision not in PRECISION_CHOICES:
+            self.logger.error(f"Unsupported precision: {precision}")
+            raise ValueError(f"precision must be one of {list(PRECISION_CHOICES)}, got: {precision}")
+        if backend not in self.BACKENDS:
+            self.logger.error(f"Unsupported backend: {backend}")
+            raise ValueError(f"backend must be one of {list(self.BACKENDS)}, got: {backend}")
         
-        self.logger.info(f"Loading sentence-transformer model: {model_name}")
-        self.logger.debug(
-            "Models are automatically cached by huggingface_hub in ~/.cache/huggingface/hub/. "
-            "First load downloads the model, subsequent loads use cache."
-        )
-        self.model = SentenceTransformer(model_name)
+        self.device = default_device()
+        self.precision = resolve_precision(precision, self.device) if backend == "torch" else "fp32"
+        self.backend = backend
+        # On CUDA, fp16 stores the weights in half precision instead of only autocasting
+        self.model = _load_model(model_name, self.device, self.precision == "fp16", backend)
         self.model_name = model_name
-        self.logger.info(f"SentenceTransformerEmbedder initialized with model: {model_name}")
+        self.batch_size = batch_size
+        # Per-thread float32 buffers that forward passes copy their output into
+        self._staging = threading.local()
+        # Set once the transformer runs compiled; forward passes then pad to length buckets
+        self._compiled = False
+        
+        if compile_model and backend == "torch":
+            self._compile()
+        
+        self.logger.info(
+            f"SentenceTransformerEmbedder initialized with model: {model_name} ({backend} backend)"
+        )
+    
+    def _compile(self) -> None:
+        """
+        Compile the underlying transformer and warm it up with a dummy batch.
+        
+        The model is shared with other embedders, so an already compiled transformer
+        is left as is.
+        """
+        transformer = self.model[0]
+        eager_model = transformer.auto_model
+        if hasattr(eager_model, "_orig_mod"):
+            self._compiled = True
+            return
+        transformer.auto_model = compile_module(eager_model, self.device)
+        if transformer.auto_model is eager_model:
+            return
+        
+        def restore() -> None:
+            transformer.auto_model = eager_model
+        
+        self._compiled = warm_up(lambda: self._encode(["warm up"] * 2), restore)
+    
+    def _pad_to_length_bucket(self, features: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Right-pad tokenized features to a bucketed sequence length.
+        
+        Compiled graphs (and CUDA graphs captured by "reduce-overhead") are specialized
+        per input shape; padding to a few lengths (SEQ_LENGTH_BUCKET_MIN, then powers
+        of two up to the model's maximum) lets them be replayed instead of recorded
+        anew. Padded positions are masked out, so embeddings are unchanged.
+        
+        :param features: Tokenized features as returned by model.tokenize
+        :returns: Features with every token-level tensor padded to the bucket length
+        """
+        input_ids = features.get("input_ids")
+        if not isinstance(input_ids, torch.Tensor) or input_ids.dim() != 2:
+            return features
+        length = input_ids.shape[1]
+        max_length = max(self.model.get_max_seq_length() or length, length)
+        bucket = min(max(self.SEQ_LENGTH_BUCKET_MIN, 1 << (length - 1).bit_length()), max_length)
+        if bucket <= length:
+            return features
+        
+        pad_token_id = getattr(self.model.tokenizer, "pad_token_id", None) or 0
+        padded = {}
+        for name, value in features.items():
+            if isinstance(value, torch.Tensor) and value.dim() == 2 and value.shape[1] == length:
+                fill = pad_token_id if name == "input_ids" else 0
+                value = torch.nn.functional.pad(value, (0, bucket - length), value=fill)
+            padded[name] = value
+        return padded
+    
+    def _encode(self, texts: Any, batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Run the model at the configured precision under torch.inference_mode.
+        
+        model.encode only disables gradients; inference mode also skips autograd
+        version counting and view tracking on every tensor it creates.
+        
+        :param texts: A single text or a list of texts
+        :param batch_size: Texts per forward pass (defaults to self.batch_size)
+        :returns: L2-normalized float32 embeddings (1D for a single text, 2D for a list)
+        """
+        with torch.inference_mode(), autocast_context(self.device, self.precision):
+            embeddings = self.model.encode(
+                texts,
+                batch_size=batch_size or self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        return embeddings.astype(np.float32, copy=False)
+    
+    def _staging_buffer(self, rows: int, dimension: int) -> np.ndarray:
+        """
+        Get this thread's reusable float32 buffer for forward-pass output.
+        
+        The buffer is allocated once for the largest length-batched batch and grown
+        only if a batch exceeds it, instead of allocating an output array per batch.
+        
+        :param rows: Number of rows needed
+        :param dimension: Embedding dimension
+        :returns: View of shape (rows, dimension), overwritten by the next forward pass
+            on this thread
+        """
+        buffer = getattr(self._staging, "buffer", None)
+        if buffer is None or buffer.shape[0] < rows or buffer.shape[1] != dimension:
+            capacity = max(rows, self.batch_size * self.MAX_BATCH_MULTIPLIER)
+            buffer = np.empty((capacity, dimension), dtype=np.float32)
+            self._staging.buffer = buffer
+        return buffer[:rows]
+    
+    def _forward(self, texts: List[str], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Tokenize texts as one padded batch and run a single forward pass.
+        
+        Skips model.encode's per-call sorting, batching and progress bookkeeping for
+        batches that are already formed, and runs under torch.inference_mode. When the
+        transformer is compiled, sequences are padded to a length bucket first.
+        
+        :param texts: Texts forming one batch (must not be empty)
+        :param out: float32 array of shape (len(texts), dimension) to write into
+            (optional); the device transfer and float32 cast then happen in one copy
+        :returns: 2D float32 array with one L2-normalized row per text (out, if given)
+        """
+        features = self.model.tokenize(texts)
+        if self._compiled:
+            features = self._pad_to_length_bucket(features)
+        features = {
+            name: value.to(self.model.device) if isinstance(value, torch.Tensor) else value
+            for name, value in features.items()
+        }
+        with torch.inference_mode(), autocast_context(self.device, self.precision):
+            embeddings = self.model(features)["sentence_embedding"]
+            embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+            if out is not None:
+                torch.from_numpy(out).copy_(embeddings)
+                return out
+        return embeddings.float().cpu().numpy()
+    
+    def _encode_length_batched(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts in length-sorted batches sized to a fixed token budget.
+        
+        model.encode already sorts by length, but uses one batch size throughout, so
+        short texts run in batches far below what fits. Here each batch holds as
+        many texts as fit in batch_size * max_seq_length estimated tokens (capped
+        at MAX_BATCH_MULTIPLIER * batch_size), and rows are scattered back to input order.
+        Each batch is tokenized once and run through _forward on the torch backend.
+        
+        :param texts: Texts to embed (must not be empty)
+        :returns: 2D float32 array with one row per text, in input order
+        """
+        max_tokens = self.model.get_max_seq_length() or 512
+        token_budget = self.batch_size * max_tokens
+        max_batch = self.batch_size * self.MAX_BATCH_MULTIPLIER
+        lengths = [min(max_tokens, len(text) // self.CHARS_PER_TOKEN + 2) for text in texts]
+        order = np.argsort(lengths, kind="stable")
+        dimension = self.model.get_sentence_embedding_dimension()
+        
+        embeddings = None
+        start = 0
+        while start < len(order):
+            # Lengths ascend, so the newest text sets the padded length of the batch
+            end = start + 1
+            while (
+                end < len(order)
+                and end - start < max_batch
+                and (end - start + 1) * lengths[order[end]] <= token_budget
+            ):
+                end += 1
+            rows = order[start:end]
+            batch_texts = [texts[i] for i in rows]
+            if self.backend == "torch":
+                out = self._staging_buffer(len(rows), dimension) if dimension else None
+                batch = self._forward(batch_texts, out=out)
+            else:
+                batch = self._encode(batch_texts, batch_size=len(rows))
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+            embeddings[rows] = batch
+            start = end
+        return embeddings
     
     def embed(self, text: str) -> np.ndarray:
         """
@@ -52,6 +320,7 @@ class SentenceTransformerEmbedder:
         
         :param text: The text to embed (must not be empty)
         :returns: A 1D numpy array representing the embedding vector
+        :postcondition: The result has unit L2 norm
         :raises ValueError: If text is empty or invalid
         """
         if not text:
@@ -59,7 +328,7 @@ class SentenceTransformerEmbedder:
             raise ValueError("text cannot be empty")
         
         self.logger.debug(f"Generating embedding for text of length {len(text)} characters")
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        embedding = self._encode(text)
         self.logger.debug(f"Generated embedding with dimension {embedding.shape[0]}")
         return embedding
     
@@ -67,9 +336,13 @@ class SentenceTransformerEmbedder:
         """
         Generate embedding vectors for multiple texts efficiently.
         
+        Inputs larger than one batch are grouped by length, with larger batches for
+        shorter texts (see _encode_length_batched).
+        
         :param texts: List of texts to embed (must not be empty)
         :returns: A 2D numpy array where each row is an embedding vector
         :postcondition: result.shape[0] == len(texts)
+        :postcondition: Each row has unit L2 norm
         :raises ValueError: If texts list is empty
         """
         if not texts:
@@ -77,7 +350,10 @@ class SentenceTransformerEmbedder:
             raise ValueError("texts list cannot be empty")
         
         self.logger.debug(f"Generating embeddings for batch of {len(texts)} texts")
-        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        if len(texts) > self.batch_size:
+            embeddings = self._encode_length_batched(texts)
+        else:
+            embeddings = self._encode(texts)
         self.logger.debug(
             f"Generated batch embeddings: shape {embeddings.shape}, "
             f"dimension {embeddings.shape[1] if len(embeddings.shape) > 1 else embeddings.shape[0]}"
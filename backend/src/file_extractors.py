@@ -1,91 +1,225 @@
 """
 File extraction utilities for various file types.
 """
-from typing import Optional
-from pathlib import Path
-import docx
+import io
+import mmap
+import os
+import zipfile
+from typing import Callable, List, Optional
+from xml.etree import ElementTree
 
+from .interfaces import Chunker
 from .logger import get_logger
 
+logger = get_logger(__name__)
+
+# WordprocessingML element tags read by the DOCX extractor
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY = f'{_W_NS}body'
+_W_P = f'{_W_NS}p'
+_W_R = f'{_W_NS}r'
+_W_HYPERLINK = f'{_W_NS}hyperlink'
+_W_T = f'{_W_NS}t'
+_W_TAB = f'{_W_NS}tab'
+_W_PTAB = f'{_W_NS}ptab'
+_W_BR = f'{_W_NS}br'
+_W_CR = f'{_W_NS}cr'
+_W_NO_BREAK_HYPHEN = f'{_W_NS}noBreakHyphen'
+_W_TYPE = f'{_W_NS}type'
+# Text of run children other than w:t, as python-docx's Run.text renders them
+_W_RUN_CHARACTERS = {_W_TAB: '\t', _W_PTAB: '\t', _W_CR: '\n', _W_NO_BREAK_HYPHEN: '-'}
+
+
+def _write_paragraph_text(paragraph: ElementTree.Element, write: Callable[[str], object]) -> None:
+    """
+    Write the text of a DOCX paragraph the way python-docx's Paragraph.text builds it.
+    
+    Only runs directly in the paragraph or in its hyperlinks count, so text boxes
+    and other content anchored in a run are skipped.
+    
+    :param paragraph: w:p element
+    :param write: Callable receiving the text pieces
+    """
+    for child in paragraph:
+        runs = [child] if child.tag == _W_R else child.iterfind(_W_R) if child.tag == _W_HYPERLINK else ()
+        for run in runs:
+            for node in run:
+                tag = node.tag
+                if tag == _W_T:
+                    if node.text:
+                        write(node.text)
+                elif tag == _W_BR:
+                    if node.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                        write('\n')
+                else:
+                    character = _W_RUN_CHARACTERS.get(tag)
+                    if character:
+                        write(character)
+
+
+def extract_and_chunk(file_path: str, chunker: Chunker) -> Optional[List[str]]:
+    """
+    Extract text from a file and chunk it.
+    
+    Module-level so it can run in a worker process; the main process only has to
+    embed the returned chunks.
+    
+    :param file_path: Path to the file (must exist and be a supported type)
+    :param chunker: Chunking strategy (must be picklable)
+    :returns: List of chunks, or None if the file has no text to chunk
+    """
+    text = FileExtractor.extract_text(file_path)
+    if not text:
+        return None
+    return chunker.chunk(text) or None
+
+
+def prefetch_file(file_path: str) -> None:
+    """
+    Ask the kernel to start reading a file into the page cache in the background.
+    
+    Hinting files queued for extraction lets the disk serve many reads at once
+    while earlier files are still being parsed. A no-op where posix_fadvise is
+    unavailable; errors are ignored since the hint is only an optimization.
+    
+    :param file_path: Path to the file
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class FileExtractor:
     """
     Utility class for extracting text content from files.
     """
     
+    # Extensions extract_text dispatches on
+    SUPPORTED_EXTENSIONS = frozenset({'.txt', '.docx'})
+    
     @staticmethod
     def extract_text(file_path: str) -> str:
         """
         Extract text content from a file based on its extension.
         
+        Supported files are checked for existence by opening them rather than by a
+        separate stat call; other files are checked before their type is rejected.
+        
         :param file_path: Path to the file (must exist and be readable)
         :returns: Extracted text content
         :raises FileNotFoundError: If file does not exist
         :raises ValueError: If file type is not supported
         """
-        logger = get_logger(__name__)
-        logger.debug(f"Extracting text from file: {file_path}")
+        logger.debug("Extracting text from file: %s", file_path)
         
-        path = Path(file_path)
+        suffix = os.path.splitext(file_path)[1].lower()
+        logger.debug("File extension: %s", suffix)
         
-        if not path.exists():
-            logger.error(f"File not found: {file_path}")
+        if suffix not in FileExtractor.SUPPORTED_EXTENSIONS and not os.path.exists(file_path):
+            logger.error("File not found: %s", file_path)
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        suffix = path.suffix.lower()
-        logger.debug(f"File extension: {suffix}")
+        try:
+            if suffix == '.txt':
+                text = FileExtractor._extract_txt(file_path)
+                logger.info("Successfully extracted %d characters from TXT file", len(text))
+                return text
+            elif suffix == '.docx':
+                text = FileExtractor._extract_docx(file_path)
+                logger.info("Successfully extracted %d characters from DOCX file", len(text))
+                return text
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
+            raise FileNotFoundError(f"File not found: {file_path}")
         
-        if suffix == '.txt':
-            text = FileExtractor._extract_txt(file_path)
-            logger.info(f"Successfully extracted {len(text)} characters from TXT file")
-            return text
-        elif suffix == '.docx':
-            text = FileExtractor._extract_docx(file_path)
-            logger.info(f"Successfully extracted {len(text)} characters from DOCX file")
-            return text
-        else:
-            logger.warning(f"Unsupported file type: {suffix}")
-            raise ValueError(f"Unsupported file type: {suffix}")
+        logger.warning("Unsupported file type: %s", suffix)
+        raise ValueError(f"Unsupported file type: {suffix}")
     
     @staticmethod
     def _extract_txt(file_path: str) -> str:
         """
         Extract text from a plain text file.
         
+        The file is memory-mapped and decoded in one call straight from the mapping,
+        instead of through text mode's incremental decoder. CPython's UTF-8 decoder
+        scans ASCII a machine word at a time before its validating loop, so ASCII-only
+        files take the fast path without a separate isascii() pass over the data.
+        Line endings are normalized to "\n" as text mode would.
+        
         :param file_path: Path to the text file (must exist and be readable)
         :returns: File content as string
         """
-        logger = get_logger(__name__)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-                logger.debug(f"Read TXT file with UTF-8 encoding")
-                return text
-        except UnicodeDecodeError:
-            logger.debug(f"UTF-8 encoding failed, trying latin-1")
-            with open(file_path, 'r', encoding='latin-1') as f:
-                return f.read()
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                try:
+                    text = str(mapped, 'utf-8')
+                    logger.debug("Read TXT file with UTF-8 encoding")
+                except UnicodeDecodeError:
+                    logger.debug("UTF-8 encoding failed, trying latin-1")
+                    text = str(mapped, 'latin-1')
+        
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     
     @staticmethod
     def _extract_docx(file_path: str) -> str:
         """
         Extract text from a DOCX file.
         
+        Streams word/document.xml with iterparse instead of building python-docx's
+        document object model, and clears each top-level body element once it is
+        read, so memory stays bounded by the largest paragraph or table. Like
+        python-docx's Document.paragraphs, only paragraphs directly in the body are
+        extracted (not table cells or text boxes).
+        
         :param file_path: Path to the DOCX file (must exist and be valid)
-        :returns: Extracted text content
+        :returns: Extracted text content, one line per paragraph
+        :raises FileNotFoundError: If the file does not exist
         :raises ValueError: If file is not a valid DOCX file
         """
-        logger = get_logger(__name__)
-        try:
-            logger.debug(f"Opening DOCX file: {file_path}")
-            doc = docx.Document(file_path)
-            paragraphs = [para.text for para in doc.paragraphs]
-            text = '\n'.join(paragraphs)
-            logger.debug(f"Extracted {len(paragraphs)} paragraphs from DOCX")
-            return text
-        except Exception as e:
-            logger.error(f"Failed to extract text from DOCX file {file_path}: {e}")
-            raise ValueError(f"Failed to extract text from DOCX file: {e}")
+        logger.debug("Opening DOCX file: %s", file_path)
+        # Opening the file first lets a missing file surface as FileNotFoundError
+        with open(file_path, 'rb') as f:
+            try:
+                with zipfile.ZipFile(f) as archive, archive.open('word/document.xml') as xml:
+                    buffer = io.StringIO()
+                    write = buffer.write
+                    paragraph_count = 0
+                    # Depth of the element being parsed, and of w:body once it starts
+                    depth = 0
+                    body_depth = None
+                    for event, element in ElementTree.iterparse(xml, events=('start', 'end')):
+                        if event == 'start':
+                            depth += 1
+                            if element.tag == _W_BODY:
+                                body_depth = depth
+                            continue
+                        if body_depth is not None and depth == body_depth + 1:
+                            # A top-level body element: a paragraph, table, section, ...
+                            if element.tag == _W_P:
+                                if paragraph_count:
+                                    write('\n')
+                                _write_paragraph_text(element, write)
+                                paragraph_count += 1
+                            element.clear()
+                        depth -= 1
+                logger.debug("Extracted %d paragraphs from DOCX", paragraph_count)
+                return buffer.getvalue()
+            except Exception as e:
+                logger.error("Failed to extract text from DOCX file %s: %s", file_path, e)
+                raise ValueError(f"Failed to extract text from DOCX file: {e}")
     
     @staticmethod
     def get_file_size(file_path: str) -> int:
@@ -95,4 +229,4 @@ class FileExtractor:
         :param file_path: Path to the file (must exist)
         :returns: File size in bytes (always >= 0)
         """
-        return Path(file_path).stat().st_size
+        return os.stat(file_path).st_size
@@ -1,12 +1,15 @@
 """
 File handlers for processing different file types.
 """
-from typing import Protocol, Optional, Dict, Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Protocol, Optional, Dict, Any, List, Set
 from abc import ABC, abstractmethod
 import numpy as np
 
 from .file_metadata import FileMetadata
 from .handler import TextEmbeddingHandler
+from .file_extractors import extract_and_chunk
 from .logger import get_logger
 
 
@@ -17,6 +20,9 @@ class FileHandler(Protocol):
     Handlers process files and return results specific to their file type.
     """
     
+    # Lowercase extensions (with leading dot) of the files this handler processes
+    supported_extensions: Set[str]
+    
     def can_handle(self, metadata: FileMetadata) -> bool:
         """
         Check if this handler can process the given file.
@@ -71,11 +77,12 @@ class TextFileHandler:
             self.logger.debug(f"TextFileHandler can handle file: {metadata.file_name}")
         return can_handle
     
-    def process(self, metadata: FileMetadata) -> Dict[str, Any]:
+    def process(self, metadata: FileMetadata, chunks: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Process text file and generate embeddings.
         
         :param metadata: File metadata (must be a text file)
+        :param chunks: Chunks already extracted from the file (optional, read from disk if None)
         :returns: Dictionary containing metadata and embedding results
         """
         if not self.can_handle(metadata):
@@ -87,8 +94,118 @@ class TextFileHandler:
             f"({metadata.file_size_kb:.2f} KB)"
         )
         
-        chunks, embeddings = self.embedding_handler.embed_file(metadata.file_path)
+        if chunks is not None:
+            chunks, embeddings = self.embedding_handler.embed_chunked(chunks)
+        else:
+            chunks, embeddings = self.embedding_handler.embed_file(metadata.file_path)
+        
+        return self._build_result(metadata, chunks, embeddings)
+    
+    def process_many(
+        self,
+        metadatas: List[FileMetadata],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several text files, embedding all of their chunks in one batch.
+        
+        Files are extracted and chunked on a thread pool (file reads and DOCX
+        decompression release the GIL), then every chunk goes to the embedder
+        together so batches stay full instead of one small batch per file.
         
+        :param metadatas: Metadata of the files to process (each must be a text file)
+        :param max_workers: Number of extraction threads (defaults to the CPU count)
+        :returns: One result per file in input order; files whose text could not be
+            extracted get "processed": False and a "reason"
+        :postcondition: len(result) == len(metadatas)
+        :raises ValueError: If any file is not a supported text file
+        """
+        for metadata in metadatas:
+            if not self.can_handle(metadata):
+                self.logger.error(f"Cannot handle file type: {metadata.file_extension}")
+                raise ValueError(f"Cannot handle file type: {metadata.file_extension}")
+        if not metadatas:
+            return []
+        
+        chunker = self.embedding_handler.chunker
+        workers = min(len(metadatas), max_workers or os.cpu_count() or 1)
+        self.logger.info(f"Processing {len(metadatas)} text files with {workers} extraction thread(s)")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract_and_chunk, m.file_path, chunker) for m in metadatas]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(metadatas)
+        extracted = []
+        for i, (metadata, future) in enumerate(zip(metadatas, futures)):
+            try:
+                chunks = future.result()
+                if not chunks:
+                    raise ValueError("text cannot be empty")
+                extracted.append((i, chunks))
+            except Exception as e:
+                self.logger.error(f"Failed to extract text from {metadata.file_name}: {e}")
+                results[i] = {
+                    "metadata": metadata.to_dict(),
+                    "embeddings": None,
+                    "processed": False,
+                    "reason": str(e),
+                }
+        
+        if extracted:
+            chunked_results = self.process_chunked_many(
+                [metadatas[i] for i, _ in extracted],
+                [chunks for _, chunks in extracted],
+            )
+            for (i, _), result in zip(extracted, chunked_results):
+                results[i] = result
+        return results
+    
+    def process_chunked_many(
+        self,
+        metadatas: List[FileMetadata],
+        per_file_chunks: List[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several already chunked text files, embedding all chunks in one batch.
+        
+        :param metadatas: Metadata of the files (each must be a text file)
+        :param per_file_chunks: Text chunks of each file, parallel to metadatas (each non-empty)
+        :returns: One result per file in input order
+        :postcondition: len(result) == len(metadatas)
+        :raises ValueError: If any file is not a supported text file, the lists differ
+            in length, or a chunk list is empty
+        """
+        if len(metadatas) != len(per_file_chunks):
+            self.logger.error(
+                f"Got {len(per_file_chunks)} chunk lists for {len(metadatas)} files"
+            )
+            raise ValueError("metadatas and per_file_chunks must have the same length")
+        for metadata in metadatas:
+            if not self.can_handle(metadata):
+                self.logger.error(f"Cannot handle file type: {metadata.file_extension}")
+                raise ValueError(f"Cannot handle file type: {metadata.file_extension}")
+        if not metadatas:
+            return []
+        
+        embedded = self.embedding_handler.embed_chunked_many(per_file_chunks)
+        return [
+            self._build_result(metadata, chunks, embeddings)
+            for metadata, (chunks, embeddings) in zip(metadatas, embedded)
+        ]
+    
+    def _build_result(
+        self,
+        metadata: FileMetadata,
+        chunks: List[str],
+        embeddings: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Build the processing result for an embedded text file.
+        
+        :param metadata: File metadata
+        :param chunks: Text chunks of the file
+        :param embeddings: Embeddings array with one row per chunk
+        :returns: Dictionary containing metadata and embedding results
+        """
         embedding_dim = embeddings.shape[1] if len(embeddings.shape) > 1 else embeddings.shape[0]
         self.logger.info(
             f"Successfully processed text file: {metadata.file_name} "
@@ -96,16 +213,7 @@ class TextFileHandler:
         )
         
         return {
-            "metadata": {
-                "file_path": metadata.file_path,
-                "file_name": metadata.file_name,
-                "file_extension": metadata.file_extension,
-                "file_size_bytes": metadata.file_size_bytes,
-                "file_size_kb": metadata.file_size_kb,
-                "file_size_mb": metadata.file_size_mb,
-                "modified_time": metadata.modified_time.isoformat() if metadata.modified_time else None,
-                "created_time": metadata.created_time.isoformat() if metadata.created_time else None,
-            },
+            "metadata": metadata.to_dict(),
             "embeddings": {
                 "chunks": chunks,
                 "embeddings": embeddings,
@@ -126,6 +234,8 @@ class DefaultFileHandler:
     def __init__(self):
         """Initialize default file handler."""
         self.logger = get_logger(__name__)
+        # Claims no extension: the router falls back to it for every unclaimed file
+        self.supported_extensions = set()
         self.logger.debug("DefaultFileHandler initialized")
     
     def can_handle(self, metadata: FileMetadata) -> bool:
@@ -153,16 +263,7 @@ class DefaultFileHandler:
         self.logger.debug(f"Reason: {reason}")
         
         return {
-            "metadata": {
-                "file_path": metadata.file_path,
-                "file_name": metadata.file_name,
-                "file_extension": metadata.file_extension,
-                "file_size_bytes": metadata.file_size_bytes,
-                "file_size_kb": metadata.file_size_kb,
-                "file_size_mb": metadata.file_size_mb,
-                "modified_time": metadata.modified_time.isoformat() if metadata.modified_time else None,
-                "created_time": metadata.created_time.isoformat() if metadata.created_time else None,
-            },
+            "metadata": metadata.to_dict(),
             "embeddings": None,
             "processed": False,
             "reason": reason,
@@ -1,18 +1,27 @@
 """
 File metadata collection and management.
 """
-from dataclasses import dataclass
-from pathlib import Path
+import os
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from .logger import get_logger
 
+logger = get_logger(__name__)
 
-@dataclass
+# slots=True needs Python 3.10; older interpreters fall back to a __dict__ per instance
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class FileMetadata:
     """
     Metadata about a file including type, size, and other information.
+    
+    Instances are immutable; file_size_kb and file_size_mb are computed once from
+    file_size_bytes on construction.
     """
     file_path: str
     file_name: str
@@ -22,62 +31,76 @@ class FileMetadata:
     is_image_type: bool
     modified_time: Optional[datetime] = None
     created_time: Optional[datetime] = None
+    modified_time_ns: Optional[int] = None
+    inode: Optional[int] = None
+    file_size_kb: float = field(init=False, repr=False, compare=False)
+    file_size_mb: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """
+        Derive the file size in kilobytes and megabytes.
+        """
+        object.__setattr__(self, "file_size_kb", self.file_size_bytes / 1024)
+        object.__setattr__(self, "file_size_mb", self.file_size_bytes / (1024 * 1024))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the serializable metadata stored with a processing result.
+        
+        :returns: Dictionary with path, name, extension, sizes and ISO timestamps
+        """
+        return {
+            "file_path": self.file_path,
+            "file_name": self.file_name,
+            "file_extension": self.file_extension,
+            "file_size_bytes": self.file_size_bytes,
+            "file_size_kb": self.file_size_kb,
+            "file_size_mb": self.file_size_mb,
+            "modified_time": self.modified_time.isoformat() if self.modified_time else None,
+            "created_time": self.created_time.isoformat() if self.created_time else None,
+        }
     
     @classmethod
     def from_path(cls, file_path: str) -> "FileMetadata":
         """
         Create FileMetadata from a file path.
         
+        Uses a single stat call for existence, size and timestamps.
+        
         :param file_path: Path to the file (must exist)
         :returns: FileMetadata instance with all file information
+        :raises FileNotFoundError: If the file does not exist
         """
-        logger = get_logger(__name__)
-        logger.debug(f"Collecting metadata for file: {file_path}")
-        
-        path = Path(file_path)
+        logger.debug("Collecting metadata for file: %s", file_path)
         
-        if not path.exists():
-            logger.error(f"File not found: {file_path}")
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        stat = path.stat()
-        extension = path.suffix.lower()
+        file_name = os.path.basename(file_path)
+        extension = os.path.splitext(file_name)[1].lower()
         text_extensions = {'.txt', '.docx'}
         image_extensions = {'.png', '.jpg', '.jpeg'}
         is_text = extension in text_extensions
         is_image = extension in image_extensions
         
         metadata = cls(
-            file_path=str(path.resolve()),
-            file_name=path.name,
+            file_path=os.path.realpath(file_path),
+            file_name=file_name,
             file_extension=extension,
             file_size_bytes=stat.st_size,
             is_text_type=is_text,
             is_image_type=is_image,
             modified_time=datetime.fromtimestamp(stat.st_mtime),
             created_time=datetime.fromtimestamp(stat.st_ctime),
+            modified_time_ns=stat.st_mtime_ns,
+            inode=stat.st_ino,
         )
         
         logger.info(
-            f"Metadata collected: {metadata.file_name} "
-            f"({metadata.file_size_kb:.2f} KB, type: {extension}, text: {is_text}, image: {is_image})"
+            "Metadata collected: %s (%.2f KB, type: %s, text: %s, image: %s)",
+            metadata.file_name, metadata.file_size_kb, extension, is_text, is_image
         )
         return metadata
-    
-    @property
-    def file_size_kb(self) -> float:
-        """
-        Get file size in kilobytes.
-        
-        :returns: File size in KB
-        """
-        return self.file_size_bytes / 1024
-    
-    @property
-    def file_size_mb(self) -> float:
-        """
-        Get file size in megabytes.
-        
-        :returns: File size in MB
-        """
-        return self.file_size_bytes / (1024 * 1024)
@@ -35,71 +35,105 @@ class FileProcessorRouter:
         self.image_handler = image_handler
         self.default_handler = default_handler or DefaultFileHandler()
         
-        self._handlers: List[FileHandler] = []
-        if self.text_handler:
-            self._handlers.append(self.text_handler)
-            self.logger.debug("TextFileHandler registered")
-        if self.image_handler:
-            self._handlers.append(self.image_handler)
-            self.logger.debug("ImageFileHandler registered")
-        self._handlers.append(self.default_handler)
-        self.logger.debug("DefaultFileHandler registered")
-        self.logger.info(f"FileProcessorRouter initialized with {len(self._handlers)} handler(s)")
+        # Lowercase extension -> handler; files with other extensions go to the default handler
+        self._handlers_by_extension: Dict[str, FileHandler] = {}
+        self._build_dispatch()
+        handler_count = 1 + sum(h is not None for h in (self.text_handler, self.image_handler))
+        self.logger.info(f"FileProcessorRouter initialized with {handler_count} handler(s)")
+    
+    def _build_dispatch(self) -> None:
+        """
+        Map each supported extension to its handler.
+        
+        Handlers claim files by extension only (the metadata type flags are derived
+        from the extension), so routing is a dict lookup instead of asking every
+        handler in turn. The text handler takes precedence over the image handler.
+        """
+        self._handlers_by_extension = {}
+        for handler in (self.text_handler, self.image_handler):
+            if handler is None:
+                continue
+            for extension in handler.supported_extensions:
+                self._handlers_by_extension.setdefault(extension.lower(), handler)
+            self.logger.debug(f"{type(handler).__name__} registered")
+    
+    def _get_handler(self, metadata: FileMetadata) -> FileHandler:
+        """
+        Get the handler for a file.
+        
+        :param metadata: Metadata of the file
+        :returns: Handler registered for the file's extension, or the default handler
+        """
+        return self._handlers_by_extension.get(metadata.file_extension, self.default_handler)
     
     def set_text_handler(self, text_handler: TextFileHandler) -> None:
         """
         Set or change the text file handler.
         
-        :param text_handler: The text file handler (must not be None)
+        :param text_handler: The text file handler (must not be None); setting the
+            current handler again is a no-op
         """
         if text_handler is None:
             self.logger.error("text_handler cannot be None")
             raise ValueError("text_handler cannot be None")
+        if text_handler is self.text_handler:
+            return
         
         self.text_handler = text_handler
-        if self.text_handler not in self._handlers:
-            self._handlers.insert(0, self.text_handler)
+        self._build_dispatch()
         self.logger.info("Text file handler updated")
     
     def set_image_handler(self, image_handler: ImageFileHandler) -> None:
         """
         Set or change the image file handler.
         
-        :param image_handler: The image file handler (must not be None)
+        :param image_handler: The image file handler (must not be None); setting the
+            current handler again is a no-op
         """
         if image_handler is None:
             self.logger.error("image_handler cannot be None")
             raise ValueError("image_handler cannot be None")
+        if image_handler is self.image_handler:
+            return
         
         self.image_handler = image_handler
-        if self.image_handler not in self._handlers:
-            insert_pos = len([h for h in self._handlers if isinstance(h, TextFileHandler)])
-            self._handlers.insert(insert_pos, self.image_handler)
+        self._build_dispatch()
         self.logger.info("Image file handler updated")
     
-    def process_file(self, file_path: str) -> Dict[str, Any]:
+    def process_file(self, file_path: str, chunks: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Process a file by collecting metadata and routing to appropriate handler.
         
         :param file_path: Path to the file (must exist)
+        :param chunks: Text chunks extracted ahead of time (optional, used by the text handler)
         :returns: Dictionary with file metadata and processing results
         """
         self.logger.info(f"Processing file: {file_path}")
-        metadata = FileMetadata.from_path(file_path)
-        
-        for handler in self._handlers:
-            if handler.can_handle(metadata):
-                handler_name = type(handler).__name__
-                self.logger.debug(f"Routing to handler: {handler_name}")
-                result = handler.process(metadata)
-                self.logger.info(
-                    f"File processing completed: {metadata.file_name} "
-                    f"(processed: {result.get('processed', False)})"
-                )
-                return result
+        return self.process_file_with_metadata(FileMetadata.from_path(file_path), chunks=chunks)
+    
+    def process_file_with_metadata(
+        self,
+        metadata: FileMetadata,
+        chunks: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a file whose metadata was already collected, routing to the appropriate handler.
         
-        self.logger.warning(f"No handler found, using default handler for: {metadata.file_name}")
-        return self.default_handler.process(metadata)
+        :param metadata: Metadata of the file (must not be None)
+        :param chunks: Text chunks extracted ahead of time (optional, used by the text handler)
+        :returns: Dictionary with file metadata and processing results
+        """
+        handler = self._get_handler(metadata)
+        self.logger.debug(f"Routing to handler: {type(handler).__name__}")
+        if chunks is not None and handler is self.text_handler:
+            result = handler.process(metadata, chunks=chunks)
+        else:
+            result = handler.process(metadata)
+        self.logger.info(
+            f"File processing completed: {metadata.file_name} "
+            f"(processed: {result.get('processed', False)})"
+        )
+        return result
     
     def get_file_metadata(self, file_path: str) -> FileMetadata:
         """
@@ -110,28 +144,76 @@ class FileProcessorRouter:
         """
         return FileMetadata.from_path(file_path)
     
-    def process_files(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+    def process_files(
+        self,
+        file_paths: List[str],
+        max_workers: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process multiple files.
         
+        Text files are handed to the text handler together, so their extraction runs
+        on a thread pool and all of their chunks are embedded in one batch; image
+        files are likewise embedded in batches by the image handler. Other files are
+        processed one at a time.
+        
         :param file_paths: List of file paths to process
-        :returns: List of processing results for each file
+        :param max_workers: Number of text extraction threads (defaults to the CPU count)
+        :returns: List of processing results for each file, in input order
         """
         self.logger.info(f"Processing {len(file_paths)} file(s)")
-        results = []
-        for i, file_path in enumerate(file_paths, 1):
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_paths)
+        text_files = []
+        image_files = []
+        for i, file_path in enumerate(file_paths):
             try:
-                self.logger.debug(f"Processing file {i}/{len(file_paths)}: {file_path}")
-                result = self.process_file(file_path)
-                results.append(result)
+                metadata = FileMetadata.from_path(file_path)
+                handler = self._get_handler(metadata)
+                if self.text_handler and handler is self.text_handler:
+                    text_files.append((i, metadata))
+                elif self.image_handler and handler is self.image_handler:
+                    image_files.append((i, metadata))
+                else:
+                    self.logger.debug(f"Processing file {i + 1}/{len(file_paths)}: {file_path}")
+                    results[i] = self.process_file_with_metadata(metadata)
             except Exception as e:
-                self.logger.error(f"Error processing file {file_path}: {e}", exc_info=True)
-                results.append({
-                    "error": str(e),
-                    "file_path": file_path,
-                    "processed": False,
-                })
+                results[i] = self._error_result(file_path, e)
+        
+        if text_files:
+            try:
+                text_results = self.text_handler.process_many(
+                    [metadata for _, metadata in text_files], max_workers=max_workers
+                )
+            except Exception as e:
+                self.logger.error(f"Batched text processing failed: {e}", exc_info=True)
+                text_results = [self._error_result(m.file_path, e) for _, m in text_files]
+            for (i, _), result in zip(text_files, text_results):
+                results[i] = result
+        
+        if image_files:
+            try:
+                image_results = self.image_handler.process_many([metadata for _, metadata in image_files])
+            except Exception as e:
+                self.logger.error(f"Batched image processing failed: {e}", exc_info=True)
+                image_results = [self._error_result(m.file_path, e) for _, m in image_files]
+            for (i, _), result in zip(image_files, image_results):
+                results[i] = result
         
         successful = sum(1 for r in results if r.get("processed", False))
         self.logger.info(f"Batch processing completed: {successful}/{len(file_paths)} successful")
         return results
+    
+    def _error_result(self, file_path: str, error: Exception) -> Dict[str, Any]:
+        """
+        Log a file processing error and build its result entry.
+        
+        :param file_path: Path of the file that failed
+        :param error: The exception raised while processing it
+        :returns: Result dictionary marking the file as not processed
+        """
+        self.logger.error(f"Error processing file {file_path}: {error}", exc_info=True)
+        return {
+            "error": str(error),
+            "file_path": file_path,
+            "processed": False,
+        }
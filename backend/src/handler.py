@@ -1,11 +1,12 @@
 """
 Text embedding handler with dependency injection and configurable chunking.
 """
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import numpy as np
 from pathlib import Path
 
 from .interfaces import Embedder, Chunker
+from .chunk_cache import ChunkEmbeddingCache
 from .file_extractors import FileExtractor
 from .logger import get_logger
 
@@ -21,21 +22,41 @@ class TextEmbeddingHandler:
     def __init__(
         self,
         embedder: Embedder,
-        chunker: Optional[Chunker] = None
+        chunker: Optional[Chunker] = None,
+        cache: Optional[ChunkEmbeddingCache] = None,
+        normalize: bool = True,
+        dtype: Any = np.float32,
     ):
         """
         Initialize the embedding handler with dependency injection.
         
         :param embedder: The embedder to use (injected dependency, must not be None)
         :param chunker: The chunking strategy to use (optional, defaults to FixedSizeChunker)
+        :param cache: Chunk embedding cache used to skip re-embedding unchanged chunks (optional)
+        :param normalize: L2-normalize returned embeddings in place (skipped for fresh
+            output of embedders whose normalizes_embeddings attribute is True)
+        :param dtype: Floating dtype of returned embeddings; np.float16 halves their memory
+            (relative error around 1e-3)
         """
         self.logger = get_logger(__name__)
         
         if embedder is None:
             self.logger.error("embedder cannot be None")
             raise ValueError("embedder cannot be None")
+        if not np.issubdtype(np.dtype(dtype), np.floating):
+            self.logger.error(f"dtype must be a floating type, got: {dtype}")
+            raise ValueError(f"dtype must be a floating type, got: {dtype}")
         
         self.embedder = embedder
+        # Resolved once; embedders without embed_batch fall back to per-text embed calls
+        self._embed_batch = getattr(embedder, "embed_batch", None)
+        self._embedder_normalizes = bool(getattr(embedder, "normalizes_embeddings", False))
+        # Model identity for chunk cache keys: vectors differ across precisions and backends
+        self._cache_identity = (
+            getattr(embedder, "model_name", None) or type(embedder).__name__,
+            str(getattr(embedder, "precision", "") or ""),
+            str(getattr(embedder, "backend", "") or ""),
+        )
         
         if chunker is None:
             from .chunkers import FixedSizeChunker
@@ -43,6 +64,9 @@ class TextEmbeddingHandler:
             self.logger.debug("Using default FixedSizeChunker (chunk_size=512, overlap=50)")
         
         self.chunker = chunker
+        self.cache = cache
+        self.normalize = normalize
+        self.dtype = np.dtype(dtype)
         self.logger.info("TextEmbeddingHandler initialized")
     
     def set_chunker(self, chunker: Chunker) -> None:
@@ -58,6 +82,39 @@ class TextEmbeddingHandler:
         self.chunker = chunker
         self.logger.info(f"Chunker changed to {type(chunker).__name__}")
     
+    def set_cache(self, cache: Optional[ChunkEmbeddingCache]) -> None:
+        """
+        Set, replace or remove (None) the chunk embedding cache.
+        
+        :param cache: The chunk embedding cache to use
+        """
+        self.cache = cache
+        self.logger.info(f"Chunk cache {'enabled' if cache is not None else 'disabled'}")
+    
+    def save_cache(self, live_chunks: Optional[Iterable[str]] = None) -> None:
+        """
+        Persist the chunk embedding cache, if one is set.
+        
+        :param live_chunks: Texts of the chunks in the current search index (optional);
+            cached vectors of other chunks are dropped
+        """
+        if self.cache is None:
+            return
+        live_keys = None
+        if live_chunks is not None:
+            live_keys = (self._cache_key(chunk) for chunk in live_chunks)
+        self.cache.save(live_keys)
+    
+    def _cache_key(self, chunk: str) -> bytes:
+        """
+        Compute the chunk cache key of a chunk embedded by this handler's embedder.
+        
+        :param chunk: Chunk text
+        :returns: Key from ChunkEmbeddingCache.make_key
+        """
+        model_name, precision, backend = self._cache_identity
+        return ChunkEmbeddingCache.make_key(model_name, chunk, precision, backend)
+    
     def embed_file(self, file_path: str) -> Tuple[List[str], np.ndarray]:
         """
         Extract text from a file, chunk it, and generate embeddings.
@@ -94,12 +151,166 @@ class TextEmbeddingHandler:
             self.logger.error("Chunker produced no chunks")
             raise ValueError("chunker produced no chunks")
         
-        try:
-            self.logger.debug("Generating embeddings using embed_batch")
-            embeddings = self.embedder.embed_batch(chunks)
-        except AttributeError:
+        self.logger.debug("Generating embeddings using embed_batch")
+        embeddings = self._embed_chunks(chunks)
+        
+        self.logger.debug(
+            f"Generated embeddings: shape {embeddings.shape}, dimension {embeddings.shape[1]}"
+        )
+        return chunks, embeddings
+    
+    def embed_chunked(self, chunks: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Generate embeddings for text that was already chunked (e.g. by extraction workers).
+        
+        :param chunks: Chunks produced by this handler's chunker (must not be empty)
+        :returns: Tuple of (chunks, embeddings) where embeddings is a 2D array
+        :postcondition: embeddings.shape[0] == len(chunks)
+        """
+        if not chunks:
+            self.logger.error("Cannot embed empty list of chunks")
+            raise ValueError("chunks cannot be empty")
+        
+        return chunks, self._embed_chunks(chunks)
+    
+    def embed_texts(self, texts: List[str]) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Chunk several texts and embed all of their chunks in a single batch.
+        
+        Batching across documents keeps the embedder busy with full batches instead
+        of one small batch per document.
+        
+        :param texts: The texts to embed (must not be empty, each must be non-empty)
+        :returns: List of (chunks, embeddings) tuples, one per input text in input order
+        :postcondition: len(result) == len(texts)
+        :raises ValueError: If texts is empty or any text is empty
+        """
+        if not texts:
+            self.logger.error("Cannot embed empty list of texts")
+            raise ValueError("texts cannot be empty")
+        if not all(texts):
+            self.logger.error("Cannot embed empty text")
+            raise ValueError("text cannot be empty")
+        
+        per_text_chunks = [self.chunker.chunk(text) for text in texts]
+        return self.embed_chunked_many(per_text_chunks)
+    
+    def embed_chunked_many(self, per_text_chunks: List[List[str]]) -> List[Tuple[List[str], np.ndarray]]:
+        """
+        Embed the chunks of several already chunked texts in a single batch.
+        
+        :param per_text_chunks: One chunk list per text (must not be empty, each non-empty)
+        :returns: List of (chunks, embeddings) tuples, one per chunk list in input order
+        :postcondition: len(result) == len(per_text_chunks)
+        :raises ValueError: If there are no chunk lists or any chunk list is empty
+        """
+        if not per_text_chunks:
+            self.logger.error("Cannot embed empty list of chunk lists")
+            raise ValueError("per_text_chunks cannot be empty")
+        if not all(per_text_chunks):
+            self.logger.error("Chunker produced no chunks")
+            raise ValueError("chunker produced no chunks")
+        
+        flat_chunks = [chunk for chunks in per_text_chunks for chunk in chunks]
+        self.logger.debug(
+            f"Embedding {len(flat_chunks)} chunks from {len(per_text_chunks)} texts in one batch"
+        )
+        embeddings = self._embed_chunks(flat_chunks)
+        
+        offsets = np.cumsum([len(chunks) for chunks in per_text_chunks])[:-1]
+        return list(zip(per_text_chunks, np.split(embeddings, offsets)))
+    
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed search queries without chunking, one vector per query.
+        
+        :param queries: Query strings (must not be empty, each must be non-empty)
+        :returns: 2D array of shape (len(queries), embedding_dim)
+        :raises ValueError: If queries is empty or any query is empty
+        """
+        if not queries:
+            self.logger.error("Cannot embed empty list of queries")
+            raise ValueError("queries cannot be empty")
+        if not all(queries):
+            self.logger.error("Cannot embed empty query")
+            raise ValueError("query cannot be empty")
+        
+        return self._finalize(self._embed_uncached(list(queries)), self._embedder_normalizes)
+    
+    def _finalize(self, embeddings: np.ndarray, normalized: bool = False) -> np.ndarray:
+        """
+        Apply the configured normalization and output dtype.
+        
+        :param embeddings: 2D embeddings array, owned by the caller
+        :param normalized: Rows are already L2-normalized, so normalization is skipped
+        :returns: Embeddings normalized in place (when enabled) and cast to self.dtype
+        """
+        if self.normalize and not normalized:
+            if embeddings.dtype.kind != 'f' or not embeddings.flags.writeable:
+                embeddings = np.array(embeddings, dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            np.divide(embeddings, np.maximum(norms, 1e-12), out=embeddings)
+        return embeddings.astype(self.dtype, copy=False)
+    
+    def _embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Embed chunks, reusing cached vectors for chunks embedded before.
+        
+        Only cache misses reach the embedder, in a single batch with duplicates removed.
+        Hits and new vectors are written straight into one preallocated output array.
+        The cache holds raw embedder output; normalization and dtype are applied after.
+        Rows served from the cache are always normalized again, since they may predate
+        an embedder that normalizes its output.
+        
+        :param chunks: Chunks to embed (must not be empty)
+        :returns: 2D array with one row per chunk (see _finalize)
+        """
+        if self.cache is None:
+            return self._finalize(self._embed_uncached(chunks), self._embedder_normalizes)
+        
+        keys = [self._cache_key(chunk) for chunk in chunks]
+        vectors = [self.cache.get(key) for key in keys]
+        
+        # Rows of each distinct missing chunk, keyed by cache key
+        misses: Dict[bytes, List[int]] = {}
+        for row, (key, vector) in enumerate(zip(keys, vectors)):
+            if vector is None:
+                misses.setdefault(key, []).append(row)
+        
+        self.logger.debug(
+            f"Chunk cache: {len(chunks) - sum(len(rows) for rows in misses.values())} hits, "
+            f"{len(misses)} unique misses"
+        )
+        if not misses:
+            return self._finalize(np.stack(vectors))
+        
+        new_vectors = self._embed_uncached([chunks[rows[0]] for rows in misses.values()])
+        embeddings = np.empty((len(chunks), new_vectors.shape[1]), dtype=new_vectors.dtype)
+        for row, vector in enumerate(vectors):
+            if vector is not None:
+                embeddings[row] = vector
+        for (key, rows), vector in zip(misses.items(), new_vectors):
+            embeddings[rows] = vector
+            self.cache.put(key, vector)
+        return self._finalize(embeddings)
+    
+    def _embed_uncached(self, chunks: List[str]) -> np.ndarray:
+        """
+        Embed chunks with the injected embedder, preferring its batch method.
+        
+        :param chunks: Chunks to embed (must not be empty)
+        :returns: 2D array with one row per chunk
+        :raises RuntimeError: If the embedder returns the wrong number of rows
+        """
+        if self._embed_batch is not None:
+            embeddings = self._embed_batch(chunks)
+        else:
             self.logger.debug("embed_batch not available, using individual embed calls")
-            embeddings = np.array([self.embedder.embed(chunk) for chunk in chunks])
+            first = np.asarray(self.embedder.embed(chunks[0]))
+            embeddings = np.empty((len(chunks), first.shape[-1]), dtype=first.dtype)
+            embeddings[0] = first
+            for row, chunk in enumerate(chunks[1:], start=1):
+                embeddings[row] = self.embedder.embed(chunk)
         
         if embeddings.shape[0] != len(chunks):
             self.logger.error(
@@ -108,11 +319,7 @@ class TextEmbeddingHandler:
             raise RuntimeError(
                 f"Embedding count mismatch: expected {len(chunks)}, got {embeddings.shape[0]}"
             )
-        
-        self.logger.debug(
-            f"Generated embeddings: shape {embeddings.shape}, dimension {embeddings.shape[1]}"
-        )
-        return chunks, embeddings
+        return embeddings
     
     def get_estimated_chunk_count(self, text: str) -> int:
         """
@@ -1,19 +1,105 @@
 """
 Image embedder implementations using computer vision models.
 """
+import functools
 import os
-from typing import List
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 import numpy as np
 from PIL import Image
 import torch
+import torch.nn.functional as F
 from transformers import CLIPProcessor, CLIPModel
 
 from .interfaces import Embedder
+from .torch_utils import (
+    PRECISION_CHOICES,
+    autocast_context,
+    compile_module,
+    resolve_precision,
+    warm_up,
+)
 from .logger import get_logger
 
 os.environ.setdefault("HF_HUB_DISABLE_SYMLINKS_WARNING", "1")
 
 
+@functools.lru_cache(maxsize=1)
+def _load_torchvision_io() -> Optional[Any]:
+    """
+    Import the optional torchvision.io module on first use.
+    
+    :returns: The torchvision.io module, or None if torchvision is not installed
+    """
+    try:
+        from torchvision import io
+    except ImportError:
+        return None
+    return io
+
+
+def _load_image(image_path: str) -> Image.Image:
+    """
+    Open an image file as RGB.
+    
+    :param image_path: Path to the image file
+    :returns: RGB PIL image
+    :raises ValueError: If the image cannot be loaded
+    """
+    try:
+        return Image.open(image_path).convert("RGB")
+    except Exception as e:
+        get_logger(__name__).error(f"Failed to load image {image_path}: {e}")
+        raise ValueError(f"Failed to load image {image_path}: {e}")
+
+
+def _resize_and_crop(image: Image.Image, shortest_edge: int, crop_size: Tuple[int, int], resample: int) -> torch.Tensor:
+    """
+    Resize an image's shortest edge and center crop it, as CLIPProcessor does.
+    
+    Rescaling and normalization are left to the model device (see
+    CLIPImageEmbedder._forward), so only uint8 pixels are produced and copied.
+    
+    :param image: RGB PIL image
+    :param shortest_edge: Target length of the shorter side
+    :param crop_size: (height, width) of the center crop
+    :param resample: PIL resampling filter
+    :returns: uint8 tensor of shape (3, height, width)
+    """
+    width, height = image.size
+    if width <= height:
+        size = (shortest_edge, int(shortest_edge * height / width))
+    else:
+        size = (int(shortest_edge * width / height), shortest_edge)
+    if size != image.size:
+        image = image.resize(size, resample=resample)
+    
+    crop_height, crop_width = crop_size
+    left = (size[0] - crop_width) // 2
+    top = (size[1] - crop_height) // 2
+    image = image.crop((left, top, left + crop_width, top + crop_height))
+    return torch.from_numpy(np.asarray(image)).permute(2, 0, 1).contiguous()
+
+
+def _load_pixels(image_path: str, shortest_edge: int, crop_size: Tuple[int, int], resample: int) -> np.ndarray:
+    """
+    Load, resize and crop an image into uint8 pixels.
+    
+    Runs on loader threads and in loader worker processes, so it returns a numpy
+    array (cheap to pickle) rather than a tensor.
+    
+    :param image_path: Path to the image file
+    :param shortest_edge: Target length of the shorter side
+    :param crop_size: (height, width) of the center crop
+    :param resample: PIL resampling filter
+    :returns: uint8 array of shape (3, height, width)
+    :raises ValueError: If the image cannot be loaded
+    """
+    return _resize_and_crop(_load_image(image_path), shortest_edge, crop_size, resample).numpy()
+
+
 class CLIPImageEmbedder:
     """
     Image embedder implementation using CLIP (Contrastive Language-Image Pre-training).
@@ -23,7 +109,26 @@ class CLIPImageEmbedder:
     enabling cross-modal search.
     """
     
-    def __init__(self, model_name: str = "openai/clip-vit-base-patch32"):
+    # Images per forward pass in embed_batch
+    BATCH_SIZE = 32
+    # Loader worker processes for batches larger than one forward pass
+    LOADER_WORKERS = 4
+    # Threads loading a single forward pass worth of images (PIL decodes without the GIL)
+    LOADER_THREADS = min(16, os.cpu_count() or 1)
+    # Text embeddings kept for repeated queries (long-running servers see the same
+    # queries again and again)
+    TEXT_CACHE_SIZE = 4096
+    # Extensions decoded on the GPU with nvJPEG when enabled
+    JPEG_EXTENSIONS = frozenset({".jpg", ".jpeg"})
+    
+    def __init__(
+        self,
+        model_name: str = "openai/clip-vit-base-patch32",
+        compile_model: bool = False,
+        use_nvjpeg: bool = True,
+        precision: str = "auto",
+        device: Optional[str] = None,
+    ):
         """
         Initialize the image embedder with a CLIP model.
         
@@ -33,12 +138,24 @@ class CLIPImageEmbedder:
         :param model_name: Name of the CLIP model to use (must not be empty)
             Default: "openai/clip-vit-base-patch32" (512 dimensions, good balance)
             Alternatives: "openai/clip-vit-large-patch14" (768 dims, higher quality)
+        :param compile_model: Compile the vision tower with torch.compile (slower startup,
+            faster image embedding)
+        :param use_nvjpeg: Decode JPEG batches on the GPU with torchvision's nvJPEG
+            decoder (only used on CUDA with torchvision installed)
+        :param precision: Forward-pass precision: "auto" (fp16 on CUDA, fp32 elsewhere),
+            "fp32", "fp16" (CUDA; float16 weights) or "bf16"; embeddings are always
+            normalized and returned in float32
+        :param device: Torch device to run on, e.g. "cuda:1" (defaults to "cuda" if
+            available, else "cpu")
         """
         self.logger = get_logger(__name__)
         
         if not model_name:
             self.logger.error("model_name cannot be empty")
             raise ValueError("model_name cannot be empty")
+        if precision not in PRECISION_CHOICES:
+            self.logger.error(f"Unsupported precision: {precision}")
+            raise ValueError(f"precision must be one of {list(PRECISION_CHOICES)}, got: {precision}")
         
         self.logger.info(f"Loading CLIP model: {model_name}")
         self.logger.debug(
@@ -46,15 +163,92 @@ class CLIPImageEmbedder:
             "First load downloads the model, subsequent loads use cache."
         )
         
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        try:
+            # Device type ("cuda", "cpu") for autocast and device-specific options
+            self.device_type = torch.device(self.device).type
+        except RuntimeError as e:
+            self.logger.error(f"Invalid device: {self.device}")
+            raise ValueError(f"Invalid device: {self.device}") from e
         self.logger.debug(f"Using device: {self.device}")
         
-        self.model = CLIPModel.from_pretrained(model_name).to(self.device)
+        self.precision = resolve_precision(precision, self.device_type)
+        # On CUDA, fp16 stores the weights in half precision instead of only autocasting
+        dtype = torch.float16 if self.precision == "fp16" else torch.float32
+        self.model = CLIPModel.from_pretrained(model_name).to(self.device, dtype=dtype)
         self.processor = CLIPProcessor.from_pretrained(model_name)
         self.model_name = model_name
-        self.model.eval()
+        self.dimension = self.model.config.projection_dim
+        self._init_preprocessing()
+        # Set once the vision tower runs compiled; batches are then padded to size buckets
+        self._compiled = False
+        # Loads images of batches too small for the loader worker processes
+        self._io_pool = ThreadPoolExecutor(max_workers=self.LOADER_THREADS, thread_name_prefix="clip-io")
+        # Loader worker processes, started on the first large batch and kept for later ones
+        self._loader_pool: Optional[ProcessPoolExecutor] = None
+        self._loader_pool_lock = threading.Lock()
+        # Query text -> normalized float32 embedding, least recently used first
+        self._text_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._text_cache_lock = threading.Lock()
+        self.use_nvjpeg = use_nvjpeg and self.device_type == "cuda" and _load_torchvision_io() is not None
+        # NHWC layout selects the optimized convolution kernels for the patch embedding
+        self.model = self.model.to(memory_format=torch.channels_last).eval()
         
-        self.logger.info(f"CLIPImageEmbedder initialized with model: {model_name} on {self.device}")
+        if compile_model:
+            self._compile()
+        
+        self.logger.info(
+            f"CLIPImageEmbedder initialized with model: {model_name} on {self.device} ({self.precision})"
+        )
+    
+    def _init_preprocessing(self) -> None:
+        """
+        Take resize, crop and normalization settings from the CLIP image processor.
+        
+        Images are resized and cropped as uint8 with PIL, then rescaled and
+        normalized on the model device, instead of running CLIPProcessor (float
+        numpy rescale and normalize per image) for every call.
+        """
+        image_processor = self.processor.image_processor
+        size = image_processor.size
+        self.shortest_edge = size["shortest_edge"] if "shortest_edge" in size else min(size["height"], size["width"])
+        crop_size = image_processor.crop_size
+        self.crop_size = (crop_size["height"], crop_size["width"])
+        self.resample = int(image_processor.resample)
+        # uint8 pixels -> normalized floats: x * scale - mean / std, per channel
+        mean = torch.tensor(image_processor.image_mean, device=self.device).view(1, 3, 1, 1)
+        std = torch.tensor(image_processor.image_std, device=self.device).view(1, 3, 1, 1)
+        self._pixel_scale = image_processor.rescale_factor / std
+        self._pixel_shift = mean / std
+    
+    def _preprocess(self, image: Image.Image) -> torch.Tensor:
+        """
+        Resize and crop one image into a batch of one uint8 pixel tensor.
+        
+        :param image: RGB PIL image
+        :returns: uint8 tensor of shape (1, 3, height, width)
+        """
+        return _resize_and_crop(image, self.shortest_edge, self.crop_size, self.resample).unsqueeze(0)
+    
+    def _compile(self) -> None:
+        """
+        Compile the vision tower and warm it up with a full batch of blank images.
+        """
+        eager_vision_model = self.model.vision_model
+        self.model.vision_model = compile_module(eager_vision_model, self.device_type)
+        if self.model.vision_model is eager_vision_model:
+            return
+        self._compiled = True
+        
+        def run() -> None:
+            blank = self._preprocess(Image.new("RGB", self.crop_size[::-1]))
+            self._forward(blank.expand(self.BATCH_SIZE, -1, -1, -1))
+        
+        def restore() -> None:
+            self.model.vision_model = eager_vision_model
+            self._compiled = False
+        
+        self._compiled = warm_up(run, restore)
     
     def embed(self, image_path: str) -> np.ndarray:
         """
@@ -68,20 +262,12 @@ class CLIPImageEmbedder:
             self.logger.error("Cannot embed empty image path")
             raise ValueError("image_path cannot be empty")
         
-        try:
-            image = Image.open(image_path).convert("RGB")
-            self.logger.debug(f"Loaded image: {image_path}, size: {image.size}")
-        except Exception as e:
-            self.logger.error(f"Failed to load image {image_path}: {e}")
-            raise ValueError(f"Failed to load image: {e}")
-        
-        with torch.no_grad():
-            inputs = self.processor(images=image, return_tensors="pt").to(self.device)
-            image_features = self.model.get_image_features(**inputs)
-            image_features = image_features / image_features.norm(p=2, dim=-1, keepdim=True)
-            embedding = image_features.cpu().numpy().flatten()
-        
-        self.logger.debug(f"Generated embedding with dimension {embedding.shape[0]}")
+        image = _load_image(image_path)
+        self.logger.debug("Loaded image: %s, size: %s", image_path, image.size)
+        
+        embedding = self._forward(self._preprocess(image)).flatten()
+        
+        self.logger.debug("Generated embedding with dimension %d", embedding.shape[0])
         return embedding
     
     def embed_batch(self, image_paths: List[str]) -> np.ndarray:
@@ -97,34 +283,210 @@ class CLIPImageEmbedder:
             self.logger.error("Cannot embed empty batch")
             raise ValueError("image_paths list cannot be empty")
         
-        self.logger.debug(f"Generating embeddings for batch of {len(image_paths)} images")
+        self.logger.debug("Generating embeddings for batch of %d images", len(image_paths))
         
-        images = []
-        for image_path in image_paths:
-            try:
-                image = Image.open(image_path).convert("RGB")
-                images.append(image)
-            except Exception as e:
-                self.logger.error(f"Failed to load image {image_path}: {e}")
-                raise ValueError(f"Failed to load image {image_path}: {e}")
-        
-        with torch.no_grad():
-            inputs = self.processor(images=images, return_tensors="pt", padding=True).to(self.device)
-            image_features = self.model.get_image_features(**inputs)
-            image_features = image_features / image_features.norm(p=2, dim=-1, keepdim=True)
-            embeddings = image_features.cpu().numpy()
+        jpeg_positions = []
+        if self.use_nvjpeg:
+            jpeg_positions = [
+                i for i, path in enumerate(image_paths)
+                if os.path.splitext(path)[1].lower() in self.JPEG_EXTENSIONS
+            ]
+        embeddings = np.empty((len(image_paths), self.dimension), dtype=np.float32)
+        if jpeg_positions:
+            other_positions = sorted(set(range(len(image_paths))) - set(jpeg_positions))
+            embeddings[jpeg_positions] = self._embed_jpegs(
+                [image_paths[i] for i in jpeg_positions],
+                np.empty((len(jpeg_positions), self.dimension), dtype=np.float32),
+            )
+            if other_positions:
+                embeddings[other_positions] = self._embed_loaded(
+                    [image_paths[i] for i in other_positions],
+                    np.empty((len(other_positions), self.dimension), dtype=np.float32),
+                )
+        else:
+            self._embed_loaded(image_paths, embeddings)
         
         self.logger.debug(
-            f"Generated batch embeddings: shape {embeddings.shape}, "
-            f"dimension {embeddings.shape[1] if len(embeddings.shape) > 1 else embeddings.shape[0]}"
+            "Generated batch embeddings: shape %s, dimension %d", embeddings.shape, embeddings.shape[-1]
         )
         return embeddings
     
+    def _embed_loaded(self, image_paths: List[str], out: np.ndarray) -> np.ndarray:
+        """
+        Embed images decoded and resized with PIL.
+        
+        A single forward pass worth of images is loaded by a thread pool. Larger
+        batches are loaded by LOADER_WORKERS worker processes, one forward pass ahead
+        of the model; the processes are started once and reused by later calls.
+        
+        :param image_paths: Image file paths (must not be empty)
+        :param out: float32 array of shape (len(image_paths), dimension) to write into
+        :returns: out, holding one L2-normalized embedding per path
+        :raises ValueError: If an image cannot be loaded
+        """
+        load_args = (self.shortest_edge, self.crop_size, self.resample)
+        if len(image_paths) <= self.BATCH_SIZE:
+            pixels = list(self._io_pool.map(lambda path: _load_pixels(path, *load_args), image_paths))
+            return self._forward(torch.from_numpy(np.stack(pixels)), out=out)
+        
+        pool = self._get_loader_pool()
+        
+        def submit(start: int) -> List[Future]:
+            return [
+                pool.submit(_load_pixels, path, *load_args)
+                for path in image_paths[start:start + self.BATCH_SIZE]
+            ]
+        
+        pending = submit(0)
+        for start in range(0, len(image_paths), self.BATCH_SIZE):
+            futures = pending
+            if start + self.BATCH_SIZE < len(image_paths):
+                pending = submit(start + self.BATCH_SIZE)
+            pixel_values = torch.from_numpy(np.stack([future.result() for future in futures]))
+            if self.device_type == "cuda":
+                pixel_values = pixel_values.pin_memory()
+            self._forward(pixel_values, out=out[start:start + len(futures)])
+        return out
+    
+    def _get_loader_pool(self) -> ProcessPoolExecutor:
+        """
+        Get the loader worker processes, starting them on first use.
+        
+        :returns: Process pool with LOADER_WORKERS workers
+        """
+        with self._loader_pool_lock:
+            if self._loader_pool is None:
+                self._loader_pool = ProcessPoolExecutor(max_workers=self.LOADER_WORKERS)
+            return self._loader_pool
+    
+    def _embed_jpegs(self, image_paths: List[str], out: np.ndarray) -> np.ndarray:
+        """
+        Embed JPEG images decoded, resized and cropped on the GPU.
+        
+        Files nvJPEG cannot read or decode (e.g. CMYK, progressive or corrupt files)
+        fall back to PIL one by one, so they do not take the rest of the batch with them.
+        
+        :param image_paths: JPEG file paths (must not be empty)
+        :param out: float32 array of shape (len(image_paths), dimension) to write into
+        :returns: out, holding one L2-normalized embedding per path
+        :raises ValueError: If an image cannot be loaded by PIL either
+        """
+        for start in range(0, len(image_paths), self.BATCH_SIZE):
+            batch_paths = image_paths[start:start + self.BATCH_SIZE]
+            batch_out = out[start:start + len(batch_paths)]
+            images = self._decode_jpegs(batch_paths)
+            decoded = [i for i, image in enumerate(images) if image is not None]
+            fallback = [i for i, image in enumerate(images) if image is None]
+            if decoded:
+                pixel_values = torch.stack([self._resize_and_crop_on_device(images[i]) for i in decoded])
+                if len(decoded) == len(batch_paths):
+                    self._forward(pixel_values, out=batch_out)
+                else:
+                    batch_out[decoded] = self._forward(pixel_values)
+            if fallback:
+                self.logger.debug(f"nvJPEG could not decode {len(fallback)} images, using PIL")
+                batch_out[fallback] = self._embed_loaded(
+                    [batch_paths[i] for i in fallback],
+                    np.empty((len(fallback), self.dimension), dtype=np.float32),
+                )
+        return out
+    
+    def _decode_jpegs(self, image_paths: List[str]) -> List[Optional[torch.Tensor]]:
+        """
+        Read and decode JPEG files on the GPU, one batched nvJPEG call when possible.
+        
+        :param image_paths: JPEG file paths
+        :returns: One uint8 (3, height, width) tensor per path on the model device, or
+            None for files that could not be read or decoded
+        """
+        tv_io = _load_torchvision_io()
+        encoded: List[Optional[torch.Tensor]] = []
+        for path in image_paths:
+            try:
+                with open(path, "rb") as f:
+                    encoded.append(torch.frombuffer(bytearray(f.read()), dtype=torch.uint8))
+            except (OSError, ValueError) as e:
+                # ValueError: torch.frombuffer rejects empty files
+                self.logger.debug(f"Could not read {path} for nvJPEG: {e}")
+                encoded.append(None)
+        
+        readable = [i for i, data in enumerate(encoded) if data is not None]
+        images: List[Optional[torch.Tensor]] = [None] * len(image_paths)
+        if not readable:
+            return images
+        try:
+            decoded = tv_io.decode_jpeg(
+                [encoded[i] for i in readable], mode=tv_io.ImageReadMode.RGB, device=self.device
+            )
+            for i, image in zip(readable, decoded):
+                images[i] = image
+            return images
+        except (RuntimeError, ValueError, OSError) as e:
+            self.logger.debug(f"Batched nvJPEG decode failed, decoding {len(readable)} images one by one: {e}")
+        for i in readable:
+            try:
+                images[i] = tv_io.decode_jpeg(encoded[i], mode=tv_io.ImageReadMode.RGB, device=self.device)
+            except (RuntimeError, ValueError, OSError) as e:
+                self.logger.debug(f"nvJPEG could not decode {image_paths[i]}: {e}")
+        return images
+    
+    def _resize_and_crop_on_device(self, image: torch.Tensor) -> torch.Tensor:
+        """
+        Resize and center crop a decoded image tensor, matching _resize_and_crop.
+        
+        :param image: uint8 tensor of shape (3, height, width) on the model device
+        :returns: float tensor of pixel values in [0, 255], shape (3, crop height, crop width)
+        """
+        height, width = image.shape[1:]
+        if width <= height:
+            size = (int(self.shortest_edge * height / width), self.shortest_edge)
+        else:
+            size = (self.shortest_edge, int(self.shortest_edge * width / height))
+        pixels = image.unsqueeze(0).float()
+        if size != (height, width):
+            pixels = F.interpolate(pixels, size=size, mode="bicubic", align_corners=False, antialias=True)
+            pixels = pixels.clamp_(0, 255)
+        
+        crop_height, crop_width = self.crop_size
+        top = (size[0] - crop_height) // 2
+        left = (size[1] - crop_width) // 2
+        return pixels[0, :, top:top + crop_height, left:left + crop_width]
+    
+    def _forward(self, pixel_values: torch.Tensor, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Normalize a batch of resized and cropped images and run the vision tower.
+        
+        :param pixel_values: uint8 (or float, in [0, 255]) tensor of shape (batch, 3, height, width)
+        :param out: float32 array of shape (batch, dimension) to write into (optional);
+            the device transfer and float32 cast then happen in one copy
+        :returns: 2D float32 array of L2-normalized image embeddings (out, if given)
+        """
+        batch_size = pixel_values.shape[0]
+        if self._compiled and batch_size < self.BATCH_SIZE:
+            # Power-of-two batch buckets keep the CUDA graphs captured under
+            # "reduce-overhead" to a handful of shapes instead of one per batch size
+            bucket = min(1 << (batch_size - 1).bit_length(), self.BATCH_SIZE)
+            if bucket > batch_size:
+                pixel_values = F.pad(pixel_values, (0, 0, 0, 0, 0, 0, 0, bucket - batch_size))
+        pixel_values = pixel_values.to(self.device, non_blocking=True)
+        pixel_values = pixel_values.float().mul_(self._pixel_scale).sub_(self._pixel_shift)
+        pixel_values = pixel_values.contiguous(memory_format=torch.channels_last)
+        with torch.inference_mode(), autocast_context(self.device_type, self.precision):
+            image_features = self.model.get_image_features(pixel_values=pixel_values)
+        # Normalize in float32 so half-precision features do not underflow
+        image_features = F.normalize(image_features[:batch_size].float(), p=2, dim=-1)
+        if out is not None:
+            torch.from_numpy(out).copy_(image_features)
+            return out
+        return image_features.cpu().numpy()
+    
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for text using CLIP's text encoder.
         
-        This enables cross-modal search where text queries can find images.
+        This enables cross-modal search where text queries can find images. The
+        embeddings of the last TEXT_CACHE_SIZE distinct texts are reused without
+        tokenizing or running the text encoder again.
         
         :param text: Text string to embed
         :returns: A 1D numpy array representing the text embedding vector (same space as images)
@@ -134,11 +496,120 @@ class CLIPImageEmbedder:
             self.logger.error("Cannot embed empty text")
             raise ValueError("text cannot be empty")
         
-        with torch.no_grad():
-            inputs = self.processor(text=text, return_tensors="pt", padding=True, truncation=True).to(self.device)
+        with self._text_cache_lock:
+            cached = self._text_cache.get(text)
+            if cached is not None:
+                self._text_cache.move_to_end(text)
+        if cached is not None:
+            return cached.copy()
+        
+        inputs = self.processor(text=text, return_tensors="pt", padding=True, truncation=True).to(self.device)
+        with torch.inference_mode(), autocast_context(self.device_type, self.precision):
             text_features = self.model.get_text_features(**inputs)
-            text_features = text_features / text_features.norm(p=2, dim=-1, keepdim=True)
-            embedding = text_features.cpu().numpy().flatten()
+        text_features = F.normalize(text_features.float(), p=2, dim=-1)
+        embedding = text_features.cpu().numpy().flatten()
+        
+        with self._text_cache_lock:
+            self._text_cache[text] = embedding.copy()
+            if len(self._text_cache) > self.TEXT_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        
+        self.logger.debug("Generated text embedding with dimension %d", embedding.shape[0])
+        return embedding
+    
+    def clear_text_cache(self) -> None:
+        """
+        Drop all cached text embeddings.
+        """
+        with self._text_cache_lock:
+            self._text_cache.clear()
+
+
+class MultiGPUImageEmbedder:
+    """
+    Data-parallel CLIP image embedding over several CUDA devices.
+    
+    Holds one CLIPImageEmbedder replica per device. embed_batch splits the paths
+    into one contiguous shard per device and embeds the shards concurrently from
+    threads (forward passes and image decoding release the GIL); single images and
+    text queries run on the first device.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "openai/clip-vit-base-patch32",
+        devices: Optional[List[str]] = None,
+        **embedder_options: Any,
+    ):
+        """
+        Load one CLIP replica on each device.
+        
+        :param model_name: Name of the CLIP model to use (must not be empty)
+        :param devices: Torch devices to use (defaults to every visible CUDA device;
+            must not be empty)
+        :param embedder_options: Further CLIPImageEmbedder options (compile_model,
+            use_nvjpeg, precision)
+        """
+        self.logger = get_logger(__name__)
         
-        self.logger.debug(f"Generated text embedding with dimension {embedding.shape[0]}")
-        return embedding
\ No newline at end of file
+        if devices is None:
+            devices = [f"cuda:{index}" for index in range(torch.cuda.device_count())]
+        if not devices:
+            self.logger.error("MultiGPUImageEmbedder needs at least one device")
+            raise ValueError("devices cannot be empty")
+        
+        self.replicas = [
+            CLIPImageEmbedder(model_name=model_name, device=device, **embedder_options)
+            for device in devices
+        ]
+        self.model_name = model_name
+        self.device = self.replicas[0].device
+        self.dimension = self.replicas[0].dimension
+        self._pool = ThreadPoolExecutor(max_workers=len(self.replicas), thread_name_prefix="clip-replica")
+        self.logger.info(f"MultiGPUImageEmbedder initialized on {len(self.replicas)} devices: {devices}")
+    
+    def embed(self, image_path: str) -> np.ndarray:
+        """
+        Generate embedding vector for a single image on the first device.
+        
+        :param image_path: Path to the image file (must exist and be readable)
+        :returns: A 1D numpy array representing the image embedding vector
+        :raises ValueError: If image cannot be loaded or processed
+        """
+        return self.replicas[0].embed(image_path)
+    
+    def embed_batch(self, image_paths: List[str]) -> np.ndarray:
+        """
+        Generate embedding vectors for multiple images, one shard per device.
+        
+        Batches of at most one forward pass per device run on the first device only.
+        
+        :param image_paths: List of image file paths (must not be empty)
+        :returns: A 2D numpy array where each row is an embedding vector
+        :postcondition: result.shape[0] == len(image_paths)
+        :raises ValueError: If image_paths list is empty or an image cannot be loaded
+        """
+        if not image_paths:
+            self.logger.error("Cannot embed empty batch")
+            raise ValueError("image_paths list cannot be empty")
+        
+        shard_size = max(CLIPImageEmbedder.BATCH_SIZE, -(-len(image_paths) // len(self.replicas)))
+        shards = [image_paths[start:start + shard_size] for start in range(0, len(image_paths), shard_size)]
+        if len(shards) == 1:
+            return self.replicas[0].embed_batch(image_paths)
+        
+        futures = [
+            self._pool.submit(replica.embed_batch, shard)
+            for replica, shard in zip(self.replicas, shards)
+        ]
+        return np.concatenate([future.result() for future in futures])
+    
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Generate embedding vector for text on the first device.
+        
+        :param text: Text string to embed
+        :returns: A 1D numpy array representing the text embedding vector (same space as images)
+        :raises ValueError: If text is empty
+        """
+        return self.replicas[0].embed_text(text)
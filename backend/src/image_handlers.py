@@ -1,13 +1,16 @@
 """
 Image file handlers for processing image files with computer vision.
 """
-from typing import Dict, Any
+import os
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 import numpy as np
 
 from .file_metadata import FileMetadata
-from .image_embedders import CLIPImageEmbedder
 from .logger import get_logger
 
+if TYPE_CHECKING:
+    from .image_embedders import CLIPImageEmbedder
+
 
 class ImageFileHandler:
     """
@@ -16,19 +19,38 @@ class ImageFileHandler:
     Uses dependency injection for the image embedder.
     """
     
-    def __init__(self, image_embedder: CLIPImageEmbedder):
+    # Images passed to the embedder per embed_batch call in process_many
+    BATCH_SIZE = 32
+    # Environment variable setting the batch size when none is passed
+    BATCH_SIZE_ENV_VAR = "FILEX_IMAGE_BATCH_SIZE"
+    
+    def __init__(self, image_embedder: "CLIPImageEmbedder", batch_size: Optional[int] = None):
         """
         Initialize image file handler with image embedder.
         
         :param image_embedder: The CLIPImageEmbedder to use for embeddings (must not be None)
+        :param batch_size: Images embedded per embedder call in process_many (must be > 0;
+            default: from the FILEX_IMAGE_BATCH_SIZE environment variable, else BATCH_SIZE)
+        :raises ValueError: If image_embedder is None or batch_size is invalid
         """
         self.logger = get_logger(__name__)
         
         if image_embedder is None:
             self.logger.error("image_embedder cannot be None")
             raise ValueError("image_embedder cannot be None")
+        if batch_size is None:
+            env_value = os.environ.get(self.BATCH_SIZE_ENV_VAR, "")
+            try:
+                batch_size = int(env_value) if env_value else self.BATCH_SIZE
+            except ValueError:
+                self.logger.error(f"{self.BATCH_SIZE_ENV_VAR} must be an integer, got: {env_value}")
+                raise ValueError(f"{self.BATCH_SIZE_ENV_VAR} must be an integer")
+        if batch_size <= 0:
+            self.logger.error(f"batch_size must be positive, got: {batch_size}")
+            raise ValueError("batch_size must be positive")
         
         self.image_embedder = image_embedder
+        self.batch_size = batch_size
         self.supported_extensions = {'.png', '.jpg', '.jpeg'}
         self.logger.info("ImageFileHandler initialized")
     
@@ -41,7 +63,7 @@ class ImageFileHandler:
         """
         can_handle = metadata.is_image_type and metadata.file_extension in self.supported_extensions
         if can_handle:
-            self.logger.debug(f"ImageFileHandler can handle file: {metadata.file_name}")
+            self.logger.debug("ImageFileHandler can handle file: %s", metadata.file_name)
         return can_handle
     
     def process(self, metadata: FileMetadata) -> Dict[str, Any]:
@@ -56,33 +78,89 @@ class ImageFileHandler:
             raise ValueError(f"Cannot handle file type: {metadata.file_extension}")
         
         self.logger.info(
-            f"Processing image file: {metadata.file_name} "
-            f"({metadata.file_size_kb:.2f} KB)"
+            "Processing image file: %s (%.2f KB)", metadata.file_name, metadata.file_size_kb
         )
         
         embedding = self.image_embedder.embed(metadata.file_path)
+        return self._build_result(metadata, embedding)
+    
+    def process_many(
+        self,
+        metadatas: List[FileMetadata],
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several image files, embedding them batch_size images per embedder call.
+        
+        If a batch fails (e.g. one unreadable image), its files are embedded one at a
+        time so only the files that fail are reported.
+        
+        :param metadatas: Metadata of the files to process (each must be an image file)
+        :param batch_size: Images per embedder call (defaults to self.batch_size)
+        :returns: One result per file in input order; files that could not be embedded
+            get "processed": False and a "reason"
+        :postcondition: len(result) == len(metadatas)
+        :raises ValueError: If any file is not a supported image file
+        """
+        for metadata in metadatas:
+            if not self.can_handle(metadata):
+                self.logger.error(f"Cannot handle file type: {metadata.file_extension}")
+                raise ValueError(f"Cannot handle file type: {metadata.file_extension}")
+        
+        batch_size = batch_size or self.batch_size
+        self.logger.info("Processing %d image files in batches of %d", len(metadatas), batch_size)
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(metadatas), batch_size):
+            batch = metadatas[start:start + batch_size]
+            try:
+                embeddings = self.image_embedder.embed_batch([m.file_path for m in batch])
+            except Exception as e:
+                self.logger.warning(f"Batched image embedding failed, embedding files one at a time: {e}")
+                results.extend(self._process_or_fail(metadata) for metadata in batch)
+                continue
+            results.extend(
+                self._build_result(metadata, embedding) for metadata, embedding in zip(batch, embeddings)
+            )
+        return results
+    
+    def _process_or_fail(self, metadata: FileMetadata) -> Dict[str, Any]:
+        """
+        Process one image file, turning an embedding error into an unprocessed result.
         
+        :param metadata: File metadata
+        :returns: Processing result
+        """
+        try:
+            return self._build_result(metadata, self.image_embedder.embed(metadata.file_path))
+        except Exception as e:
+            self.logger.error(f"Failed to embed image {metadata.file_name}: {e}")
+            return {
+                "metadata": metadata.to_dict(),
+                "embeddings": None,
+                "processed": False,
+                "reason": str(e),
+            }
+    
+    def _build_result(self, metadata: FileMetadata, embedding: np.ndarray) -> Dict[str, Any]:
+        """
+        Build the processing result for an embedded image file.
+        
+        :param metadata: File metadata
+        :param embedding: Image embedding (1D, or 2D with one row)
+        :returns: Dictionary containing metadata and embedding results
+        """
         embedding_dim = embedding.shape[0] if len(embedding.shape) == 1 else embedding.shape[1]
         
         chunks = [metadata.file_path]
         embeddings = embedding.reshape(1, -1) if len(embedding.shape) == 1 else embedding
         
         self.logger.info(
-            f"Successfully processed image file: {metadata.file_name} "
-            f"(embedding dimension: {embedding_dim})"
+            "Successfully processed image file: %s (embedding dimension: %d)",
+            metadata.file_name, embedding_dim
         )
         
         return {
-            "metadata": {
-                "file_path": metadata.file_path,
-                "file_name": metadata.file_name,
-                "file_extension": metadata.file_extension,
-                "file_size_bytes": metadata.file_size_bytes,
-                "file_size_kb": metadata.file_size_kb,
-                "file_size_mb": metadata.file_size_mb,
-                "modified_time": metadata.modified_time.isoformat() if metadata.modified_time else None,
-                "created_time": metadata.created_time.isoformat() if metadata.created_time else None,
-            },
+            "metadata": metadata.to_dict(),
             "embeddings": {
                 "chunks": chunks,
                 "embeddings": embeddings,
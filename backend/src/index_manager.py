@@ -1,10 +1,13 @@
 """
 Index management for tracking indexed files and detecting changes.
 """
+import contextlib
+import os
 import sqlite3
 import hashlib
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 
 from .repository import Repository
@@ -27,6 +30,7 @@ class FileIndexEntry:
         is_text_type: bool,
         num_chunks: Optional[int] = None,
         embedding_dimension: Optional[int] = None,
+        stat_fingerprint: Optional[str] = None,
     ):
         self.file_path = file_path
         self.file_hash = file_hash
@@ -37,6 +41,7 @@ class FileIndexEntry:
         self.is_text_type = is_text_type
         self.num_chunks = num_chunks
         self.embedding_dimension = embedding_dimension
+        self.stat_fingerprint = stat_fingerprint
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -54,6 +59,7 @@ class FileIndexEntry:
             "is_text_type": self.is_text_type,
             "num_chunks": self.num_chunks,
             "embedding_dimension": self.embedding_dimension,
+            "stat_fingerprint": self.stat_fingerprint,
         }
     
     @classmethod
@@ -74,6 +80,7 @@ class FileIndexEntry:
             is_text_type=bool(row[6]),
             num_chunks=row[7],
             embedding_dimension=row[8],
+            stat_fingerprint=row[9] if len(row) > 9 else None,
         )
 
 
@@ -81,9 +88,33 @@ class IndexManager:
     """
     Manages the file index database and tracks indexed files.
     
-    Detects changes by comparing file hashes, sizes, and modification times.
+    Detects changes by comparing a stat fingerprint (size, modification time in
+    nanoseconds and inode) first, then sizes and modification times, and file
+    hashes only when the size and modification time match but the fingerprint
+    cannot confirm the file is unchanged.
     """
     
+    # Read size for content hashing
+    HASH_CHUNK_SIZE = 1024 * 1024
+    # Applied to every connection: WAL already lets readers run alongside a writer,
+    # so commits only need to sync at checkpoints; the index is rebuildable
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+    # Inside bulk(), added entries are written after this many (and on exit)
+    BULK_WRITE_ENTRIES = 256
+    # Column order of rows written by _write_rows
+    INSERT_ENTRY_SQL = """
+        INSERT OR REPLACE INTO file_index (
+            file_path, file_hash, file_size, modified_time, indexed_time,
+            extension, is_text_type, num_chunks, embedding_dimension, stat_fingerprint
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    # Paths per IN (...) query when looking up stored rows of buffered entries
+    LOOKUP_BATCH_SIZE = 500
+    
     def __init__(self, repository: Repository):
         """
         Initialize index manager with repository.
@@ -98,16 +129,42 @@ class IndexManager:
         
         self.repository = repository
         self.db_path = repository.config.index_db_path
+        # Path -> (stat fingerprint, content hash) hashed by has_changed, for file_hash
+        self._computed_hashes: Dict[str, Tuple[Optional[str], str]] = {}
+        self._computed_hashes_lock = threading.Lock()
+        # One persistent connection per thread (check_file runs on a thread pool)
+        self._local = threading.local()
+        # Nesting depth of bulk() (and of deferred blocks) and entry rows not yet written
+        self._bulk_depth = 0
+        self._deferred_depth = 0
+        self._pending_rows: List[tuple] = []
+        self._pending_lock = threading.Lock()
         self._init_database()
         self.logger.info("IndexManager initialized")
     
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection to the index database, opening it on first use.
+        
+        :returns: Open connection with CONNECTION_PRAGMAS applied
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
     def _init_database(self) -> None:
         """
         Initialize the index database with schema.
         """
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
+        # The journal mode is stored in the database file, so this only switches once
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -120,10 +177,17 @@ class IndexManager:
                 extension TEXT NOT NULL,
                 is_text_type INTEGER NOT NULL,
                 num_chunks INTEGER,
-                embedding_dimension INTEGER
+                embedding_dimension INTEGER,
+                stat_fingerprint TEXT
             )
         """)
         
+        # Databases created before stat fingerprints were stored lack the column
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(file_index)")}
+        if "stat_fingerprint" not in columns:
+            cursor.execute("ALTER TABLE file_index ADD COLUMN stat_fingerprint TEXT")
+            self.logger.info("Added stat_fingerprint column to index database")
+        
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_file_hash ON file_index(file_hash)
         """)
@@ -133,7 +197,6 @@ class IndexManager:
         """)
         
         conn.commit()
-        conn.close()
         self.logger.debug("Index database initialized")
     
     @staticmethod
@@ -144,14 +207,41 @@ class IndexManager:
         :param file_path: Path to file
         :returns: Hex digest of file hash
         """
-        sha256 = hashlib.sha256()
-        
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
+        with open(file_path, 'rb', buffering=0) as f:
+            # Python 3.11+ hashes an unbuffered file without per-chunk Python calls
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            
+            sha256 = hashlib.sha256()
+            buffer = bytearray(IndexManager.HASH_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while size := f.readinto(buffer):
+                sha256.update(view[:size])
         
         return sha256.hexdigest()
     
+    @staticmethod
+    def stat_fingerprint(metadata: FileMetadata) -> Optional[str]:
+        """
+        Get the stat fingerprint of a file from its metadata.
+        
+        :param metadata: File metadata
+        :returns: "size:mtime_ns:inode" string, or None if the metadata lacks stat details
+        """
+        if metadata.modified_time_ns is None or metadata.inode is None:
+            return None
+        return f"{metadata.file_size_bytes}:{metadata.modified_time_ns}:{metadata.inode}"
+    
+    @staticmethod
+    def stat_result_fingerprint(stat: os.stat_result) -> str:
+        """
+        Get the stat fingerprint of a file from an os.stat result.
+        
+        :param stat: Result of os.stat on the file
+        :returns: "size:mtime_ns:inode" string, comparable with stat_fingerprint
+        """
+        return f"{stat.st_size}:{stat.st_mtime_ns}:{stat.st_ino}"
+    
     def _compute_file_hash(self, file_path: str) -> str:
         """
         Compute SHA256 hash of file contents (instance method wrapper).
@@ -161,6 +251,23 @@ class IndexManager:
         """
         return self.compute_file_hash(file_path)
     
+    def file_hash(self, metadata: FileMetadata) -> str:
+        """
+        Get the content hash of a file for add_entry.
+        
+        Reuses the hash has_changed computed for the file if its stat fingerprint
+        is unchanged, so a changed file is read for hashing only once.
+        
+        :param metadata: File metadata
+        :returns: Hex digest of file hash
+        """
+        with self._computed_hashes_lock:
+            computed = self._computed_hashes.pop(metadata.file_path, None)
+        fingerprint = self.stat_fingerprint(metadata)
+        if computed is not None and fingerprint is not None and computed[0] == fingerprint:
+            return computed[1]
+        return self.compute_file_hash(metadata.file_path)
+    
     def is_indexed(self, file_path: str) -> bool:
         """
         Check if a file is in the index.
@@ -168,13 +275,14 @@ class IndexManager:
         :param file_path: Path to file
         :returns: True if file is indexed
         """
-        conn = sqlite3.connect(self.db_path)
+        if file_path in self._prepare_read():
+            return True
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT 1 FROM file_index WHERE file_path = ?", (file_path,))
         result = cursor.fetchone() is not None
         
-        conn.close()
         return result
     
     def get_index_entry(self, file_path: str) -> Optional[FileIndexEntry]:
@@ -184,51 +292,66 @@ class IndexManager:
         :param file_path: Path to file
         :returns: FileIndexEntry if found, None otherwise
         """
-        conn = sqlite3.connect(self.db_path)
+        pending = self._prepare_read().get(file_path)
+        if pending is not None:
+            return FileIndexEntry.from_row(pending)
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM file_index WHERE file_path = ?", (file_path,))
         row = cursor.fetchone()
-        conn.close()
         
         if row:
             return FileIndexEntry.from_row(row)
         return None
     
-    def has_changed(self, metadata: FileMetadata) -> bool:
+    def has_changed(self, metadata: FileMetadata, verify: bool = False) -> bool:
         """
         Check if a file has changed since last indexing.
         
+        A file whose stat fingerprint, or size and modification time, match the
+        indexed ones is treated as unchanged without reading it, unless verify is set.
+        A different size or modification time means changed, also without hashing.
+        
         :param metadata: File metadata
+        :param verify: Compare content hashes even if the size and modification time match
         :returns: True if file has changed or is not indexed
         """
         entry = self.get_index_entry(metadata.file_path)
         
         if entry is None:
-            self.logger.debug(f"File not in index: {metadata.file_name}")
+            self.logger.debug("File not in index: %s", metadata.file_name)
             return True
         
+        fingerprint = self.stat_fingerprint(metadata)
+        if not verify and fingerprint is not None and entry.stat_fingerprint == fingerprint:
+            return False
+        
         if entry.file_size != metadata.file_size_bytes:
             self.logger.debug(
-                f"File size changed: {metadata.file_name} "
-                f"({entry.file_size} -> {metadata.file_size_bytes})"
+                "File size changed: %s (%d -> %d)",
+                metadata.file_name, entry.file_size, metadata.file_size_bytes
             )
             return True
         
         if entry.modified_time and metadata.modified_time:
-            if entry.modified_time < metadata.modified_time:
+            if entry.modified_time != metadata.modified_time:
                 self.logger.debug(
-                    f"File modified time changed: {metadata.file_name} "
-                    f"({entry.modified_time} -> {metadata.modified_time})"
+                    "File modified time changed: %s (%s -> %s)",
+                    metadata.file_name, entry.modified_time, metadata.modified_time
                 )
                 return True
+            if not verify:
+                return False
         
         file_hash = self.compute_file_hash(metadata.file_path)
         if entry.file_hash != file_hash:
             self.logger.debug(
-                f"File hash changed: {metadata.file_name} "
-                f"({entry.file_hash[:8]}... -> {file_hash[:8]}...)"
+                "File hash changed: %s (%.8s... -> %.8s...)",
+                metadata.file_name, entry.file_hash, file_hash
             )
+            with self._computed_hashes_lock:
+                self._computed_hashes[metadata.file_path] = (fingerprint, file_hash)
             return True
         
         return False
@@ -243,22 +366,64 @@ class IndexManager:
         """
         Add or update an entry in the index.
         
+        The stat fingerprint is taken from the metadata, so it describes the file as
+        it was when the metadata was collected.
+        
         :param metadata: File metadata
         :param file_hash: SHA256 hash of file contents
         :param num_chunks: Number of chunks (for text files)
         :param embedding_dimension: Embedding dimension (for text files)
         """
-        indexed_time = datetime.now()
+        row = self._entry_row(metadata, file_hash, num_chunks, embedding_dimension, datetime.now())
+        
+        if self._bulk_depth:
+            with self._pending_lock:
+                self._pending_rows.append(row)
+                flush = (
+                    not self._deferred_depth
+                    and len(self._pending_rows) >= self.BULK_WRITE_ENTRIES
+                )
+            if flush:
+                self.flush()
+        else:
+            self._write_rows([row])
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.logger.info(
+            "Index entry added/updated: %s (hash: %.8s..., chunks: %s)",
+            metadata.file_name, file_hash, num_chunks
+        )
+    
+    def add_entries_batch(
+        self,
+        entries: List[Tuple[FileMetadata, str, Optional[int], Optional[int]]],
+    ) -> None:
+        """
+        Add or update several entries in the index in one transaction.
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO file_index (
-                file_path, file_hash, file_size, modified_time, indexed_time,
-                extension, is_text_type, num_chunks, embedding_dimension
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        :param entries: List of (metadata, file hash, num_chunks, embedding_dimension)
+            tuples, as passed to add_entry
+        """
+        indexed_time = datetime.now()
+        self._write_rows([
+            self._entry_row(metadata, file_hash, num_chunks, embedding_dimension, indexed_time)
+            for metadata, file_hash, num_chunks, embedding_dimension in entries
+        ])
+        self.logger.info(f"Index entries added/updated: {len(entries)} files")
+    
+    def _entry_row(
+        self,
+        metadata: FileMetadata,
+        file_hash: str,
+        num_chunks: Optional[int],
+        embedding_dimension: Optional[int],
+        indexed_time: datetime,
+    ) -> tuple:
+        """
+        Build the INSERT_ENTRY_SQL parameters for one file.
+        
+        :returns: Tuple of column values
+        """
+        return (
             metadata.file_path,
             file_hash,
             metadata.file_size_bytes,
@@ -268,15 +433,91 @@ class IndexManager:
             1 if metadata.is_text_type else 0,
             num_chunks,
             embedding_dimension,
-        ))
+            self.stat_fingerprint(metadata),
+        )
+    
+    def _write_rows(self, rows: List[tuple]) -> None:
+        """
+        Insert or replace entry rows with one executemany and a single commit.
         
-        conn.commit()
-        conn.close()
+        :param rows: Rows built by _entry_row
+        """
+        if not rows:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(self.INSERT_ENTRY_SQL, rows)
+    
+    def _prepare_read(self) -> Dict[str, tuple]:
+        """
+        Make entries buffered by bulk() visible to a read.
         
-        self.logger.info(
-            f"Index entry added/updated: {metadata.file_name} "
-            f"(hash: {file_hash[:8]}..., chunks: {num_chunks})"
-        )
+        Outside deferred blocks the buffer is written first. Inside one it must not
+        be written before the data it describes is saved, so its rows are returned
+        for the caller to merge with the database rows instead.
+        
+        :returns: Buffered rows by file path (latest wins); empty outside deferred blocks
+        """
+        if not self._deferred_depth:
+            self.flush()
+            return {}
+        with self._pending_lock:
+            return {row[0]: row for row in self._pending_rows}
+    
+    def _stored_rows(self, file_paths: List[str]) -> List[tuple]:
+        """
+        Get the database rows of the given files.
+        
+        :param file_paths: Paths to look up
+        :returns: Rows of the files that are in the database
+        """
+        conn = self._connection()
+        rows = []
+        for start in range(0, len(file_paths), self.LOOKUP_BATCH_SIZE):
+            batch = file_paths[start:start + self.LOOKUP_BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            rows.extend(conn.execute(
+                f"SELECT * FROM file_index WHERE file_path IN ({placeholders})", batch
+            ))
+        return rows
+    
+    def flush(self) -> None:
+        """
+        Write entries buffered by bulk() to the database.
+        """
+        # Held while writing so concurrent flushes cannot reorder updates of a file
+        with self._pending_lock:
+            rows, self._pending_rows = self._pending_rows, []
+            self._write_rows(rows)
+    
+    @contextlib.contextmanager
+    def bulk(self, deferred: bool = False) -> Iterator["IndexManager"]:
+        """
+        Buffer added entries while many files are indexed.
+        
+        Inside the block, add_entry writes entries BULK_WRITE_ENTRIES at a time in
+        one transaction instead of committing each. A deferred block instead keeps
+        entries until flush() is called, so the caller can write them only after the
+        data they describe has been saved (see SearchManager.add_commit_hook). Reads
+        see every added entry: outside deferred blocks they write the buffer first,
+        inside one they merge it with the database rows without writing it.
+        Blocks may be nested.
+        
+        :param deferred: Write buffered entries only on flush() and on exit
+        :returns: Context manager yielding this index manager
+        :postcondition: All added entries are written once the outermost block exits
+        """
+        self._bulk_depth += 1
+        if deferred:
+            self._deferred_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if deferred:
+                self._deferred_depth -= 1
+            if self._bulk_depth == 0:
+                self.flush()
     
     def remove_entry(self, file_path: str) -> None:
         """
@@ -284,19 +525,26 @@ class IndexManager:
         
         :param file_path: Path to file
         """
-        conn = sqlite3.connect(self.db_path)
+        buffered = False
+        if self._deferred_depth:
+            with self._pending_lock:
+                kept = [row for row in self._pending_rows if row[0] != file_path]
+                buffered = len(kept) != len(self._pending_rows)
+                self._pending_rows = kept
+        else:
+            self.flush()
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("DELETE FROM file_index WHERE file_path = ?", (file_path,))
-        deleted = cursor.rowcount > 0
+        deleted = cursor.rowcount > 0 or buffered
         
         conn.commit()
-        conn.close()
         
         if deleted:
-            self.logger.info(f"Index entry removed: {file_path}")
+            self.logger.info("Index entry removed: %s", file_path)
         else:
-            self.logger.debug(f"Index entry not found for removal: {file_path}")
+            self.logger.debug("Index entry not found for removal: %s", file_path)
     
     def get_all_entries(self) -> List[FileIndexEntry]:
         """
@@ -304,26 +552,140 @@ class IndexManager:
         
         :returns: List of all FileIndexEntry instances
         """
-        conn = sqlite3.connect(self.db_path)
+        pending = self._prepare_read()
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM file_index")
         rows = cursor.fetchall()
-        conn.close()
+        if pending:
+            rows = [row for row in rows if row[0] not in pending] + list(pending.values())
         
         return [FileIndexEntry.from_row(row) for row in rows]
     
+    def get_entry_dicts(self, extension: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get index entries as dictionaries, straight from the database rows.
+        
+        Timestamps are stored as ISO strings, so the rows already hold what
+        FileIndexEntry.to_dict returns; no entry objects or datetimes are built.
+        
+        :param extension: Only return entries with this extension (optional)
+        :returns: List of dictionaries in FileIndexEntry.to_dict form
+        """
+        pending = self._prepare_read()
+        conn = self._connection()
+        
+        query = (
+            "SELECT file_path, file_hash, file_size, modified_time, indexed_time, extension, "
+            "is_text_type, num_chunks, embedding_dimension, stat_fingerprint FROM file_index"
+        )
+        params: Tuple[str, ...] = ()
+        if extension:
+            query += " WHERE extension = ?"
+            params = (extension.lower(),)
+        cursor = conn.execute(query, params)
+        columns = [description[0] for description in cursor.description]
+        rows = cursor.fetchall()
+        if pending:
+            rows = [row for row in rows if row[0] not in pending] + [
+                row for row in pending.values() if not extension or row[5] == extension.lower()
+            ]
+        
+        entries = [dict(zip(columns, row)) for row in rows]
+        for entry in entries:
+            entry["is_text_type"] = bool(entry["is_text_type"])
+        return entries
+    
+    def get_extension_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get file counts, sizes and chunk counts per extension in a single query.
+        
+        :returns: Dictionary of extension -> {count, total_size, total_chunks, text_files}
+        """
+        pending = self._prepare_read()
+        conn = self._connection()
+        
+        cursor = conn.execute("""
+            SELECT
+                extension,
+                COUNT(*),
+                COALESCE(SUM(file_size), 0),
+                COALESCE(SUM(num_chunks), 0),
+                COALESCE(SUM(is_text_type), 0)
+            FROM file_index
+            GROUP BY extension
+        """)
+        stats = {
+            extension: {
+                "count": count,
+                "total_size": total_size,
+                "total_chunks": total_chunks,
+                "text_files": text_files,
+            }
+            for extension, count, total_size, total_chunks, text_files in cursor
+        }
+        if pending:
+            # Replace the stored rows of buffered files with the buffered ones
+            for sign, rows in ((-1, self._stored_rows(list(pending))), (1, pending.values())):
+                for row in rows:
+                    extension_stats = stats.setdefault(
+                        row[5], {"count": 0, "total_size": 0, "total_chunks": 0, "text_files": 0}
+                    )
+                    extension_stats["count"] += sign
+                    extension_stats["total_size"] += sign * row[2]
+                    extension_stats["total_chunks"] += sign * (row[7] or 0)
+                    extension_stats["text_files"] += sign * row[6]
+            stats = {extension: values for extension, values in stats.items() if values["count"]}
+        return stats
+    
     def get_indexed_files_count(self) -> int:
         """
         Get total number of indexed files.
         
         :returns: Number of indexed files
         """
-        conn = sqlite3.connect(self.db_path)
+        pending = self._prepare_read()
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT COUNT(*) FROM file_index")
         count = cursor.fetchone()[0]
+        if pending:
+            count += len(pending) - len(self._stored_rows(list(pending)))
         
-        conn.close()
         return count
+    
+    def get_counts(self) -> Dict[str, int]:
+        """
+        Get file and chunk counts in a single query.
+        
+        :returns: Dictionary with total_files, text_files, non_text_files and total_chunks
+            (chunks of text files)
+        """
+        pending = self._prepare_read()
+        conn = self._connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(is_text_type), 0),
+                COALESCE(SUM(CASE WHEN is_text_type THEN COALESCE(num_chunks, 0) ELSE 0 END), 0)
+            FROM file_index
+        """)
+        total_files, text_files, total_chunks = cursor.fetchone()
+        if pending:
+            # Replace the stored rows of buffered files with the buffered ones
+            for sign, rows in ((-1, self._stored_rows(list(pending))), (1, pending.values())):
+                for row in rows:
+                    total_files += sign
+                    text_files += sign * row[6]
+                    total_chunks += sign * ((row[7] or 0) if row[6] else 0)
+        
+        return {
+            "total_files": total_files,
+            "text_files": text_files,
+            "non_text_files": total_files - text_files,
+            "total_chunks": total_chunks,
+        }
@@ -0,0 +1,56 @@
+"""
+JSON file helpers that use orjson when it is installed.
+"""
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json(data: Any, path: Path, indent: bool = False) -> None:
+    """
+    Write data to a UTF-8 JSON file.
+
+    Uses orjson (several times faster, serializes numpy arrays natively) when
+    available, otherwise the standard library encoder. Output is compact unless
+    indent is set, since the files are written once per indexed file and read
+    back by code.
+
+    :param data: JSON-serializable data
+    :param path: Destination file path
+    :param indent: Pretty-print with 2-space indentation (for files meant to be read
+        by people)
+    """
+    if orjson is not None:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=options))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if indent:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+
+def load_json(path: Path) -> Any:
+    """
+    Read a UTF-8 JSON file.
+
+    :param path: File path
+    :returns: Parsed data
+    :raises ValueError: If the file is not valid JSON
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,512 @@
+"""
+Persistent model server that keeps embedding models loaded across CLI invocations.
+
+The server listens on a localhost socket (authenticated with a random key) and
+serves embedding requests, so the CLI can skip the multi-second model load when
+a server is already running.
+"""
+import errno
+import json
+import os
+import secrets
+import socket
+import struct
+import threading
+from multiprocessing.connection import Connection, answer_challenge, deliver_challenge
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+from .logger import get_logger
+
+DEFAULT_STATE_PATH = Path.home() / ".cache" / "filex" / "model_server.json"
+# Seconds a client waits for the connect, handshake and info reply before giving up
+# (also the time the server gives a new connection to authenticate)
+CONNECT_TIMEOUT_SECONDS = 5.0
+# Connect errors meaning nothing listens at the advertised address any more
+_NO_LISTENER_ERRNOS = (errno.ECONNREFUSED, errno.ENOENT)
+
+
+def _pid_alive(pid: Any) -> bool:
+    """
+    Check whether the process that wrote a state file still exists.
+
+    :param pid: Process id from the state file
+    :returns: False only if the process is known to be gone (True when unsure)
+    """
+    if not isinstance(pid, int) or pid <= 0 or os.name == "nt":
+        # os.kill terminates processes on Windows instead of probing them
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _socket_timeout_option(timeout: float) -> Any:
+    """
+    Encode a receive/send timeout for setsockopt on the current platform.
+
+    :param timeout: Timeout in seconds (0 disables the timeout)
+    :returns: Option value for SO_RCVTIMEO/SO_SNDTIMEO
+    """
+    if os.name == "nt":
+        return int(timeout * 1000)
+    seconds = int(timeout)
+    return struct.pack("ll", seconds, int((timeout - seconds) * 1_000_000))
+
+
+def _set_io_timeout(sock: socket.socket, timeout: float) -> None:
+    """
+    Bound blocking reads and writes on a socket without switching it to non-blocking mode.
+
+    :param sock: Connected blocking socket
+    :param timeout: Timeout in seconds (0 disables the timeout)
+    """
+    value = _socket_timeout_option(timeout)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, value)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, value)
+
+
+def _clear_io_timeout(conn: Connection) -> None:
+    """
+    Remove the handshake I/O timeout from an established connection.
+
+    :param conn: Connection opened by _open_connection
+    """
+    sock = socket.socket(fileno=conn.fileno())
+    try:
+        _set_io_timeout(sock, 0)
+    finally:
+        sock.detach()
+
+
+def _open_connection(host: str, port: int, authkey: bytes, timeout: float) -> Connection:
+    """
+    Connect and authenticate to a server, failing instead of hanging on an unresponsive peer.
+
+    :param host: Server host
+    :param port: Server port
+    :param authkey: Shared authentication key
+    :param timeout: Seconds allowed for the connect and the authentication handshake
+    :returns: Authenticated connection (still carrying the I/O timeout)
+    """
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        # Connection needs a blocking descriptor; keep the bound via kernel-level timeouts
+        sock.settimeout(None)
+        _set_io_timeout(sock, timeout)
+        conn = Connection(sock.detach())
+    finally:
+        sock.close()
+    try:
+        answer_challenge(conn, authkey)
+        deliver_challenge(conn, authkey)
+    except BaseException:
+        conn.close()
+        raise
+    return conn
+
+
+class ModelServer:
+    """
+    Serves text and image embedding requests from models loaded once at startup.
+
+    Uses dependency injection for the embedders; connection details are written
+    to a state file so clients can discover the running server.
+    """
+
+    def __init__(
+        self,
+        text_embedder: Any,
+        image_embedder: Optional[Any] = None,
+        state_path: Optional[Path] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize model server with loaded embedders.
+
+        :param text_embedder: Text embedder to serve (must not be None)
+        :param image_embedder: Image embedder to serve (optional)
+        :param state_path: Path of the discovery file (defaults to ~/.cache/filex/model_server.json)
+        :param host: Host to bind to (localhost only by default)
+        :param port: Port to bind to (0 picks a free port)
+        """
+        self.logger = get_logger(__name__)
+
+        if text_embedder is None:
+            self.logger.error("text_embedder cannot be None")
+            raise ValueError("text_embedder cannot be None")
+
+        self.text_embedder = text_embedder
+        self.image_embedder = image_embedder
+        self.state_path = Path(state_path) if state_path else DEFAULT_STATE_PATH
+        self._authkey = secrets.token_bytes(32)
+        # Raw listening socket: connections authenticate on their own thread, so a slow
+        # client cannot hold up the accept loop
+        self._socket = socket.create_server((host, port))
+        # Torch models are not guaranteed to be thread-safe; serialize forward passes
+        self._model_lock = threading.Lock()
+        self.logger.info(f"ModelServer listening on {self.address}")
+
+    @property
+    def address(self) -> tuple:
+        """
+        Get the (host, port) the server listens on.
+
+        :returns: Tuple of (host, port)
+        """
+        return self._socket.getsockname()[:2]
+
+    def _write_state(self) -> None:
+        """
+        Write connection details to the state file (readable by the current user only).
+        """
+        host, port = self.address
+        state = {
+            "host": host,
+            "port": port,
+            "authkey": self._authkey.hex(),
+            "pid": os.getpid(),
+            "text_model": getattr(self.text_embedder, "model_name", None),
+            "image_model": getattr(self.image_embedder, "model_name", None),
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+
+    def _handle_request(self, request: Dict[str, Any]) -> Any:
+        """
+        Dispatch a single request to the matching embedder method.
+
+        :param request: Request dictionary with an "op" key
+        :returns: Result of the embedder call
+        :raises ValueError: If the operation is unknown or unavailable
+        """
+        op = request.get("op")
+        if op == "info":
+            return {
+                "text_model": getattr(self.text_embedder, "model_name", None),
+                "text_precision": getattr(self.text_embedder, "precision", None),
+                "text_backend": getattr(self.text_embedder, "backend", None),
+                "image_model": getattr(self.image_embedder, "model_name", None),
+            }
+
+        with self._model_lock:
+            if op == "embed":
+                return self.text_embedder.embed(request["text"])
+            if op == "embed_batch":
+                return self.text_embedder.embed_batch(request["texts"])
+
+            if self.image_embedder is None:
+                raise ValueError(f"Image embedder not available for operation: {op}")
+            if op == "image_embed":
+                return self.image_embedder.embed(request["path"])
+            if op == "image_embed_batch":
+                return self.image_embedder.embed_batch(request["paths"])
+            if op == "image_embed_text":
+                return self.image_embedder.embed_text(request["text"])
+
+        raise ValueError(f"Unknown operation: {op}")
+
+    def _authenticate(self, sock: socket.socket) -> Optional[Connection]:
+        """
+        Run the authentication handshake on an accepted socket within CONNECT_TIMEOUT_SECONDS.
+
+        :param sock: Accepted client socket
+        :returns: Authenticated connection, or None if the client failed or timed out
+        """
+        try:
+            _set_io_timeout(sock, CONNECT_TIMEOUT_SECONDS)
+            conn = Connection(sock.detach())
+        except OSError as e:
+            self.logger.warning(f"Rejected connection: {e}")
+            sock.close()
+            return None
+        try:
+            deliver_challenge(conn, self._authkey)
+            answer_challenge(conn, self._authkey)
+            _clear_io_timeout(conn)
+        except Exception as e:
+            self.logger.warning(f"Rejected connection: {e}")
+            conn.close()
+            return None
+        return conn
+
+    def _serve_connection(self, sock: socket.socket) -> None:
+        """
+        Authenticate one client connection and serve its requests until it is closed.
+
+        :param sock: Accepted client socket
+        """
+        conn = self._authenticate(sock)
+        if conn is None:
+            return
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    conn.send({"ok": True, "result": self._handle_request(request)})
+                except Exception as e:
+                    self.logger.error(f"Request failed: {e}", exc_info=True)
+                    conn.send({"ok": False, "error": str(e)})
+
+    def serve_forever(self) -> None:
+        """
+        Accept client connections until interrupted, one thread per connection.
+        """
+        self._write_state()
+        self.logger.info(f"ModelServer ready (state file: {self.state_path})")
+        try:
+            while True:
+                try:
+                    sock, _ = self._socket.accept()
+                except OSError as e:
+                    self.logger.warning(f"Failed to accept connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(sock,), daemon=True).start()
+        finally:
+            self._socket.close()
+            try:
+                self.state_path.unlink()
+            except OSError:
+                pass
+
+
+class ModelClient:
+    """
+    Client for a running ModelServer.
+    """
+
+    def __init__(self, conn: Connection, info: Dict[str, Any]):
+        """
+        Initialize client over an established connection.
+
+        :param conn: Authenticated connection to the server
+        :param info: Server info (loaded model names, text model precision and backend)
+        """
+        self._conn = conn
+        self._lock = threading.Lock()
+        self.text_model: Optional[str] = info.get("text_model")
+        self.text_precision: Optional[str] = info.get("text_precision")
+        self.text_backend: Optional[str] = info.get("text_backend")
+        self.image_model: Optional[str] = info.get("image_model")
+
+    @classmethod
+    def connect(cls, state_path: Optional[Path] = None) -> Optional["ModelClient"]:
+        """
+        Connect to a running server if one is advertised in the state file.
+
+        :param state_path: Path of the discovery file (defaults to ~/.cache/filex/model_server.json)
+        :returns: Connected ModelClient, or None if no server is reachable
+        """
+        logger = get_logger(__name__)
+        state_path = Path(state_path) if state_path else DEFAULT_STATE_PATH
+
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            host, port = state["host"], state["port"]
+            authkey = bytes.fromhex(state["authkey"])
+        except FileNotFoundError:
+            logger.debug("No model server available: no state file")
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Unreadable model server state file: {e}")
+            cls._discard_state(state_path)
+            return None
+
+        try:
+            conn = _open_connection(host, port, authkey, CONNECT_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.debug(f"No model server available: {e}")
+            cls._discard_if_stale(state_path, state, e)
+            return None
+
+        client = cls(conn, {})
+        try:
+            info = client.call("info")
+        except Exception as e:
+            logger.debug(f"Model server did not respond: {e}")
+            conn.close()
+            cls._discard_if_stale(state_path, state, e)
+            return None
+        # Embedding calls can legitimately run for a long time once connected
+        _clear_io_timeout(conn)
+        client.text_model = info.get("text_model")
+        client.text_precision = info.get("text_precision")
+        client.text_backend = info.get("text_backend")
+        client.image_model = info.get("image_model")
+        logger.info(f"Connected to model server (text: {client.text_model}, image: {client.image_model})")
+        return client
+
+    @classmethod
+    def is_advertised(cls, state_path: Optional[Path] = None) -> bool:
+        """
+        Check whether a state file advertises a server whose process is still alive.
+
+        A busy server can fail connect() while still running; starting another one
+        would load the models a second time.
+
+        :param state_path: Path of the discovery file (defaults to ~/.cache/filex/model_server.json)
+        :returns: True if a live server is advertised
+        """
+        state_path = Path(state_path) if state_path else DEFAULT_STATE_PATH
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return isinstance(state, dict) and _pid_alive(state.get("pid"))
+
+    @classmethod
+    def _discard_if_stale(cls, state_path: Path, state: Dict[str, Any], error: BaseException) -> None:
+        """
+        Delete the state file after a failed connect only if the server is gone.
+
+        Nothing listening at the address (ECONNREFUSED/ENOENT) or a dead process means
+        the file is stale. Timeouts and other errors may come from a live server that
+        is busy, so the file is kept for the clients it can still serve.
+
+        :param state_path: Path of the discovery file
+        :param state: Parsed state file contents
+        :param error: Exception raised by the connect attempt
+        """
+        no_listener = isinstance(error, OSError) and error.errno in _NO_LISTENER_ERRNOS
+        if no_listener or not _pid_alive(state.get("pid")):
+            cls._discard_state(state_path)
+
+    @staticmethod
+    def _discard_state(state_path: Path) -> None:
+        """
+        Delete a state file that no longer points at a usable server.
+
+        :param state_path: Path of the discovery file
+        """
+        try:
+            state_path.unlink()
+        except OSError:
+            pass
+
+    def call(self, op: str, **kwargs: Any) -> Any:
+        """
+        Send one request and wait for its result.
+
+        :param op: Operation name
+        :param kwargs: Operation arguments
+        :returns: Operation result
+        :raises RuntimeError: If the server reports an error
+        """
+        with self._lock:
+            self._conn.send({"op": op, **kwargs})
+            response = self._conn.recv()
+        if not response.get("ok"):
+            raise RuntimeError(f"Model server error: {response.get('error')}")
+        return response["result"]
+
+    def close(self) -> None:
+        """Close the connection to the server."""
+        self._conn.close()
+
+
+class RemoteEmbedder:
+    """
+    Embedder implementation that forwards requests to a ModelServer.
+
+    Satisfies the Embedder protocol so it can be injected into TextEmbeddingHandler.
+    """
+
+    def __init__(self, client: ModelClient):
+        """
+        :param client: Connected ModelClient (must not be None)
+        """
+        if client is None:
+            raise ValueError("client cannot be None")
+        self.client = client
+        self.model_name = client.text_model
+        # Reported so chunk cache keys match those of the same model loaded in-process
+        self.precision = client.text_precision
+        self.backend = client.text_backend
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Generate embedding vector for a single text string.
+
+        :param text: The text to embed (must not be empty)
+        :returns: A 1D numpy array representing the embedding vector
+        :raises ValueError: If text is empty
+        """
+        if not text:
+            raise ValueError("text cannot be empty")
+        return self.client.call("embed", text=text)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embedding vectors for multiple texts.
+
+        :param texts: List of texts to embed (must not be empty)
+        :returns: A 2D numpy array where each row is an embedding vector
+        :raises ValueError: If texts list is empty
+        """
+        if not texts:
+            raise ValueError("texts list cannot be empty")
+        return self.client.call("embed_batch", texts=texts)
+
+
+class RemoteImageEmbedder:
+    """
+    Image embedder implementation that forwards requests to a ModelServer.
+
+    Mirrors the CLIPImageEmbedder methods used by ImageFileHandler and search.
+    """
+
+    def __init__(self, client: ModelClient):
+        """
+        :param client: Connected ModelClient with an image model loaded (must not be None)
+        """
+        if client is None:
+            raise ValueError("client cannot be None")
+        self.client = client
+        self.model_name = client.image_model
+
+    def embed(self, image_path: str) -> np.ndarray:
+        """
+        Generate embedding vector for a single image.
+
+        :param image_path: Path to the image file (must be readable by the server)
+        :returns: A 1D numpy array representing the image embedding vector
+        """
+        if not image_path:
+            raise ValueError("image_path cannot be empty")
+        return self.client.call("image_embed", path=str(Path(image_path).resolve()))
+
+    def embed_batch(self, image_paths: List[str]) -> np.ndarray:
+        """
+        Generate embedding vectors for multiple images.
+
+        :param image_paths: List of image file paths (must not be empty)
+        :returns: A 2D numpy array where each row is an embedding vector
+        """
+        if not image_paths:
+            raise ValueError("image_paths list cannot be empty")
+        paths = [str(Path(p).resolve()) for p in image_paths]
+        return self.client.call("image_embed_batch", paths=paths)
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Generate embedding vector for text using the image model's text encoder.
+
+        :param text: Text string to embed (must not be empty)
+        :returns: A 1D numpy array in the same space as image embeddings
+        """
+        if not text:
+            raise ValueError("text cannot be empty")
+        return self.client.call("image_embed_text", text=text)
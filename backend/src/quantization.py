@@ -0,0 +1,88 @@
+"""
+Scalar and binary quantization helpers for compact embedding storage.
+"""
+from typing import Tuple
+import numpy as np
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of a 2D embeddings array.
+
+    Row norms come from one einsum pass (a dot product per row) rather than
+    np.linalg.norm, which materializes the squared matrix first.
+
+    :param embeddings: 2D array of embeddings
+    :returns: float32 array of unit-length rows (all-zero rows stay zero)
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings))[:, None]
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize embeddings to int8 with a symmetric per-row scale.
+
+    :param embeddings: 2D array of embeddings
+    :returns: Tuple of (int8 codes, float32 scales) where codes * scales[:, None]
+        approximates the input
+    :postcondition: codes.shape == embeddings.shape and scales.shape == (embeddings.shape[0],)
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    safe_scales = np.where(scales > 0, scales, 1.0)
+    codes = np.clip(np.rint(embeddings / safe_scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """
+    Reconstruct float32 embeddings from int8 codes and per-row scales.
+
+    :param codes: 2D int8 array produced by quantize_int8
+    :param scales: Per-row scales produced by quantize_int8
+    :returns: float32 array with the same shape as codes
+    """
+    return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+
+
+# Set bits per byte value, for numpy versions without np.bitwise_count
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def binarize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Pack the sign bits of embeddings, one bit per dimension.
+
+    :param embeddings: 2D array of embeddings
+    :returns: uint8 array of shape (rows, ceil(dimension / 8)) with a bit set per
+        positive component
+    """
+    return np.packbits(np.asarray(embeddings) > 0, axis=1)
+
+
+def unbinarize(bits: np.ndarray, dimension: int) -> np.ndarray:
+    """
+    Reconstruct unit-length float32 embeddings from packed sign bits.
+
+    :param bits: uint8 array produced by binarize
+    :param dimension: Number of dimensions of the original embeddings
+    :returns: float32 array of shape (rows, dimension) with entries +-1/sqrt(dimension)
+    """
+    signs = np.unpackbits(bits, axis=1, count=dimension).astype(np.float32) * 2.0 - 1.0
+    return signs / np.sqrt(dimension, dtype=np.float32)
+
+
+def hamming_distances(bits: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """
+    Count differing bits between each packed row and a packed query.
+
+    :param bits: 2D uint8 array of packed rows
+    :param query_bits: 1D uint8 array of the packed query
+    :returns: 1D int array of Hamming distances, one per row
+    """
+    differing = np.bitwise_xor(bits, query_bits)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(differing).sum(axis=1, dtype=np.int32)
+    return _POPCOUNT_TABLE[differing].sum(axis=1, dtype=np.int32)
@@ -0,0 +1,126 @@
+"""
+On-disk cache of search query embeddings.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from .logger import get_logger
+
+DEFAULT_QUERY_CACHE_DIR = Path.home() / ".cache" / "filex" / "query_cache"
+
+
+class QueryEmbeddingCache:
+    """
+    Stores one embedding per (model, precision, backend, query text) as a small .npy file.
+
+    Lets repeated searches skip loading the embedding models. Entries are evicted
+    least-recently-used first (by file modification time, refreshed on every hit)
+    once more than max_entries are stored.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_entries: int = 256):
+        """
+        Initialize the query cache.
+
+        :param cache_dir: Directory holding cached embeddings (defaults to ~/.cache/filex/query_cache)
+        :param max_entries: Maximum number of cached embeddings (must be > 0)
+        """
+        self.logger = get_logger(__name__)
+
+        if max_entries <= 0:
+            self.logger.error(f"max_entries must be positive, got: {max_entries}")
+            raise ValueError("max_entries must be positive")
+
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_QUERY_CACHE_DIR
+        self.max_entries = max_entries
+
+    def _get_path(self, model_name: str, query: str, precision: str = "", backend: str = "") -> Path:
+        """
+        Get the cache file path for a query embedded by a model.
+
+        Keyed like ChunkEmbeddingCache.make_key: the same model gives slightly
+        different vectors at another precision or on another backend.
+
+        :param model_name: Name of the embedding model
+        :param query: Query text
+        :param precision: Forward-pass precision of the model (e.g. "fp16")
+        :param backend: Inference backend of the model (e.g. "onnx")
+        :returns: Path of the cached .npy file
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (model_name, precision, backend):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(query.encode("utf-8", "surrogatepass"))
+        return self.cache_dir / f"{digest.hexdigest()}.npy"
+
+    def get(self, model_name: str, query: str, precision: str = "", backend: str = "") -> Optional[np.ndarray]:
+        """
+        Look up a cached query embedding.
+
+        :param model_name: Name of the embedding model
+        :param query: Query text
+        :param precision: Forward-pass precision of the model
+        :param backend: Inference backend of the model
+        :returns: Cached 1D embedding, or None on a miss
+        """
+        path = self._get_path(model_name, query, precision, backend)
+        try:
+            embedding = np.load(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        self.logger.debug(f"Query cache hit: {model_name} / {query!r}")
+        return embedding
+
+    def put(
+        self,
+        model_name: str,
+        query: str,
+        embedding: np.ndarray,
+        precision: str = "",
+        backend: str = "",
+    ) -> None:
+        """
+        Store a query embedding and evict the oldest entries beyond max_entries.
+
+        :param model_name: Name of the embedding model
+        :param query: Query text
+        :param embedding: 1D query embedding
+        :param precision: Forward-pass precision of the model
+        :param backend: Inference backend of the model
+        """
+        path = self._get_path(model_name, query, precision, backend)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(embedding).reshape(-1))
+            tmp_path.replace(path)
+            self._evict()
+        except OSError as e:
+            self.logger.warning(f"Could not write query cache entry: {e}")
+
+    def _evict(self) -> None:
+        """
+        Delete least-recently-used entries until at most max_entries remain.
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                # Evicted by another process since the directory was listed
+                continue
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
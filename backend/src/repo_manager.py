@@ -2,16 +2,21 @@
 Repository manager that coordinates indexing and file tracking.
 """
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Deque, FrozenSet, Iterator, Tuple
 import numpy as np
 from tqdm import tqdm
 
-from .repository import Repository
+from .repository import Repository, resolve_path
 from .index_manager import IndexManager, FileIndexEntry
 from .storage_manager import StorageManager
 from .search_manager import SearchManager
+from .file_metadata import FileMetadata
 from .file_processor import FileProcessorRouter
+from .file_extractors import extract_and_chunk, prefetch_file
+from .quantization import normalize_rows, quantize_int8
 from .logger import get_logger
 
 
@@ -23,12 +28,35 @@ class RepositoryManager:
     Similar to git, provides commands for indexing and reindexing files.
     """
     
+    # Directory indexing extracts and chunks text files in worker processes when at
+    # least this many need indexing (below that, pool startup costs more than it saves)
+    PREFETCH_MIN_FILES = 8
+    # Files extracted ahead of the embedder per worker (bounds memory held in chunks)
+    PREFETCH_FILES_PER_WORKER = 4
+    # Prefetched text chunks embedded together in one embedder call during directory indexing
+    EMBED_BATCH_CHUNKS = 512
+    # Threads collecting metadata and checking for changes before directory indexing
+    # (stat and index lookups are latency-bound, especially on network filesystems)
+    CHANGE_CHECK_WORKERS = 32
+    # Embedded files that may wait for the writer thread during directory indexing
+    # before embedding pauses (bounds memory held in unrecorded embeddings)
+    FINALIZE_QUEUE_FILES = 64
+    # Directory indexing progress is redrawn at most every PROGRESS_MINITERS files and
+    # PROGRESS_MININTERVAL seconds (repainting per file dominates with many small files)
+    PROGRESS_MINITERS = 50
+    PROGRESS_MININTERVAL = 0.5
+    # Extensions whose embeddings go to the image search index
+    IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+    
     def __init__(
         self,
         start_path: Optional[str] = None,
         processor: Optional[FileProcessorRouter] = None,
         create: bool = True,
         exact_location: bool = False,
+        embedding_dtype: Optional[str] = None,
+        keep_file_embeddings: Optional[bool] = None,
+        model_name: Optional[str] = None,
     ):
         """
         Initialize repository manager.
@@ -37,13 +65,31 @@ class RepositoryManager:
         :param processor: FileProcessorRouter instance (optional)
         :param create: Whether to create repository if not found
         :param exact_location: If True, create repository at exact start_path location, don't walk up tree
+        :param embedding_dtype: Embedding storage format for stored and search embeddings
+            ("float32", "float16", "int8" or "binary"; defaults to the format of the
+            existing search index, else "float32")
+        :param keep_file_embeddings: Also store a per-file copy of each file's embeddings
+            (see StorageManager, which defaults it from the environment); search only
+            reads the shared search index
+        :param model_name: Text embedding model, recorded with the search index (optional)
+        :raises ValueError: If the existing search index was built with another
+            embedding dtype or model
         """
         self.logger = get_logger(__name__)
         
         self.repository = Repository(start_path=start_path, create=create, exact_location=exact_location)
         self.index_manager = IndexManager(self.repository)
-        self.storage_manager = StorageManager(self.repository)
-        self.search_manager = SearchManager(self.repository)
+        self.search_manager = SearchManager(
+            self.repository, embedding_dtype=embedding_dtype, model_name=model_name
+        )
+        self.storage_manager = StorageManager(
+            self.repository,
+            embedding_dtype=self.search_manager.embedding_dtype,
+            keep_file_embeddings=keep_file_embeddings,
+        )
+        # Buffered index entries are written only once their search rows are saved,
+        # so a crash cannot leave files recorded as indexed but missing from search
+        self.search_manager.add_commit_hook(self.index_manager.flush)
         self.processor = processor
         
         self.logger.info("RepositoryManager initialized")
@@ -61,44 +107,124 @@ class RepositoryManager:
         self.processor = processor
         self.logger.info("File processor router updated")
     
-    def index_file(self, file_path: str, force: bool = False) -> Dict[str, Any]:
+    def index_file(
+        self,
+        file_path: str,
+        force: bool = False,
+        chunks: Optional[List[str]] = None,
+        metadata: Optional[FileMetadata] = None,
+    ) -> Dict[str, Any]:
         """
         Index a single file.
         
         :param file_path: Path to file to index
         :param force: Force reindexing even if file hasn't changed
+        :param chunks: Text chunks already extracted from the file (optional)
+        :param metadata: Metadata already collected for the file (optional, saves a stat)
         :returns: Dictionary with indexing result
         """
         if self.processor is None:
             raise ValueError("FileProcessorRouter not set. Call set_processor() first.")
         
-        file_path = Path(file_path).resolve()
+        if not force and metadata is None:
+            unchanged = self._check_unchanged_stat(file_path)
+            if unchanged is not None:
+                return unchanged
         
-        if not file_path.exists():
-            self.logger.error(f"File not found: {file_path}")
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        if not self.repository.is_path_in_repo(str(file_path)):
-            self.logger.warning(f"File outside repository: {file_path}")
-        
-        from .file_metadata import FileMetadata
-        metadata = FileMetadata.from_path(str(file_path))
+        file_path, metadata = self._prepare(file_path, metadata)
         
         if not force and not self.index_manager.has_changed(metadata):
-            self.logger.info(f"File unchanged, skipping: {metadata.file_name}")
-            entry = self.index_manager.get_index_entry(str(file_path))
-            return {
-                "file_path": str(file_path),
-                "indexed": False,
-                "reason": "File has not changed since last indexing",
-                "entry": entry.to_dict() if entry else None,
-            }
+            return self._unchanged_result(
+                file_path, self.index_manager.get_index_entry(str(file_path))
+            )
         
         self.logger.info(f"Indexing file: {metadata.file_name}")
         
-        result = self.processor.process_file(str(file_path))
+        result = self.processor.process_file_with_metadata(metadata, chunks=chunks)
+        return self._finalize(file_path, metadata, result)
+    
+    def _check_unchanged_stat(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Skip an indexed file whose stat fingerprint still matches, using one stat call.
         
-        file_hash = IndexManager.compute_file_hash(str(file_path))
+        Runs before metadata is collected, so an unchanged file costs a stat and an
+        index lookup.
+        
+        :param file_path: Path to file to index
+        :returns: Skipped-file result if the file is unchanged, None if it must be
+            checked further (including when it cannot be stat'ed)
+        """
+        resolved = Path(resolve_path(file_path))
+        try:
+            stat = os.stat(resolved)
+        except OSError:
+            return None
+        
+        entry = self.index_manager.get_index_entry(str(resolved))
+        if entry is None or entry.stat_fingerprint != IndexManager.stat_result_fingerprint(stat):
+            return None
+        return self._unchanged_result(resolved, entry)
+    
+    def _unchanged_result(self, file_path: Path, entry: Optional[FileIndexEntry]) -> Dict[str, Any]:
+        """
+        Build the indexing result of a file skipped because it has not changed.
+        
+        :param file_path: Resolved path of the file
+        :param entry: Index entry of the file (optional)
+        :returns: Dictionary with indexing result
+        """
+        self.logger.info(f"File unchanged, skipping: {file_path.name}")
+        return {
+            "file_path": str(file_path),
+            "indexed": False,
+            "reason": "File has not changed since last indexing",
+            "entry": entry.to_dict() if entry else None,
+        }
+    
+    def _prepare(
+        self,
+        file_path: str,
+        metadata: Optional[FileMetadata] = None,
+    ) -> Tuple[Path, FileMetadata]:
+        """
+        Resolve a file to index and collect its metadata.
+        
+        :param file_path: Path to file to index
+        :param metadata: Metadata already collected for the file (optional); its
+            resolved path is used as is
+        :returns: Tuple of (resolved path, file metadata)
+        :raises FileNotFoundError: If the file does not exist
+        """
+        if metadata is not None:
+            file_path = Path(metadata.file_path)
+            if not self.repository.is_path_in_repo(str(file_path)):
+                self.logger.warning(f"File outside repository: {file_path}")
+            return file_path, metadata
+        
+        file_path = Path(resolve_path(file_path))
+        # Raises FileNotFoundError for missing files; no separate existence check
+        metadata = FileMetadata.from_path(str(file_path))
+        
+        if not self.repository.is_path_in_repo(str(file_path)):
+            self.logger.warning(f"File outside repository: {file_path}")
+        
+        return file_path, metadata
+    
+    def _finalize(
+        self,
+        file_path: Path,
+        metadata: FileMetadata,
+        result: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Record a processed file in storage, the search index and then the index.
+        
+        :param file_path: Resolved path of the file
+        :param metadata: Metadata of the file, collected before processing
+        :param result: Processing result from the file processor
+        :returns: Dictionary with indexing result
+        """
+        file_hash = self.index_manager.file_hash(metadata)
         
         num_chunks = None
         embedding_dimension = None
@@ -106,13 +232,6 @@ class RepositoryManager:
             num_chunks = result["embeddings"].get("num_chunks")
             embedding_dimension = result["embeddings"].get("embedding_dimension")
         
-        self.index_manager.add_entry(
-            metadata=metadata,
-            file_hash=file_hash,
-            num_chunks=num_chunks,
-            embedding_dimension=embedding_dimension,
-        )
-        
         if result.get("processed", False):
             embeddings = None
             chunks = None
@@ -120,17 +239,23 @@ class RepositoryManager:
                 embeddings = result["embeddings"].get("embeddings")
                 chunks = result["embeddings"].get("chunks")
             
+            scales = None
+            if isinstance(embeddings, np.ndarray) and self.storage_manager.embedding_dtype == "int8":
+                # Quantize once for both the stored copy and the search index
+                embeddings, scales = quantize_int8(normalize_rows(np.atleast_2d(embeddings)))
+            
             if embeddings is not None:
                 self.storage_manager.save_processing_result(
                     str(file_path),
                     result,
                     embeddings=embeddings,
+                    scales=scales,
                 )
                 
                 if chunks is not None and isinstance(chunks, list) and len(chunks) > 0:
                     if isinstance(embeddings, np.ndarray):
                         file_ext = Path(file_path).suffix.lower()
-                        is_image_file = file_ext in {'.png', '.jpg', '.jpeg'}
+                        is_image_file = file_ext in self.IMAGE_EXTENSIONS
                         
                         self.logger.info(
                             f"Adding {len(chunks)} chunks to {'image' if is_image_file else 'text'} search index for: {Path(file_path).name}"
@@ -141,6 +266,7 @@ class RepositoryManager:
                                 chunks,
                                 embeddings,
                                 is_image=is_image_file,
+                                scales=scales,
                             )
                         except Exception as e:
                             self.logger.error(
@@ -159,6 +285,14 @@ class RepositoryManager:
                             f"chunks type: {type(chunks)}, chunks value: {chunks}"
                         )
         
+        # Recorded last: an entry means the file's search rows are already added
+        self.index_manager.add_entry(
+            metadata=metadata,
+            file_hash=file_hash,
+            num_chunks=num_chunks,
+            embedding_dimension=embedding_dimension,
+        )
+        
         return {
             "file_path": str(file_path),
             "indexed": True,
@@ -174,14 +308,19 @@ class RepositoryManager:
         recursive: bool = True,
         extensions: Optional[List[str]] = None,
         force: bool = False,
+        workers: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Index all files in a directory.
         
+        Text extraction and chunking run in a process pool ahead of the embedder,
+        which stays in this process and embeds the chunks of several files at once.
+        
         :param directory: Directory to index (defaults to repository root)
         :param recursive: Whether to recursively index subdirectories
         :param extensions: List of extensions to include (None = all)
         :param force: Force reindexing even if files haven't changed
+        :param workers: Number of extraction processes (None = CPU count, 1 = no pool)
         :returns: Dictionary with indexing statistics
         """
         if directory is None:
@@ -197,24 +336,11 @@ class RepositoryManager:
         
         self.logger.info(f"Indexing directory: {directory} (recursive: {recursive})")
         
-        files_to_index = []
-        
-        if recursive:
-            for file_path in directory.rglob("*"):
-                if file_path.is_file():
-                    if ".filex" in file_path.parts:
-                        continue
-                    if extensions is None or file_path.suffix.lower() in [e.lower() for e in extensions]:
-                        files_to_index.append(file_path)
-        else:
-            for file_path in directory.iterdir():
-                if file_path.is_file():
-                    if ".filex" in file_path.parts:
-                        continue
-                    if extensions is None or file_path.suffix.lower() in [e.lower() for e in extensions]:
-                        files_to_index.append(file_path)
-        
-        files_to_index = sorted(set(files_to_index), key=str)
+        extension_set = frozenset(e.lower() for e in extensions) if extensions is not None else None
+        files_to_index = sorted(
+            (Path(path) for path in self._walk_files(str(directory), recursive, extension_set)),
+            key=str,
+        )
         
         self.logger.info(f"Found {len(files_to_index)} file(s) to index")
         
@@ -223,25 +349,55 @@ class RepositoryManager:
         error_count = 0
         errors = []
         
-        with tqdm(total=len(files_to_index), desc="Indexing files", unit="file") as pbar:
-            for file_path in files_to_index:
-                try:
-                    pbar.set_description(f"Indexing: {file_path.name}")
-                    result = self.index_file(str(file_path), force=force)
-                    if result.get("indexed"):
-                        indexed_count += 1
-                        pbar.set_postfix({"indexed": indexed_count, "skipped": skipped_count})
-                    else:
-                        skipped_count += 1
-                        pbar.set_postfix({"indexed": indexed_count, "skipped": skipped_count})
-                except Exception as e:
+        # Metadata collected for the change check is reused when the file is indexed
+        metadatas: Dict[Path, FileMetadata] = {}
+        files_to_process = []
+        check_workers = min(self.CHANGE_CHECK_WORKERS, len(files_to_index))
+        if check_workers > 1:
+            with ThreadPoolExecutor(max_workers=check_workers) as pool:
+                checks = list(pool.map(lambda p: self._check_file(p, force), files_to_index))
+        else:
+            checks = [self._check_file(file_path, force) for file_path in files_to_index]
+        for file_path, (metadata, needs_indexing) in zip(files_to_index, checks):
+            if needs_indexing:
+                files_to_process.append(file_path)
+                if metadata is not None:
+                    metadatas[file_path] = metadata
+        skipped_count = len(files_to_index) - len(files_to_process)
+        if skipped_count:
+            self.logger.info(f"{skipped_count} file(s) unchanged, skipping")
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        with tqdm(
+            total=len(files_to_index),
+            initial=skipped_count,
+            desc="Indexing files",
+            unit="file",
+            miniters=self.PROGRESS_MINITERS,
+            mininterval=self.PROGRESS_MININTERVAL,
+        ) as pbar, self.index_manager.bulk(deferred=True), self.search_manager.bulk():
+            for done, (file_path, result, error) in enumerate(
+                self._iter_indexed(files_to_process, workers, metadatas), start=1
+            ):
+                if error is not None:
                     error_count += 1
-                    error_msg = f"{file_path}: {str(e)}"
+                    error_msg = f"{file_path}: {str(error)}"
                     errors.append(error_msg)
-                    self.logger.error(f"Error indexing {file_path}: {e}", exc_info=True)
-                    pbar.set_postfix({"indexed": indexed_count, "errors": error_count})
-                finally:
-                    pbar.update(1)
+                    self.logger.error(f"Error indexing {file_path}: {error}", exc_info=error)
+                elif result.get("indexed"):
+                    indexed_count += 1
+                else:
+                    skipped_count += 1
+                if done % self.PROGRESS_MINITERS == 0 or done == len(files_to_process):
+                    pbar.set_postfix(
+                        {"indexed": indexed_count, "skipped": skipped_count, "errors": error_count},
+                        refresh=False,
+                    )
+                pbar.update(1)
+        
+        self.search_manager.build_ann_index()
         
         stats = {
             "total_files": len(files_to_index),
@@ -258,6 +414,296 @@ class RepositoryManager:
         
         return stats
     
+    def _walk_files(
+        self,
+        directory: str,
+        recursive: bool,
+        extensions: Optional[FrozenSet[str]],
+    ) -> Iterator[str]:
+        """
+        Yield paths of files under a directory, skipping .filex directories.
+        
+        Uses os.scandir, whose entries carry the file type from the directory listing,
+        so most entries need no extra stat call. Symlinks to files are included;
+        symlinked directories are not descended into.
+        
+        :param directory: Directory to walk
+        :param recursive: Whether to descend into subdirectories
+        :param extensions: Lowercase extensions to include (None = all)
+        :returns: Iterator of file paths
+        """
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError as e:
+            self.logger.warning(f"Cannot read directory {directory}: {e}")
+            return
+        
+        for entry in entries:
+            if entry.name == ".filex":
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        yield from self._walk_files(entry.path, recursive, extensions)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                yield entry.path
+    
+    def _check_file(self, file_path: Path, force: bool) -> Tuple[Optional[FileMetadata], bool]:
+        """
+        Collect a file's metadata and check whether it is new or changed.
+        
+        Safe to call from several threads (each index lookup uses its own connection).
+        
+        :param file_path: Path of the file
+        :param force: Treat the file as changed without checking
+        :returns: Tuple of (file metadata, or None if it cannot be read, and whether the
+            file should be indexed); unreadable files are indexed anyway, so the error
+            is reported by index_file
+        """
+        try:
+            metadata = FileMetadata.from_path(str(file_path))
+        except OSError:
+            return None, True
+        return metadata, force or self.index_manager.has_changed(metadata)
+    
+    def _iter_indexed(
+        self,
+        file_paths: List[Path],
+        workers: int,
+        metadatas: Dict[Path, FileMetadata],
+    ) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Index files in a three-stage pipeline: extract, embed, then record.
+        
+        Worker processes extract and chunk text files ahead of the embedder (see
+        _iter_prefetched_chunks). Files with prefetched chunks are buffered until they
+        hold EMBED_BATCH_CHUNKS chunks and then embedded with one embedder call on this
+        thread. Image files are likewise buffered and embedded by the image handler
+        in batches of its batch_size. Hashing, the index entry, storage and the search
+        index update run on a single writer thread, so they overlap with embedding the
+        next batch. Other files are indexed whole on the writer thread with
+        index_file. At most FINALIZE_QUEUE_FILES files wait for the writer before
+        embedding pauses.
+        
+        :param file_paths: Files to index, in processing order
+        :param workers: Number of extraction processes
+        :param metadatas: Metadata already collected per file (files without an entry
+            collect it when indexed)
+        :returns: Iterator of (file path, indexing result, error) in processing order,
+            where exactly one of result and error is None
+        """
+        pending: Deque[Tuple[Path, Future]] = deque()
+        batch: List[Tuple[Path, List[str], Optional[FileMetadata]]] = []
+        batch_chunks = 0
+        image_handler = self.processor.image_handler if self.processor is not None else None
+        image_batch: List[Tuple[Path, Optional[FileMetadata]]] = []
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="filex-writer")
+        try:
+            for file_path, chunks in self._iter_prefetched_chunks(file_paths, workers):
+                if chunks is None and image_handler is not None and (
+                    file_path.suffix.lower() in image_handler.supported_extensions
+                ):
+                    image_batch.append((file_path, metadatas.get(file_path)))
+                    if len(image_batch) >= image_handler.batch_size:
+                        pending.extend(self._index_image_batch(image_batch, writer))
+                        image_batch = []
+                elif chunks is None:
+                    pending.append((file_path, writer.submit(
+                        self.index_file, str(file_path), force=True, metadata=metadatas.get(file_path)
+                    )))
+                else:
+                    batch.append((file_path, chunks, metadatas.get(file_path)))
+                    batch_chunks += len(chunks)
+                    if batch_chunks >= self.EMBED_BATCH_CHUNKS:
+                        pending.extend(self._index_chunked_batch(batch, writer))
+                        batch = []
+                        batch_chunks = 0
+                yield from self._drain_indexed(pending, self.FINALIZE_QUEUE_FILES)
+            
+            if batch:
+                pending.extend(self._index_chunked_batch(batch, writer))
+            if image_batch:
+                pending.extend(self._index_image_batch(image_batch, writer))
+            yield from self._drain_indexed(pending, 0)
+        finally:
+            writer.shutdown(wait=True, cancel_futures=True)
+    
+    @staticmethod
+    def _drain_indexed(
+        pending: Deque[Tuple[Path, Future]],
+        limit: int,
+    ) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Yield results of queued files in order.
+        
+        Finished files at the head of the queue are always yielded; unfinished ones
+        are waited for until at most limit files remain queued.
+        
+        :param pending: Queue of (file path, future of its indexing result)
+        :param limit: Number of files that may remain queued
+        :returns: Iterator of (file path, indexing result, error), where exactly one of
+            result and error is None
+        """
+        while pending and (len(pending) > limit or pending[0][1].done()):
+            file_path, future = pending.popleft()
+            try:
+                yield file_path, future.result(), None
+            except Exception as e:
+                yield file_path, None, e
+    
+    def _index_chunked_batch(
+        self,
+        batch: List[Tuple[Path, List[str], Optional[FileMetadata]]],
+        writer: ThreadPoolExecutor,
+    ) -> List[Tuple[Path, Future]]:
+        """
+        Embed several chunked text files with a single embedder call.
+        
+        The embedded files are recorded on the writer thread. If the batched call
+        fails, the files are indexed one at a time on the writer thread so the error
+        is attributed to the file that caused it.
+        
+        :param batch: List of (file path, text chunks, metadata or None) tuples
+        :param writer: Single-thread executor that records indexed files
+        :returns: List of (file path, future of its indexing result), one per file
+        """
+        queued: List[Tuple[Path, Future]] = []
+        prepared = []
+        for file_path, chunks, metadata in batch:
+            try:
+                file_path, metadata = self._prepare(str(file_path), metadata)
+            except Exception as e:
+                failed: Future = Future()
+                failed.set_exception(e)
+                queued.append((file_path, failed))
+                continue
+            prepared.append((file_path, metadata, chunks))
+        if not prepared:
+            return queued
+        
+        self.logger.info(
+            f"Embedding {sum(len(chunks) for _, _, chunks in prepared)} chunks "
+            f"from {len(prepared)} file(s) in one batch"
+        )
+        try:
+            results = self.processor.text_handler.process_chunked_many(
+                [metadata for _, metadata, _ in prepared],
+                [chunks for _, _, chunks in prepared],
+            )
+        except Exception as e:
+            self.logger.warning(f"Batched embedding failed, indexing files one at a time: {e}")
+            for file_path, metadata, chunks in prepared:
+                queued.append((file_path, writer.submit(
+                    self.index_file, str(file_path), force=True, chunks=chunks, metadata=metadata
+                )))
+            return queued
+        
+        for (file_path, metadata, _), result in zip(prepared, results):
+            queued.append((file_path, writer.submit(self._finalize, file_path, metadata, result)))
+        return queued
+    
+    def _index_image_batch(
+        self,
+        batch: List[Tuple[Path, Optional[FileMetadata]]],
+        writer: ThreadPoolExecutor,
+    ) -> List[Tuple[Path, Future]]:
+        """
+        Embed several image files with the image handler's batched embedding.
+        
+        The embedded files are recorded on the writer thread. Files the handler could
+        not embed fail with the reason, as they would when indexed with index_file.
+        
+        :param batch: List of (file path, metadata or None) tuples
+        :param writer: Single-thread executor that records indexed files
+        :returns: List of (file path, future of its indexing result), one per file
+        """
+        queued: List[Tuple[Path, Future]] = []
+        prepared = []
+        for file_path, metadata in batch:
+            try:
+                prepared.append(self._prepare(str(file_path), metadata))
+            except Exception as e:
+                failed: Future = Future()
+                failed.set_exception(e)
+                queued.append((file_path, failed))
+        if not prepared:
+            return queued
+        
+        results = self.processor.image_handler.process_many([metadata for _, metadata in prepared])
+        for (file_path, metadata), result in zip(prepared, results):
+            if not result.get("processed", False):
+                failed = Future()
+                failed.set_exception(ValueError(result.get("reason", "image could not be embedded")))
+                queued.append((file_path, failed))
+                continue
+            queued.append((file_path, writer.submit(self._finalize, file_path, metadata, result)))
+        return queued
+    
+    def _iter_prefetched_chunks(
+        self,
+        file_paths: List[Path],
+        workers: int,
+    ) -> Iterator[Tuple[Path, Optional[List[str]]]]:
+        """
+        Yield files in order with their text chunks extracted by a process pool.
+        
+        At most workers * PREFETCH_FILES_PER_WORKER files are extracted ahead of the
+        consumer; each queued file is also hinted to the kernel for readahead, so
+        reads for files still waiting on a worker are already in flight. Files the
+        text handler does not cover, and files whose extraction failed in a worker,
+        are yielded with None and handled in-process.
+        
+        :param file_paths: Files to index, in processing order
+        :param workers: Number of extraction processes
+        :returns: Iterator of (file path, chunks or None)
+        """
+        text_handler = self.processor.text_handler if self.processor is not None else None
+        text_paths = []
+        if text_handler is not None:
+            text_paths = [
+                file_path for file_path in file_paths
+                if file_path.suffix.lower() in text_handler.supported_extensions
+            ]
+        
+        if workers <= 1 or len(text_paths) < self.PREFETCH_MIN_FILES:
+            for file_path in file_paths:
+                yield file_path, None
+            return
+        
+        workers = min(workers, len(text_paths))
+        self.logger.info(f"Extracting {len(text_paths)} text file(s) with {workers} worker process(es)")
+        chunker = text_handler.embedding_handler.chunker
+        window = workers * self.PREFETCH_FILES_PER_WORKER
+        pending_paths = iter(text_paths)
+        futures: Dict[Path, Future] = {}
+        
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for file_path in file_paths:
+                while len(futures) < window:
+                    next_path = next(pending_paths, None)
+                    if next_path is None:
+                        break
+                    prefetch_file(str(next_path))
+                    futures[next_path] = pool.submit(extract_and_chunk, str(next_path), chunker)
+                
+                chunks = None
+                future = futures.pop(file_path, None)
+                if future is not None:
+                    try:
+                        chunks = future.result()
+                    except Exception as e:
+                        self.logger.debug(f"Worker extraction failed for {file_path.name}: {e}")
+                yield file_path, chunks
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
     def reindex_all(self, force: bool = True) -> Dict[str, Any]:
         """
         Reindex all files in the repository.
@@ -276,19 +722,14 @@ class RepositoryManager:
         
         :returns: Dictionary with index statistics
         """
-        entries = self.index_manager.get_all_entries()
+        counts = self.index_manager.get_counts()
         storage_size = self.storage_manager.get_storage_size()
         
-        text_files = sum(1 for e in entries if e.is_text_type)
-        non_text_files = len(entries) - text_files
-        
-        total_chunks = sum(e.num_chunks or 0 for e in entries if e.is_text_type)
-        
         return {
-            "total_indexed_files": len(entries),
-            "text_files": text_files,
-            "non_text_files": non_text_files,
-            "total_chunks": total_chunks,
+            "total_indexed_files": counts["total_files"],
+            "text_files": counts["text_files"],
+            "non_text_files": counts["non_text_files"],
+            "total_chunks": counts["total_chunks"],
             "storage_size": storage_size,
             "repository_path": str(self.repository.repo_path),
             "work_tree_root": str(self.repository.get_work_tree_root()),
@@ -301,9 +742,4 @@ class RepositoryManager:
         :param extension: Filter by extension (optional)
         :returns: List of indexed file dictionaries
         """
-        entries = self.index_manager.get_all_entries()
-        
-        if extension:
-            entries = [e for e in entries if e.extension.lower() == extension.lower()]
-        
-        return [e.to_dict() for e in entries]
+        return self.index_manager.get_entry_dicts(extension)
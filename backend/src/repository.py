@@ -2,13 +2,47 @@
 Repository management for FileX index tracking.
 """
 import os
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 from dataclasses import dataclass
 
 from .logger import get_logger
 
 
+# Absolute paths whose resolved form is remembered by resolve_path
+RESOLVED_PATH_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=RESOLVED_PATH_CACHE_SIZE)
+def _resolve_absolute(file_path: str) -> str:
+    """
+    Resolve an absolute path, memoized.
+    
+    :param file_path: Absolute path
+    :returns: Resolved path string
+    """
+    return str(Path(file_path).resolve())
+
+
+def resolve_path(file_path: Union[str, os.PathLike]) -> str:
+    """
+    Resolve a path to its canonical absolute form.
+    
+    Path.resolve() walks every component with lstat/readlink, and indexing resolves
+    the same file several times, so results for absolute paths are cached. Relative
+    paths depend on the working directory and are resolved every time. A symlink
+    retargeted while the process runs keeps resolving to its old target.
+    
+    :param file_path: Path to resolve
+    :returns: Resolved absolute path string
+    """
+    file_path = os.fspath(file_path)
+    if not os.path.isabs(file_path):
+        return str(Path(file_path).resolve())
+    return _resolve_absolute(file_path)
+
+
 @dataclass
 class RepositoryConfig:
     """
@@ -57,7 +91,7 @@ class Repository:
         
         if exact_location:
             repo_path = start_path / self.REPO_DIR_NAME
-            if repo_path.exists() and repo_path.is_dir():
+            if os.path.isdir(repo_path):
                 self.logger.debug(f"Found repository at exact location: {repo_path}")
                 self.repo_path = repo_path
             elif create:
@@ -84,6 +118,8 @@ class Repository:
             self.repo_path = repo_path
         
         self.config = self._setup_config()
+        # Work tree root with a trailing separator, so /foo does not contain /foobar
+        self._work_tree_prefix = os.path.join(str(self.get_work_tree_root()), "")
         self.logger.info(f"Repository initialized at: {self.repo_path}")
     
     @classmethod
@@ -91,6 +127,8 @@ class Repository:
         """
         Walk up directory tree to find .filex folder.
         
+        Each level costs a single stat (os.path.isdir is False for missing paths).
+        
         :param start_path: Path to start searching from
         :returns: Path to .filex folder if found, None otherwise
         """
@@ -99,7 +137,7 @@ class Repository:
         
         while True:
             repo_path = current / cls.REPO_DIR_NAME
-            if repo_path.exists() and repo_path.is_dir():
+            if os.path.isdir(repo_path):
                 logger.debug(f"Found repository at: {repo_path}")
                 return repo_path
             
@@ -195,12 +233,17 @@ class Repository:
         """
         Check if a file path is within the repository working tree.
         
+        Compares against the work tree root followed by a separator, so a sibling
+        directory sharing the root's name as a prefix is not inside it.
+        
         :param file_path: Path to check
-        :returns: True if path is within repository
+        :returns: True if path is the work tree root or within it
         """
         try:
-            file_path = Path(file_path).resolve()
-            work_tree = self.get_work_tree_root()
-            return str(file_path).startswith(str(work_tree))
+            file_path = resolve_path(file_path)
         except Exception:
             return False
+        return (
+            file_path.startswith(self._work_tree_prefix)
+            or file_path == self._work_tree_prefix[:-1]
+        )
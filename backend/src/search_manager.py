@@ -1,16 +1,158 @@
 """
 Search manager for semantic search over indexed embeddings.
 """
+import contextlib
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 import pickle
-import json
 
-from .repository import Repository
+from .repository import Repository, resolve_path
+from .quantization import (
+    normalize_rows,
+    quantize_int8,
+    dequantize_int8,
+    binarize,
+    unbinarize,
+    hamming_distances,
+)
+from .json_io import dump_json, load_json
 from .logger import get_logger
 
 
+@functools.lru_cache(maxsize=1)
+def _load_faiss() -> Optional[Any]:
+    """
+    Import the optional faiss package on first use.
+    
+    Importing faiss takes a noticeable fraction of a second, so searches without an
+    ANN index and commands that only read the index never pay for it.
+    
+    :returns: The faiss module, or None if it is not installed
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+@functools.lru_cache(maxsize=1)
+def _load_torch() -> Optional[Any]:
+    """
+    Import torch on first use, for scoring on a GPU.
+    
+    :returns: The torch module, or None if it is not installed
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch
+
+
+def _select_top_k(
+    similarities: np.ndarray,
+    top_k: int,
+    alive: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the top_k highest similarities without sorting all of them.
+    
+    np.argpartition finds the top_k rows in linear time; only those are sorted.
+    
+    :param similarities: 1D array with one similarity per row; removed rows are
+        overwritten with -inf
+    :param top_k: Number of rows to select (must be > 0)
+    :param alive: Boolean mask of rows that may be selected (None = all rows)
+    :returns: Tuple of (row indices, similarities), highest similarity first
+    """
+    if alive is not None:
+        np.copyto(similarities, -np.inf, where=~alive)
+    if top_k >= len(similarities):
+        order = np.argsort(-similarities, kind="stable")
+    else:
+        part = np.argpartition(-similarities, top_k - 1)[:top_k]
+        order = part[np.argsort(-similarities[part], kind="stable")]
+    if alive is not None:
+        order = order[alive[order]]
+    return order, similarities[order]
+
+
+def _append_to_buffer(buffer: Optional[np.ndarray], used: int, rows: np.ndarray) -> np.ndarray:
+    """
+    Copy rows after the first used rows of a growable buffer.
+    
+    Capacity doubles when the buffer is full (or read-only, e.g. memory-mapped), so
+    appending k rows costs O(k) amortized instead of copying every existing row.
+    
+    :param buffer: Buffer whose first used rows are kept (None if used is 0)
+    :param used: Number of rows in use
+    :param rows: Rows to append, with the buffer's dtype and row shape
+    :returns: Buffer holding the used rows followed by rows (possibly reallocated)
+    """
+    needed = used + len(rows)
+    if buffer is None or len(buffer) < needed or not buffer.flags.writeable:
+        grown = np.empty((max(needed, 2 * used),) + rows.shape[1:], dtype=rows.dtype)
+        if used:
+            grown[:used] = buffer[:used]
+        buffer = grown
+    buffer[used:needed] = rows
+    return buffer
+
+
+def _append_npy_rows(path: Path, rows: np.ndarray) -> bool:
+    """
+    Append rows to a C-ordered .npy file in place, updating the shape in its header.
+    
+    The header is padded to a multiple of 64 bytes, so the longer shape normally
+    fits; rows are written before the header, so an interrupted append leaves the
+    previous array readable.
+    
+    :param path: Existing .npy file
+    :param rows: Rows with the file's dtype and row shape
+    :returns: True if appended, False if the file does not match (caller rewrites it)
+    """
+    try:
+        with open(path, "r+b") as f:
+            version = np.lib.format.read_magic(f)
+            header_start = f.tell()
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                length_size = 2
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                length_size = 4
+            data_start = f.tell()
+            if fortran_order or dtype != rows.dtype or tuple(shape[1:]) != rows.shape[1:]:
+                return False
+            if f.seek(0, 2) != data_start + int(np.prod(shape, dtype=np.int64)) * dtype.itemsize:
+                return False
+            if len(rows) == 0:
+                return True
+            
+            new_shape = (shape[0] + len(rows),) + tuple(shape[1:])
+            header = (
+                f"{{'descr': {np.lib.format.dtype_to_descr(dtype)!r}, "
+                f"'fortran_order': False, 'shape': {new_shape!r}, }}"
+            )
+            available = data_start - header_start - length_size
+            if len(header) + 1 > available:
+                return False
+            f.write(np.ascontiguousarray(rows).tobytes())
+            f.flush()
+            f.seek(header_start + length_size)
+            f.write((header.ljust(available - 1) + "\n").encode("latin1"))
+        return True
+    except (OSError, ValueError):
+        return False
+
+
 class SearchResult:
     """
     Represents a single search result with file and chunk information.
@@ -44,6 +186,1142 @@ class SearchResult:
         }
 
 
+class _ChunkTable:
+    """
+    Chunk metadata stored column-wise, one entry per index row.
+    
+    File paths are interned: a row holds the id of its file path, its chunk index and
+    its chunk text instead of a dict repeating the path and file name. Base names are
+    interned next to the paths, so search results don't split a path per row. The table is
+    saved as a log of pickled records (protocol 5); each save appends a record with
+    the rows and interned paths added since the previous one.
+    """
+    
+    def __init__(self):
+        # Interned file paths; rows refer to them by position
+        self.file_paths: List[str] = []
+        # Base names of the interned file paths, by the same position
+        self.file_names: List[str] = []
+        self._path_ids: Dict[str, int] = {}
+        # int32 columns (views of the first rows of the growable buffers below)
+        self.file_ids = np.empty(0, dtype=np.int32)
+        self.chunk_indices = np.empty(0, dtype=np.int32)
+        self.chunk_texts: List[str] = []
+        self._file_id_buffer: Optional[np.ndarray] = None
+        self._chunk_index_buffer: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.chunk_texts)
+    
+    def intern(self, file_path: str) -> int:
+        """
+        Get the id of a file path, adding it to the intern table if new.
+        
+        :param file_path: Resolved path of the file
+        :returns: Position of the path in file_paths
+        """
+        path_id = self._path_ids.get(file_path)
+        if path_id is None:
+            path_id = self._path_ids[file_path] = len(self.file_paths)
+            self.file_paths.append(file_path)
+            self.file_names.append(Path(file_path).name)
+        return path_id
+    
+    def append(self, file_path: str, chunks: List[str]) -> None:
+        """
+        Append the rows of a file's chunks.
+        
+        :param file_path: Resolved path of the file
+        :param chunks: Chunk texts (or image paths), one per row
+        """
+        self._append_columns(
+            np.full(len(chunks), self.intern(file_path), dtype=np.int32),
+            np.arange(len(chunks), dtype=np.int32),
+            chunks,
+        )
+    
+    def _append_columns(self, file_ids: np.ndarray, chunk_indices: np.ndarray, chunk_texts: List[str]) -> None:
+        """
+        Append rows given as columns.
+        
+        :param file_ids: int32 ids of interned file paths
+        :param chunk_indices: int32 chunk indices
+        :param chunk_texts: Chunk texts
+        """
+        used = len(self)
+        self._file_id_buffer = _append_to_buffer(self._file_id_buffer, used, file_ids)
+        self._chunk_index_buffer = _append_to_buffer(self._chunk_index_buffer, used, chunk_indices)
+        self.file_ids = self._file_id_buffer[:used + len(file_ids)]
+        self.chunk_indices = self._chunk_index_buffer[:used + len(file_ids)]
+        self.chunk_texts.extend(chunk_texts)
+    
+    def file_path(self, row: int) -> str:
+        """
+        Get the file path of a row.
+        
+        :param row: Row number
+        :returns: Resolved path of the file the row belongs to
+        """
+        return self.file_paths[self.file_ids[row]]
+    
+    def take(self, rows: np.ndarray) -> "_ChunkTable":
+        """
+        Build a table from a subset of rows, interning only the paths they use.
+        
+        :param rows: Row numbers to keep, in order
+        :returns: New table
+        """
+        table = _ChunkTable()
+        used_ids, file_ids = np.unique(self.file_ids[rows], return_inverse=True)
+        for path_id in used_ids.tolist():
+            table.intern(self.file_paths[path_id])
+        texts = self.chunk_texts
+        table._append_columns(
+            file_ids.astype(np.int32).ravel(),
+            self.chunk_indices[rows],
+            [texts[i] for i in rows.tolist()],
+        )
+        return table
+    
+    def record(self, first_row: int, first_path: int) -> Dict[str, Any]:
+        """
+        Build a log record of the rows and interned paths from the given positions on.
+        
+        :param first_row: First row to include
+        :param first_path: First interned path to include
+        :returns: Record dictionary for pickling
+        """
+        return {
+            "file_paths": self.file_paths[first_path:],
+            "file_ids": self.file_ids[first_row:],
+            "chunk_index": self.chunk_indices[first_row:],
+            "chunk_texts": self.chunk_texts[first_row:],
+        }
+    
+    def extend_record(self, record: Dict[str, Any]) -> None:
+        """
+        Append the rows and interned paths of a log record.
+        
+        :param record: Record built by record()
+        :raises ValueError: If the record is malformed or refers to unknown paths
+        """
+        for file_path in record["file_paths"]:
+            self.intern(file_path)
+        file_ids = np.asarray(record["file_ids"], dtype=np.int32)
+        chunk_indices = np.asarray(record["chunk_index"], dtype=np.int32)
+        chunk_texts = list(record["chunk_texts"])
+        if not len(file_ids) == len(chunk_indices) == len(chunk_texts):
+            raise ValueError("Chunk metadata record has columns of different lengths")
+        if len(file_ids) and (file_ids.min() < 0 or file_ids.max() >= len(self.file_paths)):
+            raise ValueError("Chunk metadata record refers to an unknown file path")
+        self._append_columns(file_ids, chunk_indices, chunk_texts)
+    
+    @classmethod
+    def from_dicts(cls, entries: List[Dict[str, Any]]) -> "_ChunkTable":
+        """
+        Build a table from legacy per-row metadata dictionaries.
+        
+        :param entries: Dictionaries with file_path, chunk_index and chunk_text
+        :returns: New table
+        """
+        table = cls()
+        table._append_columns(
+            np.array([table.intern(e["file_path"]) for e in entries], dtype=np.int32),
+            np.array([e["chunk_index"] for e in entries], dtype=np.int32),
+            [e["chunk_text"] for e in entries],
+        )
+        return table
+    
+    @classmethod
+    def read(cls, path: Path) -> Tuple["_ChunkTable", bool]:
+        """
+        Read a table from its record log.
+        
+        :param path: Pickle log written by save
+        :returns: Tuple of (table, complete); complete is False when a trailing record
+            was cut short by an interrupted save and has been ignored
+        :raises ValueError: If the file is empty or its first record cannot be read
+        """
+        table = cls()
+        with open(path, "rb") as f:
+            end = f.seek(0, 2)
+            if end == 0:
+                raise ValueError(f"Empty chunk metadata file: {path}")
+            f.seek(0)
+            while f.tell() < end:
+                start = f.tell()
+                try:
+                    record = pickle.load(f)
+                except Exception as e:
+                    if start == 0:
+                        raise ValueError(f"Unreadable chunk metadata file {path}: {e}")
+                    return table, False
+                table.extend_record(record)
+        return table, True
+
+
+class _EmbeddingIndex:
+    """
+    Embeddings and chunk metadata for one modality (text or image).
+    
+    Rows are L2-normalized when added, so cosine similarity is a single
+    matrix-vector product. They are kept either as float32, as float16 (upcast block
+    by block when scored) or, when quantized, as int8 with a per-row scale or as
+    packed sign bits (binary). Arrays are memory-mapped on load, so only the pages
+    a search touches are read.
+    
+    Updates are append-only: new rows go into growable buffers and are appended to
+    the .npy files on save, and removed rows are only marked dead in the alive mask
+    (tombstones) until more than COMPACT_DEAD_FRACTION of the rows are dead, when
+    the index is compacted and rewritten. Chunk metadata follows the same scheme:
+    new rows are appended to its pickle log as one record per save.
+    
+    An optional FAISS index over the same rows answers top-k queries for large
+    indices: HNSW up to ANN_IVF_MIN_VECTORS rows, an inverted file (IVF) index
+    above. It is dropped whenever rows change and rebuilt by build_ann().
+    """
+    
+    # Rows upcast and scored per step in the exact int8 and float16 sweeps, so the
+    # upcast copy stays cache-sized
+    SCORE_BLOCK_ROWS = 4096
+    # Exact top-k with a bound on the second half of each row, for float16 rows
+    # (where upcasting dominates): used once there are PRUNE_MIN_ROWS_PER_RESULT rows
+    # per requested result and the dimension is at least PRUNE_MIN_DIMENSION;
+    # dropped after PRUNE_PROBE_ROWS rows if over a quarter of them survive the
+    # bound. PRUNE_SLACK absorbs float32 rounding in the bound
+    PRUNE_MIN_ROWS_PER_RESULT = 8
+    PRUNE_MIN_DIMENSION = 128
+    PRUNE_PROBE_ROWS = 16384
+    PRUNE_SLACK = 1e-4
+    # Rows compared per step in the binary Hamming sweep
+    BINARY_BLOCK_ROWS = 65536
+    # HNSW graph parameters (neighbors per node, build and query beam widths)
+    ANN_HNSW_M = 32
+    ANN_EF_CONSTRUCTION = 200
+    ANN_EF_SEARCH = 128
+    # Rows from which an IVF index replaces HNSW (HNSW build time and memory grow
+    # too large); it has IVF_LISTS_PER_SQRT_ROWS * sqrt(rows) lists, is trained on
+    # IVF_TRAIN_ROWS_PER_LIST sampled rows per list and probes IVF_NPROBE lists
+    ANN_IVF_MIN_VECTORS = 50000
+    ANN_IVF_LISTS_PER_SQRT_ROWS = 4
+    ANN_IVF_TRAIN_ROWS_PER_LIST = 64
+    ANN_IVF_NPROBE = 32
+    # Fraction of dead (removed) rows above which the index is compacted
+    COMPACT_DEAD_FRACTION = 0.3
+    # On-disk row dtype -> embedding dtype, for info files written before it was recorded
+    STORED_DTYPES = {"float32": "float32", "float16": "float16", "int8": "int8", "uint8": "binary"}
+    
+    def __init__(
+        self,
+        label: str,
+        index_path: Path,
+        metadata_path: Path,
+        embedding_dtype: str,
+        device: str = "cpu",
+        model_name: Optional[str] = None
+    ):
+        """
+        :param label: Human-readable modality name used in log messages
+        :param index_path: Path of the embeddings .npy file
+        :param metadata_path: Path of the chunk metadata pickle log
+        :param embedding_dtype: In-memory and on-disk dtype ("float32", "float16", "int8"
+            or "binary")
+        :param device: "cuda" to score float rows against a float16 copy on the GPU
+            (must be available), or "cpu"
+        :param model_name: Model that produced the embeddings, recorded in the info file
+            (None adopts the recorded model)
+        """
+        self.logger = get_logger(__name__)
+        self.label = label
+        self.index_path = index_path
+        self.scales_path = index_path.with_name(f"{index_path.stem}_scales.npy")
+        self.info_path = self.info_path_for(index_path)
+        self.alive_path = index_path.with_name(f"{index_path.stem}_alive.npy")
+        self.metadata_path = metadata_path
+        # Metadata file written before the pickle log; migrated on the next save
+        self.legacy_metadata_path = metadata_path.with_suffix(".json")
+        self.ann_path = index_path.with_name(f"{index_path.stem}.faiss")
+        self.embedding_dtype = embedding_dtype
+        self.device = device
+        self.model_name = model_name
+        
+        self._ann = None
+        self._ann_loaded = False
+        self._dirty = False
+        # Per-thread similarity buffers reused across queries
+        self._scratch = threading.local()
+        # Norms of the second half of each row for pruned scoring, computed on first use
+        self._tail_norms: Optional[np.ndarray] = None
+        self._tail_norm_rows = 0
+        self._tail_norm_lock = threading.Lock()
+        # float16 copy of the rows on the GPU (device "cuda"), uploaded on first use
+        self._device_rows = None
+        self._device_lock = threading.Lock()
+        
+        # Rows (views of the first rows of the growable buffers below)
+        self.embeddings: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        # Which rows are live; None when no row has been removed since compaction
+        self.alive: Optional[np.ndarray] = None
+        # Dimension of the original embeddings when rows are packed sign bits
+        self.bit_dimension: Optional[int] = None
+        # Chunk metadata, one entry per row (dead rows included)
+        self.chunks = _ChunkTable()
+        
+        self._row_buffer: Optional[np.ndarray] = None
+        self._scale_buffer: Optional[np.ndarray] = None
+        self._alive_buffer: Optional[np.ndarray] = None
+        self._dead_rows = 0
+        # Live (start, stop) row ranges of each file
+        self._file_rows: Dict[str, List[Tuple[int, int]]] = {}
+        # Rows (and interned paths) already in the files, and whether they no longer
+        # match a prefix of the in-memory rows (the files must then be rewritten)
+        self._saved_rows = 0
+        self._saved_paths = 0
+        self._rewrite = True
+    
+    @property
+    def dimension(self) -> Optional[int]:
+        """
+        Get the embedding dimension of the index.
+        
+        :returns: Embedding dimension, or None if the index is empty
+        """
+        if self.embeddings is None or self.embeddings.ndim < 2:
+            return None
+        if self.embeddings.dtype == np.uint8:
+            return self.bit_dimension
+        return self.embeddings.shape[1]
+    
+    def is_empty(self) -> bool:
+        """
+        Check whether the index holds no live embeddings.
+        
+        :returns: True if there are no live embeddings
+        """
+        return self.embeddings is None or len(self.embeddings) == self._dead_rows
+    
+    def chunk_count(self) -> int:
+        """
+        Get the number of live rows.
+        
+        :returns: Number of chunks (rows) not removed
+        """
+        return len(self.chunks) - self._dead_rows
+    
+    def file_count(self) -> int:
+        """
+        Get the number of files with live rows.
+        
+        :returns: Number of indexed files
+        """
+        return len(self._file_rows)
+    
+    def live_chunk_texts(self) -> Iterator[str]:
+        """
+        Iterate over the texts of the live rows.
+        
+        :returns: Iterator of chunk texts, in row order
+        """
+        texts = self.chunks.chunk_texts
+        if self.alive is None:
+            return iter(texts)
+        return (texts[row] for row in np.flatnonzero(self.alive))
+    
+    def _reset(self) -> None:
+        """Drop all embeddings and metadata."""
+        self._set_rows(None, None)
+        self.bit_dimension = None
+        self.chunks = _ChunkTable()
+        self._file_rows = {}
+    
+    def _set_rows(self, embeddings: Optional[np.ndarray], scales: Optional[np.ndarray]) -> None:
+        """
+        Replace all rows, marking them live and the .npy files as needing a rewrite.
+        
+        :param embeddings: New rows (None for an empty index)
+        :param scales: Per-row scales of int8 rows (None otherwise)
+        """
+        self._row_buffer = self.embeddings = embeddings
+        self._scale_buffer = self.scales = scales
+        self._alive_buffer = self.alive = None
+        self._dead_rows = 0
+        self._saved_rows = 0
+        self._saved_paths = 0
+        self._rewrite = True
+        self._tail_norms = None
+        self._tail_norm_rows = 0
+        self._device_rows = None
+    
+    def _append_rows(self, rows: np.ndarray, scales: Optional[np.ndarray]) -> None:
+        """
+        Append live rows to the growable buffers.
+        
+        :param rows: Rows in the configured representation
+        :param scales: Per-row scales of int8 rows (None otherwise)
+        """
+        used = 0 if self.embeddings is None else len(self.embeddings)
+        self._row_buffer = _append_to_buffer(self._row_buffer, used, rows)
+        self.embeddings = self._row_buffer[:used + len(rows)]
+        if scales is not None:
+            self._scale_buffer = _append_to_buffer(self._scale_buffer, used, scales)
+            self.scales = self._scale_buffer[:used + len(rows)]
+        if self.alive is not None:
+            self._alive_buffer = _append_to_buffer(
+                self._alive_buffer, used, np.ones(len(rows), dtype=bool)
+            )
+            self.alive = self._alive_buffer[:used + len(rows)]
+    
+    def _rebuild_file_rows(self) -> None:
+        """
+        Rebuild the live row ranges of each file from the metadata and alive mask.
+        """
+        self._file_rows = {}
+        file_ids = self.chunks.file_ids
+        if len(file_ids) == 0:
+            return
+        
+        # Runs of rows with the same file and liveness, found with one vectorized compare
+        boundaries = file_ids[1:] != file_ids[:-1]
+        if self.alive is not None:
+            boundaries |= self.alive[1:] != self.alive[:-1]
+        starts = np.flatnonzero(boundaries) + 1
+        starts = np.concatenate(([0], starts))
+        stops = np.append(starts[1:], len(file_ids))
+        if self.alive is not None:
+            live = self.alive[starts]
+            starts, stops = starts[live], stops[live]
+        
+        file_paths = self.chunks.file_paths
+        for path_id, start, stop in zip(file_ids[starts].tolist(), starts.tolist(), stops.tolist()):
+            self._file_rows.setdefault(file_paths[path_id], []).append((start, stop))
+    
+    def _compact(self) -> None:
+        """
+        Drop dead rows, renumbering the remaining rows.
+        """
+        if self._dead_rows == 0:
+            return
+        self._invalidate_ann()
+        self._dirty = True
+        if self._dead_rows == len(self.chunks):
+            self._reset()
+            return
+        
+        keep = np.flatnonzero(self.alive)
+        self.chunks = self.chunks.take(keep)
+        self._set_rows(
+            self.embeddings[keep],
+            None if self.scales is None else self.scales[keep],
+        )
+        self._rebuild_file_rows()
+        self.logger.debug(f"Compacted {self.label} search index to {len(keep)} rows")
+    
+    def _convert(
+        self,
+        embeddings: np.ndarray,
+        scales: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Convert embeddings to the configured dtype.
+        
+        Binary rows only keep signs, so converting them back to float32 or int8
+        gives +-1/sqrt(dimension) rows; re-index to recover full precision.
+        
+        :param embeddings: float embeddings, int8 codes when scales is given, or packed
+            sign bits (uint8, with bit_dimension set)
+        :param scales: Per-row scales for int8 codes (None otherwise)
+        :returns: Tuple of (embeddings, scales) in the configured representation
+        """
+        if embeddings.dtype == np.uint8:
+            if self.embedding_dtype == "binary":
+                return embeddings, None
+            self.logger.warning(
+                f"Converting binary {self.label} search index to {self.embedding_dtype}; "
+                f"re-index to restore full precision"
+            )
+            embeddings = unbinarize(embeddings, self.bit_dimension)
+            scales = None
+            self.bit_dimension = None
+        if self.embedding_dtype == "binary":
+            self.bit_dimension = embeddings.shape[1]
+            return binarize(embeddings), None
+        if self.embedding_dtype == "int8":
+            if embeddings.dtype == np.int8:
+                return embeddings, scales
+            return quantize_int8(normalize_rows(embeddings))
+        if embeddings.dtype == np.int8:
+            embeddings = dequantize_int8(embeddings, scales)
+        dtype = np.float16 if self.embedding_dtype == "float16" else np.float32
+        return embeddings.astype(dtype, copy=False), None
+    
+    def _prepare_rows(
+        self,
+        embeddings: np.ndarray,
+        scales: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Normalize new rows and convert them to the configured dtype.
+        
+        :param embeddings: 2D float embeddings, or int8 codes of normalized rows when
+            scales is given
+        :param scales: Per-row scales of int8 codes (optional)
+        :returns: Tuple of (rows, scales) with scales None unless the dtype is int8
+        """
+        if scales is not None:
+            return self._convert(embeddings, scales)
+        if self.embedding_dtype == "binary":
+            # Signs are unchanged by normalization
+            return binarize(embeddings), None
+        rows = normalize_rows(embeddings)
+        if self.embedding_dtype == "int8":
+            return quantize_int8(rows)
+        if self.embedding_dtype == "float16":
+            return rows.astype(np.float16), None
+        return rows, None
+    
+    @staticmethod
+    def info_path_for(index_path: Path) -> Path:
+        """
+        Get the info file path of an index.
+        
+        :param index_path: Path of the embeddings .npy file
+        :returns: Path of the JSON info file written next to it
+        """
+        return index_path.with_name(f"{index_path.stem}_info.json")
+    
+    @classmethod
+    def read_settings(cls, index_path: Path) -> Dict[str, Optional[str]]:
+        """
+        Read the embedding dtype and model of an index on disk without loading its rows.
+        
+        :param index_path: Path of the embeddings .npy file
+        :returns: Dictionary with "embedding_dtype" and "model", each None when unknown
+            or when no index exists
+        """
+        if not index_path.exists():
+            return {"embedding_dtype": None, "model": None}
+        try:
+            info = load_json(cls.info_path_for(index_path))
+        except (OSError, ValueError):
+            info = {}
+        embedding_dtype = info.get("embedding_dtype")
+        if embedding_dtype is None:
+            try:
+                row_dtype = np.load(index_path, mmap_mode='r').dtype.name
+            except (OSError, ValueError):
+                row_dtype = None
+            embedding_dtype = cls.STORED_DTYPES.get(row_dtype)
+        return {"embedding_dtype": embedding_dtype, "model": info.get("model")}
+    
+    @classmethod
+    def read_stats(cls, index_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Read the live chunk and file counts of an index on disk without loading its rows.
+        
+        :param index_path: Path of the embeddings .npy file
+        :returns: Dictionary with chunk_count, file_count and embedding_dimension (zeros
+            and None when no index exists), or None if the info file does not record them
+        """
+        if not index_path.exists():
+            return {"chunk_count": 0, "file_count": 0, "embedding_dimension": None}
+        try:
+            info = load_json(cls.info_path_for(index_path))
+        except (OSError, ValueError):
+            return None
+        if "chunk_count" not in info or "file_count" not in info:
+            return None
+        return {
+            "chunk_count": info["chunk_count"],
+            "file_count": info["file_count"],
+            "embedding_dimension": info.get("embedding_dimension"),
+        }
+    
+    def _read_info(self) -> Dict[str, Any]:
+        """
+        Read the index info file written by save().
+        
+        :returns: Info dictionary, empty if the file is missing or unreadable
+        """
+        try:
+            return load_json(self.info_path)
+        except (OSError, ValueError):
+            return {}
+    
+    def _check_settings(self) -> None:
+        """
+        Refuse to open an index built with another embedding dtype or model.
+        
+        Converting would silently lose precision (binary rows keep only signs) and
+        mixing models puts rows from different embedding spaces in one index.
+        
+        :raises ValueError: If the stored dtype or model differs from the configured one
+        """
+        settings = self.read_settings(self.index_path)
+        stored_dtype, stored_model = settings["embedding_dtype"], settings["model"]
+        if stored_dtype is not None and stored_dtype != self.embedding_dtype:
+            message = (
+                f"The {self.label} search index in {self.index_path.parent} holds {stored_dtype} "
+                f"embeddings, not {self.embedding_dtype}; open it as {stored_dtype}, or delete "
+                f"the index directory and re-index to change the format"
+            )
+            self.logger.error(message)
+            raise ValueError(message)
+        if self.model_name is None:
+            self.model_name = stored_model
+        elif stored_model is not None and stored_model != self.model_name:
+            message = (
+                f"The {self.label} search index in {self.index_path.parent} was built with model "
+                f"'{stored_model}', not '{self.model_name}'; use that model, or delete the index "
+                f"directory and re-index to change it"
+            )
+            self.logger.error(message)
+            raise ValueError(message)
+    
+    def load(self) -> None:
+        """
+        Load embeddings and metadata from disk, starting fresh if unavailable.
+        
+        :raises ValueError: If the index was built with another dtype or model
+        """
+        self._check_settings()
+        has_metadata = self.metadata_path.exists() or self.legacy_metadata_path.exists()
+        if not (self.index_path.exists() and has_metadata):
+            self._reset()
+            self.logger.debug(f"No existing {self.label} search index found, starting fresh")
+            return
+        
+        try:
+            embeddings = np.load(self.index_path, mmap_mode='r')
+            scales = np.load(self.scales_path, mmap_mode='r') if embeddings.dtype == np.int8 else None
+            if self.metadata_path.exists():
+                chunks, complete = _ChunkTable.read(self.metadata_path)
+            else:
+                self.logger.info(f"Migrating {self.label} search metadata from JSON")
+                chunks, complete = _ChunkTable.from_dicts(load_json(self.legacy_metadata_path)), False
+            self.chunks = chunks
+            info = self._read_info()
+            if embeddings.dtype == np.uint8:
+                self.bit_dimension = info.get("dimension") or embeddings.shape[1] * 8
+            # int8 and binary rows are normalized (or sign-only) by construction
+            is_normalized = embeddings.dtype.kind != 'f' or bool(info.get("is_normalized", False))
+            if len(embeddings) < len(chunks):
+                raise ValueError(
+                    f"{len(embeddings)} rows for {len(chunks)} metadata entries"
+                )
+            
+            rows, scales = self._convert(embeddings, scales)
+            if not is_normalized and rows.dtype.kind == 'f':
+                # Index written before rows were normalized; migrate it on the next save
+                self.logger.info(f"Normalizing rows of legacy {self.label} search index")
+                rows = normalize_rows(rows).astype(rows.dtype)
+            # Rows past the metadata come from an interrupted save and are dropped
+            count = len(chunks)
+            self._set_rows(rows[:count], None if scales is None else scales[:count])
+            if complete and rows is embeddings and len(embeddings) == count:
+                self._saved_rows = count
+                self._saved_paths = len(chunks.file_paths)
+                self._rewrite = False
+            else:
+                self._dirty = True
+            
+            if self.alive_path.exists():
+                alive = np.load(self.alive_path).astype(bool)
+                if len(alive) != count:
+                    # The mask is written before the rows of a save: extra entries belong
+                    # to rows that never reached disk, missing ones to rows added since
+                    self.logger.warning(
+                        f"{self.label} alive mask has {len(alive)} entries for {count} rows, "
+                        f"adjusting it"
+                    )
+                    alive = np.concatenate(
+                        [alive[:count], np.ones(max(0, count - len(alive)), dtype=bool)]
+                    )
+                    self._dirty = True
+                self._alive_buffer = self.alive = alive
+                self._dead_rows = int(len(alive) - np.count_nonzero(alive))
+            self._rebuild_file_rows()
+            self.logger.info(
+                f"Loaded {self.label} search index: {len(chunks)} chunks, "
+                f"embeddings shape: {self.embeddings.shape}"
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to load {self.label} search data: {e}, starting fresh")
+            self._reset()
+    
+    @staticmethod
+    def _save_array(path: Path, array: np.ndarray) -> None:
+        """
+        Write an array via a temporary file so a memory-mapped original stays valid.
+        
+        :param path: Destination .npy path
+        :param array: Array to save
+        """
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        tmp_path.replace(path)
+    
+    def save(self) -> None:
+        """
+        Save embeddings and metadata to disk if they changed since load or the last save.
+        
+        Rows added since the last save are appended to the .npy files and as one
+        record to the metadata log; the files are only rewritten after compaction or
+        a change of representation.
+        """
+        if not self._dirty:
+            return
+        if self.embeddings is None:
+            for path in (
+                self.index_path,
+                self.scales_path,
+                self.alive_path,
+                self.info_path,
+                self.metadata_path,
+                self.legacy_metadata_path,
+            ):
+                if path.exists():
+                    path.unlink()
+            self._dirty = False
+            self.logger.debug(f"Removed empty {self.label} search index")
+            return
+        
+        if self.alive is not None:
+            # Before the rows and chunk records, so an interrupted save cannot bring
+            # back removed rows
+            self._save_array(self.alive_path, self.alive)
+        new_rows = slice(self._saved_rows, None)
+        appended = (
+            not self._rewrite
+            and _append_npy_rows(self.index_path, self.embeddings[new_rows])
+            and (self.scales is None or _append_npy_rows(self.scales_path, self.scales[new_rows]))
+        )
+        if not appended:
+            self._save_array(self.index_path, self.embeddings)
+            if self.scales is not None:
+                self._save_array(self.scales_path, self.scales)
+            elif self.scales_path.exists():
+                self.scales_path.unlink()
+        if self.alive is None and self.alive_path.exists():
+            # Compaction dropped the dead rows: the old mask goes once they are rewritten
+            self.alive_path.unlink()
+        self._save_chunks(appended)
+        self._saved_rows = len(self.embeddings)
+        self._saved_paths = len(self.chunks.file_paths)
+        self._rewrite = False
+        
+        info = {
+            "is_normalized": True,
+            "embedding_dtype": self.embedding_dtype,
+            # Read by SearchManager.stored_index_stats without loading any rows
+            "chunk_count": self.chunk_count(),
+            "file_count": self.file_count(),
+            "embedding_dimension": self.dimension,
+        }
+        if self.model_name is not None:
+            info["model"] = self.model_name
+        if self.bit_dimension is not None:
+            info["dimension"] = self.bit_dimension
+        dump_json(info, self.info_path)
+        self._dirty = False
+        self.logger.debug(
+            f"Saved {self.label} search index: {len(self.chunks)} chunks, "
+            f"embeddings shape: {self.embeddings.shape}"
+        )
+    
+    def _save_chunks(self, append: bool) -> None:
+        """
+        Save the chunk metadata, appending a record of the new rows when possible.
+        
+        The log is appended after the rows it describes, so an interrupted save
+        leaves at worst rows without metadata, which load() drops.
+        
+        :param append: Whether the rows were appended (otherwise the log is rewritten)
+        """
+        if append and self.metadata_path.exists():
+            if self._saved_rows < len(self.chunks):
+                with open(self.metadata_path, 'ab') as f:
+                    pickle.dump(
+                        self.chunks.record(self._saved_rows, self._saved_paths), f, protocol=5
+                    )
+            return
+        
+        tmp_path = self.metadata_path.with_name(self.metadata_path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.chunks.record(0, 0), f, protocol=5)
+        tmp_path.replace(self.metadata_path)
+        if self.legacy_metadata_path.exists():
+            self.legacy_metadata_path.unlink()
+    
+    def add(
+        self,
+        file_path: str,
+        chunks: List[str],
+        embeddings: np.ndarray,
+        scales: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Append embeddings and chunk metadata for a file.
+        
+        :param file_path: Resolved path of the file
+        :param chunks: Chunk texts (or image paths), one per embedding row
+        :param embeddings: 2D float embeddings array, or int8 codes when scales is given
+        :param scales: Per-row scales of int8 codes of normalized rows (optional)
+        :raises ValueError: If the embedding dimension does not match the index
+        """
+        dimension = self.dimension
+        if dimension is not None and embeddings.shape[1] != dimension:
+            self.logger.error(
+                f"Embedding dimension mismatch: expected {dimension}, got {embeddings.shape[1]}"
+            )
+            raise ValueError(
+                f"Embedding dimension mismatch: expected {dimension}, got {embeddings.shape[1]}"
+            )
+        
+        rows, scales = self._prepare_rows(embeddings, scales)
+        if self.embeddings is None and self.embedding_dtype == "binary":
+            self.bit_dimension = embeddings.shape[1]
+        start = len(self.chunks)
+        self._append_rows(rows, scales)
+        self._file_rows.setdefault(file_path, []).append((start, start + len(rows)))
+        
+        self.chunks.append(file_path, chunks)
+        
+        self._invalidate_ann()
+        self._dirty = True
+    
+    def remove(self, file_path: str) -> bool:
+        """
+        Remove all rows belonging to a file.
+        
+        Rows are marked dead in the alive mask; the index is compacted once more than
+        COMPACT_DEAD_FRACTION of its rows are dead.
+        
+        :param file_path: Resolved path of the file
+        :returns: True if any rows were removed
+        """
+        ranges = self._file_rows.pop(file_path, None)
+        if not ranges:
+            return False
+        
+        self._invalidate_ann()
+        self._dirty = True
+        if self.alive is None:
+            self._alive_buffer = self.alive = np.ones(len(self.chunks), dtype=bool)
+        for start, stop in ranges:
+            self.alive[start:stop] = False
+            self._dead_rows += stop - start
+        
+        if self._dead_rows > self.COMPACT_DEAD_FRACTION * len(self.chunks):
+            self._compact()
+        return True
+    
+    def _invalidate_ann(self) -> None:
+        """
+        Drop the ANN index (in memory and on disk) after rows have changed.
+        """
+        self._ann = None
+        self._ann_loaded = True
+        if self.ann_path.exists():
+            self.ann_path.unlink()
+    
+    def _get_ann(self) -> Optional[Any]:
+        """
+        Get the ANN index, loading it from disk on first use.
+        
+        :returns: FAISS index matching the current rows, or None if unavailable
+        """
+        if self._ann_loaded:
+            return self._ann
+        
+        self._ann_loaded = True
+        if not self.ann_path.exists() or self.is_empty() or self._dead_rows:
+            return None
+        faiss = _load_faiss()
+        if faiss is None:
+            return None
+        
+        try:
+            ann = faiss.read_index(str(self.ann_path))
+        except Exception as e:
+            self.logger.warning(f"Failed to load {self.label} ANN index: {e}, using exact search")
+            return None
+        if ann.ntotal != len(self.embeddings):
+            self.logger.warning(
+                f"Stale {self.label} ANN index ({ann.ntotal} vectors, {len(self.embeddings)} rows), "
+                f"using exact search"
+            )
+            return None
+        
+        self._ann = ann
+        self.logger.debug(f"Loaded {self.label} ANN index: {ann.ntotal} vectors")
+        return self._ann
+    
+    def build_ann(self, min_vectors: int) -> bool:
+        """
+        Build and save an ANN index over the current rows if none is up to date.
+        
+        Indices smaller than min_vectors are left to exact search, which is faster
+        at that size. Indices with at least ANN_IVF_MIN_VECTORS rows get an IVF
+        index, smaller ones an HNSW graph. Binary indices are always scanned exactly, since a Hamming
+        sweep over packed bits is already cheap.
+        
+        :param min_vectors: Minimum number of rows for which an ANN index is built
+        :returns: True if an up-to-date ANN index exists afterwards
+        """
+        if self.embedding_dtype != "binary" and self.chunk_count() >= min_vectors:
+            # ANN ids are row numbers, so dead rows are dropped first
+            self._compact()
+        if (
+            self.embedding_dtype == "binary"
+            or self.is_empty()
+            or len(self.embeddings) < min_vectors
+            or _load_faiss() is None
+        ):
+            if self.ann_path.exists():
+                self._invalidate_ann()
+            return False
+        if self._get_ann() is not None:
+            return True
+        
+        if self.scales is not None:
+            rows = dequantize_int8(self.embeddings, self.scales)
+        else:
+            rows = self.embeddings
+        
+        rows = np.ascontiguousarray(rows, dtype=np.float32)
+        faiss = _load_faiss()
+        if len(rows) >= self.ANN_IVF_MIN_VECTORS:
+            ann = self._train_ivf(faiss, rows)
+        else:
+            ann = faiss.IndexHNSWFlat(rows.shape[1], self.ANN_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            ann.hnsw.efConstruction = self.ANN_EF_CONSTRUCTION
+        ann.add(rows)
+        faiss.write_index(ann, str(self.ann_path))
+        
+        self._ann = ann
+        self._ann_loaded = True
+        self.logger.info(f"Built {self.label} ANN index: {ann.ntotal} vectors ({type(ann).__name__})")
+        return True
+    
+    def _train_ivf(self, faiss: Any, rows: np.ndarray) -> Any:
+        """
+        Create an IVF index and train its coarse quantizer on a sample of rows.
+        
+        :param faiss: The faiss module
+        :param rows: Contiguous float32 unit rows the index will hold
+        :returns: Trained, still empty IndexIVFFlat using inner product
+        """
+        nlist = int(self.ANN_IVF_LISTS_PER_SQRT_ROWS * np.sqrt(len(rows)))
+        sample_size = min(len(rows), nlist * self.ANN_IVF_TRAIN_ROWS_PER_LIST)
+        sample = np.random.default_rng(0).choice(len(rows), size=sample_size, replace=False)
+        
+        quantizer = faiss.IndexFlatIP(rows.shape[1])
+        ann = faiss.IndexIVFFlat(quantizer, rows.shape[1], nlist, faiss.METRIC_INNER_PRODUCT)
+        ann.train(rows[np.sort(sample)])
+        return ann
+    
+    def candidates(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find the top_k candidate rows and their cosine similarity to the query.
+        
+        Uses the ANN index when one is available (approximate top_k rows), otherwise
+        scores every row exactly and selects the top_k (on the GPU with device "cuda";
+        large float16 indices skip rows that provably cannot make the top_k, see
+        _pruned_top_k). Binary rows are scored by Hamming distance h to the
+        query's sign bits, mapped to the cosine estimate cos(pi * h / dimension).
+        
+        :param query_embedding: Query vector
+        :param top_k: Number of results the caller needs
+        :returns: Tuple of (row indices, similarities) with at most top_k rows, or None
+            if the index is empty, the dimension does not match, or the query is all zeros
+        """
+        if self.is_empty():
+            return None
+        
+        query_embedding = np.asarray(query_embedding, dtype=np.float32).ravel()
+        if query_embedding.shape[0] != self.dimension:
+            return None
+        
+        squared_norm = float(np.vdot(query_embedding, query_embedding))
+        if squared_norm <= 0:
+            return None
+        query_normalized = query_embedding / np.float32(np.sqrt(squared_norm))
+        
+        if self.embeddings.dtype == np.uint8:
+            query_bits = binarize(query_normalized[None, :])[0]
+            distances = np.empty(len(self.embeddings), dtype=np.int32)
+            for start in range(0, len(self.embeddings), self.BINARY_BLOCK_ROWS):
+                block = self.embeddings[start:start + self.BINARY_BLOCK_ROWS]
+                distances[start:start + len(block)] = hamming_distances(block, query_bits)
+            similarities = np.cos(distances * np.float32(np.pi / self.bit_dimension))
+            return _select_top_k(similarities, top_k, self.alive)
+        
+        ann = self._get_ann()
+        if ann is not None:
+            if isinstance(ann, _load_faiss().IndexIVF):
+                ann.nprobe = self.ANN_IVF_NPROBE
+            else:
+                ann.hnsw.efSearch = max(self.ANN_EF_SEARCH, top_k)
+            scores, ids = ann.search(query_normalized[None, :], top_k)
+            found = ids[0] >= 0
+            return ids[0][found], scores[0][found]
+        
+        if self.device == "cuda":
+            return _select_top_k(self._device_similarities(query_normalized), top_k, self.alive)
+        
+        if (
+            self.embeddings.dtype == np.float16
+            and len(self.embeddings) >= self.PRUNE_MIN_ROWS_PER_RESULT * top_k
+            and self.embeddings.shape[1] >= self.PRUNE_MIN_DIMENSION
+        ):
+            return self._pruned_top_k(query_normalized, top_k)
+        
+        # Score straight into a reused buffer. float32 rows go to BLAS in one GEMV,
+        # which blocks and vectorizes for the dimension itself; int8 and float16 rows
+        # are upcast one block at a time instead of materializing a float32 copy of
+        # the index. int8 rows were normalized before quantization, so
+        # scale * (codes . q) is the cosine.
+        similarities = self._similarity_buffer(len(self.embeddings))
+        if self.embeddings.dtype == np.float32:
+            np.dot(self.embeddings, query_normalized, out=similarities)
+        else:
+            for start in range(0, len(self.embeddings), self.SCORE_BLOCK_ROWS):
+                block = self.embeddings[start:start + self.SCORE_BLOCK_ROWS].astype(np.float32)
+                np.dot(block, query_normalized, out=similarities[start:start + len(block)])
+        if self.scales is not None:
+            similarities *= self.scales
+        return _select_top_k(similarities, top_k, self.alive)
+    
+    def _device_similarities(self, query: np.ndarray) -> np.ndarray:
+        """
+        Score all rows on the GPU against the query.
+        
+        Rows are kept on the GPU as float16 (int8 rows dequantized), uploaded block by
+        block the first time they are scored, so the GEMV runs at GPU memory bandwidth
+        and only the similarities are copied back.
+        
+        :param query: Unit float32 query vector
+        :returns: This thread's float32 similarity buffer holding one score per row
+        """
+        torch = _load_torch()
+        with self._device_lock:
+            uploaded = 0 if self._device_rows is None else len(self._device_rows)
+            blocks = [] if self._device_rows is None else [self._device_rows]
+            for start in range(uploaded, len(self.embeddings), self.SCORE_BLOCK_ROWS):
+                block = self.embeddings[start:start + self.SCORE_BLOCK_ROWS]
+                if self.scales is not None:
+                    block = dequantize_int8(block, self.scales[start:start + len(block)])
+                blocks.append(torch.from_numpy(np.ascontiguousarray(block, dtype=np.float16)).to(self.device))
+            if len(blocks) > 1:
+                self._device_rows = torch.cat(blocks)
+            elif blocks:
+                self._device_rows = blocks[0]
+            rows = self._device_rows
+        
+        device_query = torch.from_numpy(query).to(self.device, dtype=torch.float16)
+        similarities = self._similarity_buffer(len(self.embeddings))
+        similarities[:] = torch.mv(rows, device_query).float().cpu().numpy()
+        return similarities
+    
+    def _row_tail_norms(self, split: int) -> np.ndarray:
+        """
+        Get the norm of each row's dimensions from split on.
+        
+        Norms of appended rows are computed on demand; the cache is dropped when the
+        rows are replaced.
+        
+        :param split: First dimension of the tail (half the dimension)
+        :returns: float32 array with one norm per row
+        """
+        with self._tail_norm_lock:
+            rows = len(self.embeddings)
+            for start in range(self._tail_norm_rows, rows, self.SCORE_BLOCK_ROWS):
+                tail = self.embeddings[start:start + self.SCORE_BLOCK_ROWS, split:].astype(np.float32)
+                norms = np.sqrt(np.einsum("ij,ij->i", tail, tail))
+                self._tail_norms = _append_to_buffer(self._tail_norms, start, norms)
+                self._tail_norm_rows = start + len(tail)
+            return self._tail_norms[:rows]
+    
+    def _pruned_top_k(self, query: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the exact top_k float16 rows, skipping the second half of rows that
+        cannot make it.
+        
+        Each block is first scored on the first half of the dimensions. By
+        Cauchy-Schwarz the rest of a row's score is at most the norm of its second
+        half times that of the query, so rows whose bound stays below the current
+        k-th best score are dropped without upcasting their second half. If most
+        rows survive the bound (an unclustered index), the remaining blocks are
+        scored whole instead.
+        
+        :param query: Unit float32 query vector
+        :param top_k: Number of rows to select
+        :returns: Tuple of (row indices, similarities), highest similarity first
+        """
+        split = self.embeddings.shape[1] // 2
+        head_query, tail_query = query[:split], query[split:]
+        tail_query_norm = np.float32(np.sqrt(np.vdot(tail_query, tail_query)))
+        tail_norms = self._row_tail_norms(split)
+        
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        threshold = -np.inf
+        prune = True
+        probed = survived = 0
+        for start in range(0, len(self.embeddings), self.SCORE_BLOCK_ROWS):
+            block = self.embeddings[start:start + self.SCORE_BLOCK_ROWS]
+            stop = start + len(block)
+            if prune:
+                scores = np.dot(block[:, :split].astype(np.float32), head_query)
+                bound = scores + tail_norms[start:stop] * tail_query_norm
+                keep = bound >= threshold - self.PRUNE_SLACK
+            else:
+                scores = np.dot(block.astype(np.float32), query)
+                keep = scores >= threshold
+            if self.alive is not None:
+                keep &= self.alive[start:stop]
+            keep = np.flatnonzero(keep)
+            
+            if prune:
+                if threshold > -np.inf:
+                    probed += len(block)
+                    survived += len(keep)
+                    prune = probed < self.PRUNE_PROBE_ROWS or 4 * survived < probed
+                scores = scores[keep] + np.dot(block[keep, split:].astype(np.float32), tail_query)
+            else:
+                scores = scores[keep]
+            
+            best_rows = np.concatenate((best_rows, keep + start))
+            best_scores = np.concatenate((best_scores, scores))
+            if len(best_scores) > top_k:
+                part = np.argpartition(-best_scores, top_k - 1)[:top_k]
+                best_rows, best_scores = best_rows[part], best_scores[part]
+            if len(best_scores) == top_k:
+                threshold = best_scores.min()
+        
+        order = np.argsort(-best_scores, kind="stable")
+        return best_rows[order], best_scores[order]
+    
+    def _similarity_buffer(self, rows: int) -> np.ndarray:
+        """
+        Get this thread's float32 similarity buffer, growing it when the index has grown.
+        
+        :param rows: Number of similarities needed
+        :returns: View of length rows, overwritten by the next query on this thread
+        """
+        buffer = getattr(self._scratch, "similarities", None)
+        if buffer is None or len(buffer) < rows:
+            buffer = np.empty(rows, dtype=np.float32)
+            self._scratch.similarities = buffer
+        return buffer[:rows]
+
+
 class SearchManager:
     """
     Manages searchable embeddings data for semantic search.
@@ -53,106 +1331,275 @@ class SearchManager:
     """
     
     SEARCH_INDEX_NAME = "search_index.npy"
-    SEARCH_METADATA_NAME = "search_metadata.json"
+    SEARCH_METADATA_NAME = "search_metadata.pkl"
     IMAGE_SEARCH_INDEX_NAME = "image_search_index.npy"
-    IMAGE_SEARCH_METADATA_NAME = "image_search_metadata.json"
+    IMAGE_SEARCH_METADATA_NAME = "image_search_metadata.pkl"
+    EMBEDDING_DTYPES = ("float32", "float16", "int8", "binary")
+    DEVICES = ("cpu", "cuda")
+    # Environment variable selecting the search device when none is passed
+    DEVICE_ENV_VAR = "FILEX_DEVICE"
+    # Below this many vectors an exact numpy scan beats the ANN index
+    ANN_MIN_VECTORS = 10000
+    # Inside bulk(), search data is saved after this many file updates (and on exit)
+    BULK_SAVE_UPDATES = 256
+    # Files added without is_image are routed to the image index by suffix
+    IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+    # Recent search results kept for repeated queries (paging, re-issued UI queries)
+    RESULT_CACHE_SIZE = 64
     
-    def __init__(self, repository: Repository):
+    def __init__(
+        self,
+        repository: Repository,
+        embedding_dtype: Optional[str] = None,
+        device: Optional[str] = None,
+        model_name: Optional[str] = None
+    ):
         """
         Initialize search manager with repository.
         
         Supports separate indices for text (768 dims) and image (512 dims) embeddings.
         
         :param repository: Repository instance (must not be None)
+        :param embedding_dtype: How search embeddings are held and stored: "float32",
+            "float16" (2x smaller, scored in float32 blocks), "int8" for unit-normalized int8 rows with per-row scales (4x smaller, cosine
+            error around 1e-4), or "binary" for packed sign bits scored by Hamming distance
+            (32x smaller, coarse ranking). Defaults to the dtype the existing index was
+            built with, else "float32"; an existing index in another dtype is refused.
+        :param device: Where exact search scores rows: "cpu", or "cuda" to keep a
+            float16 copy of the rows on the GPU (binary indices stay on the CPU). Defaults
+            to the FILEX_DEVICE environment variable, else "cpu"; falls back to "cpu"
+            when torch or CUDA is unavailable
+        :param model_name: Text embedding model, recorded with the text index (optional);
+            an existing text index built with another model is refused
+        :raises ValueError: If the existing index was built with another dtype or model
         """
         self.logger = get_logger(__name__)
         
         if repository is None:
             self.logger.error("repository cannot be None")
             raise ValueError("repository cannot be None")
+        if embedding_dtype is None:
+            embedding_dtype = self.stored_settings(repository)["embedding_dtype"] or "float32"
+        if embedding_dtype not in self.EMBEDDING_DTYPES:
+            self.logger.error(f"Unsupported embedding_dtype: {embedding_dtype}")
+            raise ValueError(
+                f"embedding_dtype must be one of {self.EMBEDDING_DTYPES}, got: {embedding_dtype}"
+            )
+        
+        if device is None:
+            device = os.environ.get(self.DEVICE_ENV_VAR, "cpu").lower()
+        if device not in self.DEVICES:
+            self.logger.error(f"Unsupported device: {device}")
+            raise ValueError(f"device must be one of {self.DEVICES}, got: {device}")
+        if device == "cuda":
+            torch = _load_torch()
+            if torch is None or not torch.cuda.is_available():
+                self.logger.warning("CUDA is not available, searching on the CPU")
+                device = "cpu"
         
         self.repository = repository
+        self.embedding_dtype = embedding_dtype
+        self.device = device
         self.index_dir = repository.config.index_dir
         self.search_index_path = self.index_dir / self.SEARCH_INDEX_NAME
         self.search_metadata_path = self.index_dir / self.SEARCH_METADATA_NAME
         self.image_search_index_path = self.index_dir / self.IMAGE_SEARCH_INDEX_NAME
         self.image_search_metadata_path = self.index_dir / self.IMAGE_SEARCH_METADATA_NAME
         
-        self._embeddings: Optional[np.ndarray] = None
-        self._metadata: List[Dict[str, Any]] = []
-        self._image_embeddings: Optional[np.ndarray] = None
-        self._image_metadata: List[Dict[str, Any]] = []
+        # Hamming scoring of packed bits has no GPU path
+        index_device = "cpu" if embedding_dtype == "binary" else device
+        self._text_index = _EmbeddingIndex(
+            "text",
+            self.search_index_path,
+            self.search_metadata_path,
+            embedding_dtype,
+            index_device,
+            model_name,
+        )
+        self._image_index = _EmbeddingIndex(
+            "image",
+            self.image_search_index_path,
+            self.image_search_metadata_path,
+            embedding_dtype,
+            index_device,
+        )
         self._load_search_data()
+        # Nesting depth of bulk() and file updates not yet saved
+        self._bulk_depth = 0
+        self._pending_updates = 0
+        # Called after every save, for records that must not get ahead of the index
+        self._commit_hooks: List[Callable[[], None]] = []
+        # (query digest, top_k) -> results, least recently used first; cleared
+        # whenever rows change, which also bumps the generation so a search that
+        # raced with the change does not store stale results
+        # Results are cached as field tuples, so callers can modify the SearchResult
+        # objects they get without changing later hits
+        self._result_cache: "OrderedDict[Tuple[bytes, int], Tuple[tuple, ...]]" = OrderedDict()
+        self._result_cache_generation = 0
+        self._result_cache_lock = threading.Lock()
         
         self.logger.info("SearchManager initialized")
     
+    @classmethod
+    def stored_settings(cls, repository: Repository) -> Dict[str, Optional[str]]:
+        """
+        Read the embedding dtype and text model an existing search index was built with.
+        
+        Only the info files (or .npy headers of older indices) are read.
+        
+        :param repository: Repository instance
+        :returns: Dictionary with "embedding_dtype" and "model", each None when unknown
+        """
+        index_dir = repository.config.index_dir
+        settings = _EmbeddingIndex.read_settings(index_dir / cls.SEARCH_INDEX_NAME)
+        if settings["embedding_dtype"] is None:
+            image_settings = _EmbeddingIndex.read_settings(index_dir / cls.IMAGE_SEARCH_INDEX_NAME)
+            settings["embedding_dtype"] = image_settings["embedding_dtype"]
+        return settings
+    
+    @classmethod
+    def stored_index_stats(cls, repository: Repository) -> Optional[Dict[str, Any]]:
+        """
+        Get the statistics of get_index_stats from the info files, without loading rows.
+        
+        :param repository: Repository instance
+        :returns: Dictionary like get_index_stats, or None if an index was saved before
+            its counts were recorded (open a SearchManager instead)
+        """
+        index_dir = repository.config.index_dir
+        text_stats = _EmbeddingIndex.read_stats(index_dir / cls.SEARCH_INDEX_NAME)
+        image_stats = _EmbeddingIndex.read_stats(index_dir / cls.IMAGE_SEARCH_INDEX_NAME)
+        if text_stats is None or image_stats is None:
+            return None
+        return {
+            "total_chunks": text_stats["chunk_count"] + image_stats["chunk_count"],
+            "embedding_dimension": text_stats["embedding_dimension"],
+            "unique_files": text_stats["file_count"] + image_stats["file_count"],
+        }
+    
+    @property
+    def model_name(self) -> Optional[str]:
+        """
+        Get the text embedding model of the search index.
+        
+        :returns: Model name given or recorded with the index, or None if unknown
+        """
+        return self._text_index.model_name
+    
     def _load_search_data(self) -> None:
         """
         Load search index and metadata from disk for both text and images.
         """
-        if self.search_index_path.exists() and self.search_metadata_path.exists():
-            try:
-                self._embeddings = np.load(self.search_index_path)
-                with open(self.search_metadata_path, 'r', encoding='utf-8') as f:
-                    self._metadata = json.load(f)
-                self.logger.info(
-                    f"Loaded text search index: {len(self._metadata)} chunks, "
-                    f"embeddings shape: {self._embeddings.shape}"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to load text search data: {e}, starting fresh")
-                self._embeddings = None
-                self._metadata = []
-        else:
-            self._embeddings = None
-            self._metadata = []
-            self.logger.debug("No existing text search index found, starting fresh")
-        
-        if self.image_search_index_path.exists() and self.image_search_metadata_path.exists():
-            try:
-                self._image_embeddings = np.load(self.image_search_index_path)
-                with open(self.image_search_metadata_path, 'r', encoding='utf-8') as f:
-                    self._image_metadata = json.load(f)
-                self.logger.info(
-                    f"Loaded image search index: {len(self._image_metadata)} images, "
-                    f"embeddings shape: {self._image_embeddings.shape}"
-                )
-            except Exception as e:
-                self.logger.warning(f"Failed to load image search data: {e}, starting fresh")
-                self._image_embeddings = None
-                self._image_metadata = []
-        else:
-            self._image_embeddings = None
-            self._image_metadata = []
-            self.logger.debug("No existing image search index found, starting fresh")
+        self._text_index.load()
+        self._image_index.load()
     
     def _save_search_data(self) -> None:
         """
         Save search index and metadata to disk for both text and images.
         """
         self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._text_index.save()
+        self._image_index.save()
+    
+    def commit(self) -> None:
+        """
+        Save pending search index changes to disk, then run the commit hooks.
+        """
+        self._pending_updates = 0
+        self._save_search_data()
+        for hook in self._commit_hooks:
+            hook()
+    
+    def add_commit_hook(self, hook: Callable[[], None]) -> None:
+        """
+        Register a callback to run after each save of the search data.
         
-        if self._embeddings is not None and len(self._embeddings) > 0:
-            np.save(self.search_index_path, self._embeddings)
-            with open(self.search_metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(self._metadata, f, indent=2, ensure_ascii=False)
-            self.logger.debug(
-                f"Saved text search index: {len(self._metadata)} chunks, "
-                f"embeddings shape: {self._embeddings.shape}"
-            )
-        else:
-            self.logger.debug("No text search data to save")
-        
-        if self._image_embeddings is not None and len(self._image_embeddings) > 0:
-            np.save(self.image_search_index_path, self._image_embeddings)
-            with open(self.image_search_metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(self._image_metadata, f, indent=2, ensure_ascii=False)
-            self.logger.debug(
-                f"Saved image search index: {len(self._image_metadata)} images, "
-                f"embeddings shape: {self._image_embeddings.shape}"
-            )
-        else:
-            self.logger.debug("No image search data to save")
+        Lets callers write records about indexed files (e.g. buffered index entries)
+        only once the search rows they describe are on disk.
+        
+        :param hook: Callable taking no arguments (must not be None)
+        """
+        if hook is None:
+            self.logger.error("hook cannot be None")
+            raise ValueError("hook cannot be None")
+        self._commit_hooks.append(hook)
+    
+    def _updated(self) -> None:
+        """
+        Record a file update, saving now unless a bulk() block defers it.
+        """
+        self._clear_result_cache()
+        self._pending_updates += 1
+        if self._bulk_depth == 0 or self._pending_updates >= self.BULK_SAVE_UPDATES:
+            self.commit()
+    
+    def _clear_result_cache(self) -> None:
+        """
+        Drop cached search results after the indexed rows have changed.
+        """
+        with self._result_cache_lock:
+            self._result_cache.clear()
+            self._result_cache_generation += 1
+    
+    @staticmethod
+    def _query_key(
+        query_embedding: np.ndarray,
+        image_query_embedding: Optional[np.ndarray]
+    ) -> bytes:
+        """
+        Digest the query vectors of a search for the result cache.
+        
+        :param query_embedding: Text query vector
+        :param image_query_embedding: Image query vector (optional)
+        :returns: 16-byte digest of the float32 query bytes
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(query_embedding, dtype=np.float32).tobytes())
+        if image_query_embedding is not None:
+            digest.update(b"\0image")
+            digest.update(np.ascontiguousarray(image_query_embedding, dtype=np.float32).tobytes())
+        return digest.digest()
+    
+    @contextlib.contextmanager
+    def bulk(self) -> Iterator["SearchManager"]:
+        """
+        Defer saving search data while many files are added or removed.
+        
+        Each update would otherwise append its rows, rewrite the alive mask and info
+        file and append a metadata record on its own. Inside the block, changes are
+        saved every BULK_SAVE_UPDATES file updates and when the outermost block
+        exits (also on error). Blocks may be nested.
+        
+        :returns: Context manager yielding this search manager
+        :postcondition: All changes are saved once the outermost block exits
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0 and self._pending_updates:
+                self.commit()
+    
+    def build_ann_index(self) -> None:
+        """
+        Build FAISS ANN indices for large text and image indices.
+        
+        Requires the optional faiss package; without it search stays exact. Indices
+        are built only when at least ANN_MIN_VECTORS rows are stored (HNSW, or IVF
+        from _EmbeddingIndex.ANN_IVF_MIN_VECTORS rows) and are reused until rows are
+        added or removed.
+        """
+        if _load_faiss() is None:
+            self.logger.debug("faiss not installed, skipping ANN index build")
+            return
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        # Approximate results may differ from the cached exact ones
+        self._clear_result_cache()
+        self._text_index.build_ann(self.ANN_MIN_VECTORS)
+        self._image_index.build_ann(self.ANN_MIN_VECTORS)
+        # Building compacts indices with removed rows
+        self._save_search_data()
     
     def add_file_embeddings(
         self,
@@ -160,18 +1607,22 @@ class SearchManager:
         chunks: List[str],
         embeddings: np.ndarray,
         is_image: bool = False,
+        scales: Optional[np.ndarray] = None,
     ) -> None:
         """
         Add or update embeddings for a file in the search index.
         
         Removes old embeddings for the file if they exist, then adds new ones.
         Supports separate indices for text (768 dims) and image (512 dims) embeddings.
-        Updates search data immediately.
+        Saves search data immediately, unless inside bulk().
         
         :param file_path: Path to the file
         :param chunks: List of text chunks or image paths
-        :param embeddings: Embeddings array (2D, shape: [num_chunks, embedding_dim])
+        :param embeddings: Embeddings array (2D, shape: [num_chunks, embedding_dim]), or
+            int8 codes of L2-normalized rows when scales is given
         :param is_image: Whether these are image embeddings (default: False, auto-detect)
+        :param scales: Per-row scales of int8 codes (optional); with the int8 dtype the
+            codes are added as given instead of being quantized again
         """
         if embeddings.ndim == 1:
             embeddings = embeddings.reshape(1, -1)
@@ -184,57 +1635,23 @@ class SearchManager:
                 f"Chunks and embeddings count mismatch: {len(chunks)} vs {embeddings.shape[0]}"
             )
         
-        file_path = str(Path(file_path).resolve())
+        file_path = resolve_path(file_path)
         
         if not is_image:
-            file_ext = Path(file_path).suffix.lower()
-            is_image = file_ext in {'.png', '.jpg', '.jpeg'}
+            is_image = os.path.splitext(file_path)[1].lower() in self.IMAGE_EXTENSIONS
         
-        target_embeddings = self._image_embeddings if is_image else self._embeddings
-        target_metadata = self._image_metadata if is_image else self._metadata
+        target = self._image_index if is_image else self._text_index
         
         self.logger.debug(
-            f"Adding {'image' if is_image else 'text'} embeddings for file: {file_path} ({len(chunks)} chunks)"
+            f"Adding {target.label} embeddings for file: {file_path} ({len(chunks)} chunks)"
         )
         
-        self.remove_file_embeddings(file_path, is_image=is_image)
-        
-        if target_embeddings is None:
-            if is_image:
-                self._image_embeddings = embeddings
-                embedding_dim = embeddings.shape[1]
-            else:
-                self._embeddings = embeddings
-                embedding_dim = embeddings.shape[1]
-        else:
-            embedding_dim = target_embeddings.shape[1]
-            if embeddings.shape[1] != embedding_dim:
-                self.logger.error(
-                    f"Embedding dimension mismatch: expected {embedding_dim}, got {embeddings.shape[1]}"
-                )
-                raise ValueError(
-                    f"Embedding dimension mismatch: expected {embedding_dim}, got {embeddings.shape[1]}"
-                )
-            if is_image:
-                self._image_embeddings = np.vstack([self._image_embeddings, embeddings])
-            else:
-                self._embeddings = np.vstack([self._embeddings, embeddings])
-        
-        for i, chunk in enumerate(chunks):
-            metadata_entry = {
-                "file_path": file_path,
-                "file_name": Path(file_path).name,
-                "chunk_index": i,
-                "chunk_text": chunk,
-            }
-            if is_image:
-                self._image_metadata.append(metadata_entry)
-            else:
-                self._metadata.append(metadata_entry)
+        target.remove(file_path)
+        target.add(file_path, chunks, embeddings, scales)
         
-        self._save_search_data()
+        self._updated()
         self.logger.info(
-            f"Added {len(chunks)} chunks to {'image' if is_image else 'text'} search index for: {Path(file_path).name}"
+            f"Added {len(chunks)} chunks to {target.label} search index for: {Path(file_path).name}"
         )
     
     def remove_file_embeddings(self, file_path: str, is_image: Optional[bool] = None) -> None:
@@ -244,47 +1661,19 @@ class SearchManager:
         :param file_path: Path to the file
         :param is_image: Whether to remove from image index (None = remove from both)
         """
-        file_path = str(Path(file_path).resolve())
+        file_path = resolve_path(file_path)
         
         removed_text = False
         removed_image = False
         
         if is_image is None or is_image is False:
-            indices_to_remove = [
-                i for i, meta in enumerate(self._metadata)
-                if meta["file_path"] == file_path
-            ]
-            
-            if indices_to_remove:
-                indices_to_keep = [i for i in range(len(self._metadata)) if i not in indices_to_remove]
-                if indices_to_keep:
-                    self._metadata = [self._metadata[i] for i in indices_to_keep]
-                    if self._embeddings is not None:
-                        self._embeddings = self._embeddings[indices_to_keep]
-                else:
-                    self._metadata = []
-                    self._embeddings = None
-                removed_text = True
+            removed_text = self._text_index.remove(file_path)
         
         if is_image is None or is_image is True:
-            image_indices_to_remove = [
-                i for i, meta in enumerate(self._image_metadata)
-                if meta["file_path"] == file_path
-            ]
-            
-            if image_indices_to_remove:
-                image_indices_to_keep = [i for i in range(len(self._image_metadata)) if i not in image_indices_to_remove]
-                if image_indices_to_keep:
-                    self._image_metadata = [self._image_metadata[i] for i in image_indices_to_keep]
-                    if self._image_embeddings is not None:
-                        self._image_embeddings = self._image_embeddings[image_indices_to_keep]
-                else:
-                    self._image_metadata = []
-                    self._image_embeddings = None
-                removed_image = True
+            removed_image = self._image_index.remove(file_path)
         
         if removed_text or removed_image:
-            self._save_search_data()
+            self._updated()
             self.logger.info(f"Removed embeddings for: {Path(file_path).name}")
         else:
             self.logger.debug(f"No embeddings found to remove for: {file_path}")
@@ -297,7 +1686,8 @@ class SearchManager:
     ) -> List[SearchResult]:
         """
         Search for similar chunks using cosine similarity.
-        Searches both text and image indices and combines results.
+        Searches both text and image indices and combines results. Results of the
+        last RESULT_CACHE_SIZE distinct queries are reused until the index changes.
         
         :param query_embedding: Query embedding vector for text search (1D array, 768 dims)
         :param top_k: Number of top results to return (must be > 0)
@@ -308,74 +1698,79 @@ class SearchManager:
             self.logger.error(f"top_k must be positive, got: {top_k}")
             raise ValueError(f"top_k must be positive, got: {top_k}")
         
+        cache_key = (self._query_key(query_embedding, image_query_embedding), top_k)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+            generation = self._result_cache_generation
+        if cached is not None:
+            self.logger.debug(f"Search served from result cache: {len(cached)} results")
+            return [SearchResult(*fields) for fields in cached]
+        
         all_results = []
         
-        if self._embeddings is not None and len(self._embeddings) > 0:
-            if len(query_embedding.shape) > 1:
-                query_embedding = query_embedding.flatten()
-            
-            if query_embedding.shape[0] == self._embeddings.shape[1]:
-                query_norm = np.linalg.norm(query_embedding)
-                if query_norm > 0:
-                    query_normalized = query_embedding / query_norm
-                    embeddings_norm = np.linalg.norm(self._embeddings, axis=1, keepdims=True)
-                    embeddings_normalized = self._embeddings / (embeddings_norm + 1e-8)
-                    similarities = np.dot(embeddings_normalized, query_normalized)
-                    
-                    for idx in range(len(self._metadata)):
-                        meta = self._metadata[idx]
-                        all_results.append(SearchResult(
-                            file_path=meta["file_path"],
-                            chunk_index=meta["chunk_index"],
-                            chunk_text=meta["chunk_text"],
-                            similarity_score=float(similarities[idx]),
-                            file_name=meta.get("file_name"),
-                        ))
-        
-        if image_query_embedding is not None and self._image_embeddings is not None and len(self._image_embeddings) > 0:
-            if len(image_query_embedding.shape) > 1:
-                image_query_embedding = image_query_embedding.flatten()
+        queries = [(self._text_index, query_embedding)]
+        if image_query_embedding is not None:
+            queries.append((self._image_index, image_query_embedding))
+        
+        for index, query in queries:
+            candidates = index.candidates(query, top_k)
+            if candidates is None:
+                continue
             
-            if image_query_embedding.shape[0] == self._image_embeddings.shape[1]:
-                query_norm = np.linalg.norm(image_query_embedding)
-                if query_norm > 0:
-                    query_normalized = image_query_embedding / query_norm
-                    embeddings_norm = np.linalg.norm(self._image_embeddings, axis=1, keepdims=True)
-                    embeddings_normalized = self._image_embeddings / (embeddings_norm + 1e-8)
-                    similarities = np.dot(embeddings_normalized, query_normalized)
-                    
-                    for idx in range(len(self._image_metadata)):
-                        meta = self._image_metadata[idx]
-                        all_results.append(SearchResult(
-                            file_path=meta["file_path"],
-                            chunk_index=meta["chunk_index"],
-                            chunk_text=meta["chunk_text"],
-                            similarity_score=float(similarities[idx]),
-                            file_name=meta.get("file_name"),
-                        ))
+            row_ids, similarities = candidates
+            chunks = index.chunks
+            file_paths = chunks.file_paths
+            file_names = chunks.file_names
+            file_ids = chunks.file_ids
+            for idx, similarity in zip(row_ids.tolist(), similarities.tolist()):
+                path_id = file_ids[idx]
+                all_results.append(SearchResult(
+                    file_path=file_paths[path_id],
+                    chunk_index=int(chunks.chunk_indices[idx]),
+                    chunk_text=chunks.chunk_texts[idx],
+                    similarity_score=similarity,
+                    file_name=file_names[path_id],
+                ))
         
         all_results.sort(key=lambda x: x.similarity_score, reverse=True)
         results = all_results[:top_k]
         
-        self.logger.info(f"Search completed: {len(results)} results (text: {len([r for r in results if not Path(r.file_path).suffix.lower() in {'.png', '.jpg', '.jpeg'}])}, images: {len([r for r in results if Path(r.file_path).suffix.lower() in {'.png', '.jpg', '.jpeg'}])})")
+        with self._result_cache_lock:
+            if generation == self._result_cache_generation:
+                self._result_cache[cache_key] = tuple(
+                    (r.file_path, r.chunk_index, r.chunk_text, r.similarity_score, r.file_name)
+                    for r in results
+                )
+                if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        
+        image_count = sum(
+            os.path.splitext(r.file_path)[1].lower() in self.IMAGE_EXTENSIONS for r in results
+        )
+        self.logger.info(
+            f"Search completed: {len(results)} results "
+            f"(text: {len(results) - image_count}, images: {image_count})"
+        )
         return results
     
+    def chunk_texts(self) -> Iterator[str]:
+        """
+        Iterate over the texts of all chunks in the text search index.
+        
+        :returns: Iterator of chunk texts
+        """
+        return self._text_index.live_chunk_texts()
+    
     def get_index_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the search index (text and image).
         
         :returns: Dictionary with search index statistics
         """
-        text_chunks = len(self._metadata) if self._metadata else 0
-        text_embedding_dim = self._embeddings.shape[1] if self._embeddings is not None and len(self._embeddings.shape) > 1 else None
-        text_unique_files = len(set(meta["file_path"] for meta in self._metadata)) if self._metadata else 0
-        
-        image_chunks = len(self._image_metadata) if self._image_metadata else 0
-        image_embedding_dim = self._image_embeddings.shape[1] if self._image_embeddings is not None and len(self._image_embeddings.shape) > 1 else None
-        image_unique_files = len(set(meta["file_path"] for meta in self._image_metadata)) if self._image_metadata else 0
-        
         return {
-            "total_chunks": text_chunks + image_chunks,
-            "embedding_dimension": text_embedding_dim,
-            "unique_files": text_unique_files + image_unique_files,
+            "total_chunks": self._text_index.chunk_count() + self._image_index.chunk_count(),
+            "embedding_dimension": self._text_index.dimension,
+            "unique_files": self._text_index.file_count() + self._image_index.file_count(),
         }
@@ -1,13 +1,17 @@
 """
 Storage management for embeddings and metadata in repository.
 """
-import json
+import functools
+import hashlib
+import os
 import pickle
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Set, Tuple, List
 import numpy as np
 
 from .repository import Repository
+from .quantization import normalize_rows, quantize_int8, dequantize_int8, binarize, unbinarize
+from .json_io import dump_json, load_json
 from .logger import get_logger
 
 
@@ -15,38 +19,94 @@ class StorageManager:
     """
     Manages storage of embeddings and metadata in repository directories.
     
-    Stores embeddings as numpy arrays and metadata as JSON files.
+    Stores embeddings as numpy arrays (float32 or float16 .npy, int8 codes plus
+    per-row scales in .q8.npz, or packed sign bits in .b1.npz) and metadata as JSON files.
     """
     
-    def __init__(self, repository: Repository):
+    EMBEDDING_DTYPES = ("float32", "float16", "int8", "binary")
+    # Suffixes of per-file embedding files: float32/float16, int8 and binary formats
+    EMBEDDING_SUFFIXES = (".npy", ".q8.npz", ".b1.npz")
+    # Environment variable enabling per-file embedding copies when none is passed
+    KEEP_FILE_EMBEDDINGS_ENV_VAR = "FILEX_KEEP_FILE_EMBEDDINGS"
+    
+    def __init__(
+        self,
+        repository: Repository,
+        embedding_dtype: str = "float32",
+        keep_file_embeddings: Optional[bool] = None,
+    ):
         """
         Initialize storage manager with repository.
         
         :param repository: Repository instance (must not be None)
+        :param embedding_dtype: On-disk embedding format: "float32", "float16" (2x smaller),
+            "int8" (4x smaller) or "binary" (sign bits only, 32x smaller)
+        :param keep_file_embeddings: Also write a per-file copy of each file's embeddings
+            in save_processing_result. Off by default: the search index already holds
+            every embedding in one memory-mapped matrix, and the copies cost a small
+            file write per indexed file. Defaults to the FILEX_KEEP_FILE_EMBEDDINGS
+            environment variable ("1" enables), else False.
         """
         self.logger = get_logger(__name__)
         
         if repository is None:
             self.logger.error("repository cannot be None")
             raise ValueError("repository cannot be None")
+        if embedding_dtype not in self.EMBEDDING_DTYPES:
+            self.logger.error(f"Unsupported embedding_dtype: {embedding_dtype}")
+            raise ValueError(
+                f"embedding_dtype must be one of {self.EMBEDDING_DTYPES}, got: {embedding_dtype}"
+            )
+        
+        if keep_file_embeddings is None:
+            keep_file_embeddings = os.environ.get(self.KEEP_FILE_EMBEDDINGS_ENV_VAR, "") == "1"
         
         self.repository = repository
+        self.embedding_dtype = embedding_dtype
+        self.keep_file_embeddings = keep_file_embeddings
+        self.index_dir = repository.config.index_dir
         self.embeddings_dir = repository.config.embeddings_dir
         self.metadata_dir = repository.config.metadata_dir
         
         self.embeddings_dir.mkdir(parents=True, exist_ok=True)
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
+        # Embedding file suffixes that may exist on disk; deletes skip the others, so
+        # saving without per-file copies makes no unlink calls when none exist
+        self._stored_suffixes = self._scan_embedding_suffixes()
         
         self.logger.info("StorageManager initialized")
     
-    def _get_file_hash(self, file_path: str) -> str:
+    def _scan_embedding_suffixes(self) -> Set[str]:
+        """
+        Find which per-file embedding formats are present in the embeddings directory.
+        
+        Stops listing once every format has been seen.
+        
+        :returns: Set of suffixes from EMBEDDING_SUFFIXES with at least one file
+        """
+        found: Set[str] = set()
+        try:
+            with os.scandir(self.embeddings_dir) as entries:
+                for entry in entries:
+                    found.update(suffix for suffix in self.EMBEDDING_SUFFIXES if entry.name.endswith(suffix))
+                    if len(found) == len(self.EMBEDDING_SUFFIXES):
+                        break
+        except FileNotFoundError:
+            pass
+        return found
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _get_file_hash(file_path: str) -> str:
         """
         Generate a hash-based filename for storage.
         
+        The digest names files already on disk, so it stays SHA-256; it is memoized
+        because saving one file derives several storage paths from the same path.
+        
         :param file_path: Original file path
         :returns: Hash string for filename
         """
-        import hashlib
         return hashlib.sha256(file_path.encode()).hexdigest()
     
     def _get_embeddings_path(self, file_path: str) -> Path:
@@ -59,6 +119,26 @@ class StorageManager:
         file_hash = self._get_file_hash(file_path)
         return self.embeddings_dir / f"{file_hash}.npy"
     
+    def _get_quantized_embeddings_path(self, file_path: str) -> Path:
+        """
+        Get path for storing int8-quantized embeddings.
+        
+        :param file_path: Original file path
+        :returns: Path to quantized embeddings file
+        """
+        file_hash = self._get_file_hash(file_path)
+        return self.embeddings_dir / f"{file_hash}.q8.npz"
+    
+    def _get_binary_embeddings_path(self, file_path: str) -> Path:
+        """
+        Get path for storing binarized embeddings.
+        
+        :param file_path: Original file path
+        :returns: Path to binary embeddings file
+        """
+        file_hash = self._get_file_hash(file_path)
+        return self.embeddings_dir / f"{file_hash}.b1.npz"
+    
     def _get_metadata_path(self, file_path: str) -> Path:
         """
         Get path for storing metadata.
@@ -69,17 +149,52 @@ class StorageManager:
         file_hash = self._get_file_hash(file_path)
         return self.metadata_dir / f"{file_hash}.json"
     
-    def save_embeddings(self, file_path: str, embeddings: np.ndarray) -> Path:
+    def save_embeddings(
+        self,
+        file_path: str,
+        embeddings: np.ndarray,
+        scales: Optional[np.ndarray] = None
+    ) -> Path:
         """
         Save embeddings to disk.
         
         :param file_path: Original file path
-        :param embeddings: Embeddings array to save
+        :param embeddings: Embeddings array to save, or int8 codes of L2-normalized rows
+            when scales is given (as returned by quantize_int8)
+        :param scales: Per-row scales of int8 codes (optional); with the int8 dtype the
+            codes are stored as given instead of being quantized again
         :returns: Path where embeddings were saved
+        :postcondition: Saved rows are L2-normalized (cosine similarity is a plain dot product)
+        :postcondition: Only the file for the configured dtype exists for file_path
         """
-        embeddings_path = self._get_embeddings_path(file_path)
+        paths = {
+            "float32": self._get_embeddings_path(file_path),
+            "float16": self._get_embeddings_path(file_path),
+            "int8": self._get_quantized_embeddings_path(file_path),
+            "binary": self._get_binary_embeddings_path(file_path),
+        }
+        embeddings_path = paths[self.embedding_dtype]
+        
+        if scales is not None and self.embedding_dtype != "int8":
+            embeddings = dequantize_int8(np.atleast_2d(embeddings), scales)
+            scales = None
+        
+        if self.embedding_dtype == "int8":
+            if scales is not None:
+                codes = np.atleast_2d(embeddings)
+            else:
+                codes, scales = quantize_int8(normalize_rows(np.atleast_2d(embeddings)))
+            np.savez(embeddings_path, codes=codes, scales=scales)
+        elif self.embedding_dtype == "binary":
+            rows = normalize_rows(np.atleast_2d(embeddings))
+            np.savez(embeddings_path, bits=binarize(rows), dimension=rows.shape[1])
+        else:
+            dtype = np.float16 if self.embedding_dtype == "float16" else np.float32
+            rows = normalize_rows(np.atleast_2d(embeddings)).astype(dtype, copy=False)
+            np.save(embeddings_path, rows.reshape(np.shape(embeddings)))
         
-        np.save(embeddings_path, embeddings)
+        self._delete_embeddings(file_path, keep=embeddings_path)
+        self._stored_suffixes.add("".join(embeddings_path.suffixes))
         
         self.logger.debug(
             f"Saved embeddings: {embeddings.shape} -> {embeddings_path.name}"
@@ -90,16 +205,38 @@ class StorageManager:
         """
         Load embeddings from disk.
         
+        Quantized and binary embeddings are converted back to float32 (binary rows
+        become +-1/sqrt(dimension) sign vectors), so callers see the same format
+        regardless of how the file was stored. float32 files are memory-mapped
+        read-only, so rows are only read from disk when accessed; float16 files are
+        upcast on load.
+        
         :param file_path: Original file path
-        :returns: Embeddings array if found, None otherwise
+        :returns: Embeddings array (read-only) if found, None otherwise
         """
+        quantized_path = self._get_quantized_embeddings_path(file_path)
+        if quantized_path.exists():
+            with np.load(quantized_path) as data:
+                embeddings = dequantize_int8(data["codes"], data["scales"])
+            self.logger.debug(f"Loaded embeddings: {embeddings.shape} from {quantized_path.name}")
+            return embeddings
+        
+        binary_path = self._get_binary_embeddings_path(file_path)
+        if binary_path.exists():
+            with np.load(binary_path) as data:
+                embeddings = unbinarize(data["bits"], int(data["dimension"]))
+            self.logger.debug(f"Loaded embeddings: {embeddings.shape} from {binary_path.name}")
+            return embeddings
+        
         embeddings_path = self._get_embeddings_path(file_path)
         
         if not embeddings_path.exists():
             self.logger.debug(f"Embeddings not found: {embeddings_path.name}")
             return None
         
-        embeddings = np.load(embeddings_path)
+        embeddings = np.load(embeddings_path, mmap_mode='r')
+        if embeddings.dtype != np.float32:
+            embeddings = embeddings.astype(np.float32)
         self.logger.debug(f"Loaded embeddings: {embeddings.shape} from {embeddings_path.name}")
         return embeddings
     
@@ -115,8 +252,7 @@ class StorageManager:
         
         serializable_metadata = self._make_json_serializable(metadata)
         
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_metadata, f, indent=2, ensure_ascii=False)
+        dump_json(serializable_metadata, metadata_path)
         
         self.logger.debug(f"Saved metadata to: {metadata_path.name}")
         return metadata_path
@@ -134,8 +270,7 @@ class StorageManager:
             self.logger.debug(f"Metadata not found: {metadata_path.name}")
             return None
         
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        metadata = load_json(metadata_path)
         
         self.logger.debug(f"Loaded metadata from: {metadata_path.name}")
         return metadata
@@ -163,14 +298,19 @@ class StorageManager:
         self,
         file_path: str,
         result: Dict[str, Any],
-        embeddings: Optional[np.ndarray] = None
+        embeddings: Optional[np.ndarray] = None,
+        scales: Optional[np.ndarray] = None
     ) -> Tuple[Optional[Path], Optional[Path]]:
         """
         Save both embeddings and metadata from processing result.
         
+        Embeddings are only written when keep_file_embeddings is set; otherwise any
+        copy left from an earlier indexing run is deleted so it cannot go stale.
+        
         :param file_path: Original file path
         :param result: Processing result dictionary
         :param embeddings: Embeddings array (if None, extracted from result)
+        :param scales: Per-row scales when embeddings are int8 codes (see save_embeddings)
         :returns: Tuple of (embeddings_path, metadata_path)
         """
         embeddings_path = None
@@ -181,14 +321,17 @@ class StorageManager:
             if isinstance(embeddings_data, dict) and "embeddings" in embeddings_data:
                 embeddings = embeddings_data["embeddings"]
         
-        if embeddings is not None:
-            embeddings_path = self.save_embeddings(file_path, embeddings)
+        if not self.keep_file_embeddings:
+            self._delete_embeddings(file_path)
+        elif embeddings is not None:
+            embeddings_path = self.save_embeddings(file_path, embeddings, scales=scales)
         
         metadata = result.get("metadata", {})
         if result.get("embeddings") and isinstance(result["embeddings"], dict):
             metadata["embeddings_info"] = {
                 "num_chunks": result["embeddings"].get("num_chunks"),
                 "embedding_dimension": result["embeddings"].get("embedding_dimension"),
+                "is_normalized": embeddings is not None,
             }
         metadata["processed"] = result.get("processed", False)
         
@@ -202,14 +345,9 @@ class StorageManager:
         
         :param file_path: Original file path
         """
-        embeddings_path = self._get_embeddings_path(file_path)
         metadata_path = self._get_metadata_path(file_path)
         
-        deleted = False
-        if embeddings_path.exists():
-            embeddings_path.unlink()
-            deleted = True
-            self.logger.debug(f"Deleted embeddings: {embeddings_path.name}")
+        deleted = self._delete_embeddings(file_path)
         
         if metadata_path.exists():
             metadata_path.unlink()
@@ -221,26 +359,71 @@ class StorageManager:
         else:
             self.logger.debug(f"No stored data found to delete for: {file_path}")
     
+    def _delete_embeddings(self, file_path: str, keep: Optional[Path] = None) -> bool:
+        """
+        Delete stored embeddings of a file in every format present on disk.
+        
+        :param file_path: Original file path
+        :param keep: Embeddings file not to delete (optional)
+        :returns: True if any embeddings file was deleted
+        """
+        if not self._stored_suffixes:
+            return False
+        file_hash = self._get_file_hash(file_path)
+        deleted = False
+        for suffix in tuple(self._stored_suffixes):
+            embeddings_path = self.embeddings_dir / f"{file_hash}{suffix}"
+            if embeddings_path == keep:
+                continue
+            try:
+                embeddings_path.unlink()
+            except FileNotFoundError:
+                continue
+            deleted = True
+            self.logger.debug(f"Deleted embeddings: {embeddings_path.name}")
+        return deleted
+    
+    @staticmethod
+    def _directory_size(directory: Path, suffixes: Optional[Tuple[str, ...]] = None) -> int:
+        """
+        Sum the sizes of the regular files in a directory with the given suffixes.
+        
+        Uses one os.scandir pass: the entry type comes with the directory listing, so
+        only the size needs a stat per file.
+        
+        :param directory: Directory to scan (need not exist)
+        :param suffixes: File name suffixes to count (None counts every file)
+        :returns: Total size in bytes
+        """
+        total = 0
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if suffixes is not None and not entry.name.endswith(suffixes):
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except FileNotFoundError:
+            return 0
+        return total
+    
     def get_storage_size(self) -> Dict[str, int]:
         """
-        Get total storage size used by embeddings and metadata.
+        Get total storage size used by the index, embeddings and metadata.
+        
+        The index directory holds the file index database and the search index, which
+        keeps every embedding; the embeddings directory only holds the optional
+        per-file copies.
         
         :returns: Dictionary with size information in bytes
         """
-        embeddings_size = sum(
-            f.stat().st_size
-            for f in self.embeddings_dir.glob("*.npy")
-            if f.is_file()
-        )
-        
-        metadata_size = sum(
-            f.stat().st_size
-            for f in self.metadata_dir.glob("*.json")
-            if f.is_file()
-        )
+        index_size = self._directory_size(self.index_dir)
+        embeddings_size = self._directory_size(self.embeddings_dir, (".npy", ".npz"))
+        metadata_size = self._directory_size(self.metadata_dir, (".json",))
         
         return {
+            "index_bytes": index_size,
             "embeddings_bytes": embeddings_size,
             "metadata_bytes": metadata_size,
-            "total_bytes": embeddings_size + metadata_size,
+            "total_bytes": index_size + embeddings_size + metadata_size,
         }
@@ -0,0 +1,114 @@
+"""
+Helpers for optimizing torch models used by the embedders.
+"""
+import contextlib
+from typing import Callable, ContextManager
+import torch
+
+from .logger import get_logger
+
+# Supported precision names mapped to autocast dtypes (None = full precision)
+PRECISIONS = {
+    "fp32": None,
+    "fp16": torch.float16,
+    "bf16": torch.bfloat16,
+}
+# Accepted precision options; "auto" resolves per device (see resolve_precision)
+PRECISION_CHOICES = ("auto", *PRECISIONS)
+
+
+def default_device() -> str:
+    """
+    Get the device type models run on by default.
+    
+    :returns: "cuda", "mps" or "cpu"
+    """
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def resolve_precision(precision: str, device: str) -> str:
+    """
+    Resolve a precision option to the precision actually used on a device.
+    
+    "auto" picks fp16 on CUDA (Tensor Core matmuls, half the memory traffic) and
+    fp32 elsewhere; fp16 off CUDA is slow or unsupported, so it becomes bf16.
+    
+    :param precision: One of PRECISION_CHOICES
+    :param device: Device type the model runs on
+    :returns: One of PRECISIONS ("fp32", "fp16", "bf16")
+    """
+    if precision == "auto":
+        return "fp16" if device == "cuda" else "fp32"
+    if precision == "fp16" and device != "cuda":
+        get_logger(__name__).warning("fp16 is slow or unsupported without CUDA, using bf16 instead")
+        return "bf16"
+    return precision
+
+
+def autocast_context(device: str, precision: str) -> ContextManager:
+    """
+    Get an autocast context for running a forward pass at the given precision.
+
+    :param device: Device type the model runs on ("cuda" or "cpu")
+    :param precision: One of PRECISIONS ("fp32", "fp16", "bf16")
+    :returns: torch.autocast context, or a no-op context for fp32
+    """
+    dtype = PRECISIONS[precision]
+    if dtype is None:
+        return contextlib.nullcontext()
+    return torch.autocast(device_type=device, dtype=dtype)
+
+
+def compile_module(module: torch.nn.Module, device: str) -> torch.nn.Module:
+    """
+    Compile a module with torch.compile, returning it unchanged if unsupported.
+
+    Uses dynamic shapes so varying batch sizes and sequence lengths do not trigger
+    recompilation; on CUDA, "reduce-overhead" additionally captures CUDA graphs.
+
+    :param module: Module to compile (typically a transformer encoder)
+    :param device: Device the module runs on ("cuda" or "cpu")
+    :returns: Compiled module, or the original module if compilation is unavailable
+    """
+    logger = get_logger(__name__)
+
+    if not hasattr(torch, "compile"):
+        logger.warning(f"torch.compile requires torch >= 2.0 (found {torch.__version__}), skipping")
+        return module
+
+    mode = "reduce-overhead" if device == "cuda" else "default"
+    try:
+        compiled = torch.compile(module, mode=mode, dynamic=True, fullgraph=False)
+    except Exception as e:
+        logger.warning(f"torch.compile failed, using eager model: {e}")
+        return module
+
+    logger.info(f"Compiled {type(module).__name__} with torch.compile (mode: {mode})")
+    return compiled
+
+
+def warm_up(run: Callable[[], object], restore: Callable[[], None]) -> bool:
+    """
+    Run one forward pass to pay compilation cost up front.
+
+    Compilation errors only surface on the first call, so the warm-up also decides
+    whether the compiled module is usable.
+
+    :param run: Callable performing a representative forward pass
+    :param restore: Callable that swaps the eager module back in if the warm-up fails
+    :returns: True if the compiled module ran successfully
+    """
+    logger = get_logger(__name__)
+    try:
+        run()
+    except Exception as e:
+        logger.warning(f"Compiled model failed during warm-up, using eager model: {e}")
+        restore()
+        return False
+    logger.debug("Compiled model warm-up complete")
+    return True
@@ -82,7 +82,7 @@ class GlobalState:
         
         if self.text_embedder is None:
             self.logger.info(f"Loading text embedding model: {text_model}")
-            self.text_embedder = SentenceTransformerEmbedder(model_name=text_model)
+            self.text_embedder = SentenceTransformerEmbedder(model_name=text_model, compile_model=True)
             self.logger.info(f"Text embedding model loaded successfully")
             
             self.logger.info("Initializing text chunker (size: 512, overlap: 50)")
@@ -101,7 +101,7 @@ class GlobalState:
         if self.image_embedder is None:
             try:
                 self.logger.info(f"Loading image embedding model: {image_model}")
-                self.image_embedder = CLIPImageEmbedder(model_name=image_model)
+                self.image_embedder = CLIPImageEmbedder(model_name=image_model, compile_model=True)
                 self.logger.info("Image embedding model loaded successfully")
                 
                 self.logger.info("Creating image file handler")
@@ -165,7 +165,13 @@ class GlobalState:
             
             try:
                 self.logger.info(f"Creating RepositoryManager for {repo_path} at exact location (will create .filex if needed)")
-                repo_manager = RepositoryManager(start_path=str(path), processor=self.processor, create=True, exact_location=True)
+                repo_manager = RepositoryManager(
+                    start_path=str(path),
+                    processor=self.processor,
+                    create=True,
+                    exact_location=True,
+                    model_name=getattr(self.text_embedder, "model_name", None),
+                )
                 self.logger.info(f"RepositoryManager created successfully at: {repo_manager.repository.repo_path}")
                 return repo_manager
             except OSError as e:
@@ -174,7 +180,12 @@ class GlobalState:
                 raise ValueError(error_msg) from e
         else:
             self.logger.info("Getting repository manager for current directory")
-            repo_manager = RepositoryManager(processor=self.processor, create=True, exact_location=False)
+            repo_manager = RepositoryManager(
+                processor=self.processor,
+                create=True,
+                exact_location=False,
+                model_name=getattr(self.text_embedder, "model_name", None),
+            )
             self.logger.info(f"RepositoryManager created at: {repo_manager.repository.repo_path}")
             return repo_manager
     
@@ -679,29 +690,30 @@ async def get_stats(request: RepoPathRequest):
         search_manager = repo_manager.search_manager
         work_tree = repo_manager.repository.get_work_tree_root()
         
-        entries = index_manager.get_all_entries()
+        extension_stats = index_manager.get_extension_stats()
         storage_size = storage_manager.get_storage_size()
         search_stats = search_manager.get_index_stats()
         
         system_file_extensions = {'.npy', '.json', '.db'}
         
         file_types = {}
-        for entry in entries:
-            ext = entry.extension.lower()
+        for ext, stats in extension_stats.items():
             if ext in system_file_extensions:
                 continue
-            if ext not in file_types:
-                file_types[ext] = {"count": 0, "total_size": 0, "total_chunks": 0}
-            file_types[ext]["count"] += 1
-            file_types[ext]["total_size"] += entry.file_size
-            if entry.num_chunks:
-                file_types[ext]["total_chunks"] += entry.num_chunks
-        
-        text_files = sum(1 for e in entries if e.is_text_type)
+            file_types[ext] = {
+                "count": stats["count"],
+                "total_size": stats["total_size"],
+                "total_chunks": stats["total_chunks"],
+            }
+        
+        total_files = sum(stats["count"] for stats in extension_stats.values())
+        text_files = sum(stats["text_files"] for stats in extension_stats.values())
         image_extensions = {'.png', '.jpg', '.jpeg'}
-        image_files = sum(1 for e in entries if e.extension.lower() in image_extensions)
-        non_text_files = len(entries) - text_files
-        total_chunks = sum(e.num_chunks or 0 for e in entries)
+        image_files = sum(
+            stats["count"] for ext, stats in extension_stats.items() if ext in image_extensions
+        )
+        non_text_files = total_files - text_files
+        total_chunks = sum(stats["total_chunks"] for stats in extension_stats.values())
         
         eligible_files = []
         eligible_file_types = {}
@@ -731,7 +743,7 @@ async def get_stats(request: RepoPathRequest):
             "repository_path": str(repo_manager.repository.repo_path),
             "work_tree": str(work_tree),
             "index_statistics": {
-                "total_indexed_files": len(entries),
+                "total_indexed_files": total_files,
                 "text_files": text_files,
                 "image_files": image_files,
                 "non_text_files": non_text_files,
@@ -743,6 +755,8 @@ async def get_stats(request: RepoPathRequest):
                 "embedding_dimension": search_stats["embedding_dimension"],
             },
             "storage_statistics": {
+                "index_bytes": storage_size["index_bytes"],
+                "index_mb": storage_size["index_bytes"] / (1024 * 1024),
                 "embeddings_bytes": storage_size["embeddings_bytes"],
                 "embeddings_mb": storage_size["embeddings_bytes"] / (1024 * 1024),
                 "metadata_bytes": storage_size["metadata_bytes"],